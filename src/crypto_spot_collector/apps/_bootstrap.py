@@ -0,0 +1,169 @@
+"""Shared start-up helpers for the app scripts.
+
+ログ設定・設定ファイル読込・グラフ設定・イベントループの起動を各アプリで共通化する。
+ログ設定とグラフ設定はプロセス内で1回だけ実行される（再インポートや
+複数回の呼び出しでシンクやフォントが重複登録されない）。
+"""
+
+import asyncio
+import sys
+from collections.abc import Coroutine
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from crypto_spot_collector.utils.secrets import load_config
+
+APP_DIR = Path(__file__).parent
+
+# ログフォルダのパス（apps/logs）
+LOG_DIR = APP_DIR / "logs"
+
+SECRETS_FILE = APP_DIR / "secrets.json"
+SETTINGS_FILE = APP_DIR / "settings.json"
+
+# カスタムTTFフォントを使用する設定
+# 使い方: fontsフォルダにTTFファイルを配置して、ファイル名を指定
+# 例: "fonts/Inter-Regular.ttf" or "fonts/Roboto-Regular.ttf"
+CUSTOM_FONT_PATH = APP_DIR / "font" / "CourierPrime-Regular.ttf"
+
+STDOUT_LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+FILE_LOG_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+)
+
+
+@cache
+def setup_logging(
+    name: str, stdout_level: str = "INFO", file_level: str = "INFO"
+) -> None:
+    """Configure the loguru sinks (stdout and a daily log file) once.
+
+    Args:
+        name: Log file name prefix (e.g. 'buy_spot')
+        stdout_level: Minimum level shown on stdout (docker logs)
+        file_level: Minimum level written to the log file
+    """
+    LOG_DIR.mkdir(exist_ok=True)
+
+    # ログファイル名（日付付き）
+    log_file = LOG_DIR / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
+
+    # デフォルトのハンドラーを削除
+    logger.remove()
+
+    # 標準出力にログを表示（docker logsで確認可能）
+    logger.add(
+        sink=sys.stdout,
+        format=STDOUT_LOG_FORMAT,
+        level=stdout_level,
+        colorize=True,
+    )
+
+    # ファイルにログを保存（日次ローテーション）
+    logger.add(
+        sink=log_file,
+        format=FILE_LOG_FORMAT,
+        level=file_level,
+        rotation="00:00",  # 毎日0時にローテーション
+        retention="30 days",  # 30日間保持
+        compression="zip",  # 古いログファイルをzip圧縮
+        encoding="utf-8",
+        # ファイル書き込みは専用スレッドで行い、イベントループをディスクI/Oで止めない
+        enqueue=True,
+    )
+
+
+def get_config() -> dict[str, Any]:
+    """Load secrets.json and settings.json next to the app scripts.
+
+    ファイルの解析結果はload_config側で更新時刻ごとにキャッシュされる。
+    """
+    config: dict[str, Any] = load_config(SECRETS_FILE, SETTINGS_FILE)
+    return config
+
+
+def run_event_loop(main: Coroutine[Any, Any, None]) -> None:
+    """Run the app's main coroutine, on uvloop when it is installed.
+
+    uvloopはfast extra（Windows以外）でインストールされる。未インストールの
+    環境では標準のasyncioイベントループで実行する。
+    """
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main)
+        return
+
+    uvloop.run(main)
+
+
+def _ensure_font(path: Path) -> str:
+    """Register a TTF font with matplotlib unless it is already known.
+
+    登録済み（イメージ作成時に生成したフォントキャッシュに含まれる場合など）は
+    addfontを省き、フォント名も登録情報から引く。
+
+    Returns:
+        The font family name to use in rcParams
+    """
+    from matplotlib import font_manager
+
+    for font in font_manager.fontManager.ttflist:
+        if font.fname == str(path):
+            return font.name
+
+    font_manager.fontManager.addfont(path)
+    return font_manager.FontProperties(fname=path).get_name()
+
+
+@cache
+def configure_matplotlib() -> None:
+    """Set the plot backend, font and light-theme colours once per process."""
+    import matplotlib
+    import seaborn as sns
+    from matplotlib import pyplot as plt
+
+    # 画面なしで動かすため、描画バックエンドはAggに固定する
+    matplotlib.use("Agg")
+
+    # --- seaborn 設定 ---
+    # ライトテーマでいい感じのスタイルを設定
+    sns.set_style("whitegrid")
+    sns.set_palette("husl")
+
+    if CUSTOM_FONT_PATH.exists():
+        custom_font_name = _ensure_font(CUSTOM_FONT_PATH)
+        plt.rcParams["font.family"] = custom_font_name
+        logger.info(f"カスタムフォントを使用: {custom_font_name}")
+    else:
+        # デフォルトフォント（システムフォント）
+        plt.rcParams["font.family"] = "sans-serif"
+        plt.rcParams["font.sans-serif"] = ["Arial", "Helvetica", "DejaVu Sans"]
+        logger.warning(
+            f"警告: {CUSTOM_FONT_PATH} が見つかりません。デフォルトフォントを使用します。"
+        )
+
+    plt.rcParams.update(
+        {
+            "font.size": 11,
+            # ライトテーマの配色
+            "figure.facecolor": "#FFFFFF",
+            "axes.facecolor": "#F8F9FA",
+            "axes.edgecolor": "#CCCCCC",
+            "grid.color": "#E0E0E0",
+            "grid.linestyle": "--",
+            "grid.linewidth": 0.8,
+            "text.color": "#2C3E50",
+            "axes.labelcolor": "#2C3E50",
+            "xtick.color": "#2C3E50",
+            "ytick.color": "#2C3E50",
+        }
+    )
@@ -1,18 +1,27 @@
 import asyncio
-import sys
 from datetime import datetime, timedelta, timezone
 from io import BytesIO
-from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
+import aiohttp
 import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
-import seaborn as sns
+from ccxt.base.errors import ExchangeError, NetworkError
 from ccxt.base.types import Position
 from loguru import logger
-from matplotlib import font_manager
-from matplotlib import pyplot as plt
-
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
+
+from crypto_spot_collector.apps._bootstrap import (
+    configure_matplotlib,
+    get_config,
+    run_event_loop,
+    setup_logging,
+)
 from crypto_spot_collector.apps.import_historical_data import HistoricalDataImporter
 from crypto_spot_collector.checkers.sar_checker import SARChecker
 from crypto_spot_collector.exchange.hyperliquid import HyperLiquidExchange
@@ -25,80 +34,9 @@ from crypto_spot_collector.providers.market_data_provider import MarketDataProvi
 from crypto_spot_collector.utils.close_position_notification import (
     close_position_notification_message,
 )
-from crypto_spot_collector.utils.secrets import load_config
-
-# ログ設定
-# ログフォルダのパスを取得（プロジェクトルート/logs）
-LOG_DIR = Path(__file__).parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
-
-# ログファイル名（日付付き）
-log_file = LOG_DIR / f"buy_perp_{datetime.now().strftime('%Y%m%d')}.log"
-
-# loguruのログ設定
-# デフォルトのハンドラーを削除
-logger.remove()
-
-# 標準出力にログを表示（INFOレベル以上、docker logsで確認可能）
-logger.add(
-    sink=sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="INFO",
-    colorize=True,
-)
-
-# ファイルにログを保存（DEBUGレベル以上、日次ローテーション）
-logger.add(
-    sink=log_file,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG",
-    rotation="00:00",  # 毎日0時にローテーション
-    retention="30 days",  # 30日間保持
-    compression="zip",  # 古いログファイルをzip圧縮
-    encoding="utf-8",
-)
-
-# --- seaborn 設定 ---
-# ライトテーマでいい感じのスタイルを設定
-sns.set_style("whitegrid")
-sns.set_palette("husl")
-
-# カスタムTTFフォントを使用する設定
-# 使い方: fontsフォルダにTTFファイルを配置して、ファイル名を指定
-# 例: "fonts/Inter-Regular.ttf" or "fonts/Roboto-Regular.ttf"
-CUSTOM_FONT_PATH = Path(__file__).parent / "font" / "CourierPrime-Regular.ttf"
-
-if CUSTOM_FONT_PATH and Path(CUSTOM_FONT_PATH).exists():
-    # TTFファイルを登録
-    font_manager.fontManager.addfont(CUSTOM_FONT_PATH)
-    custom_font = font_manager.FontProperties(fname=CUSTOM_FONT_PATH)
-    plt.rcParams["font.family"] = custom_font.get_name()
-    logger.info(f"カスタムフォントを使用: {custom_font.get_name()}")
-else:
-    # デフォルトフォント（システムフォント）
-    plt.rcParams["font.family"] = "sans-serif"
-    plt.rcParams["font.sans-serif"] = ["Arial", "Helvetica", "DejaVu Sans"]
-    if CUSTOM_FONT_PATH:
-        logger.warning(
-            f"警告: {CUSTOM_FONT_PATH} が見つかりません。デフォルトフォントを使用します。"
-        )
-
-plt.rcParams["font.size"] = 11
-
-# ライトテーマの配色
-plt.rcParams["figure.facecolor"] = "#FFFFFF"
-plt.rcParams["axes.facecolor"] = "#F8F9FA"
-plt.rcParams["axes.edgecolor"] = "#CCCCCC"
-plt.rcParams["grid.color"] = "#E0E0E0"
-plt.rcParams["grid.linestyle"] = "--"
-plt.rcParams["grid.linewidth"] = 0.8
-plt.rcParams["text.color"] = "#2C3E50"
-plt.rcParams["axes.labelcolor"] = "#2C3E50"
-plt.rcParams["xtick.color"] = "#2C3E50"
-plt.rcParams["ytick.color"] = "#2C3E50"
-
-# -------
 
+setup_logging("buy_perp", file_level="DEBUG")
+configure_matplotlib()
 
 # HyperLiquidで取引する永続シンボル
 perp_symbols = [
@@ -115,16 +53,22 @@ perp_symbols = [
     "LTC/USDC:USDC",
 ]
 
+# シグナルチェックで同時に処理するシンボル数の上限（HyperLiquidのレート制限対策）
+SIGNAL_CHECK_CONCURRENCY = 20
+
 logger.info("Initializing crypto perp collector script")
-secret_file = Path(__file__).parent / "secrets.json"
-settings_file = Path(__file__).parent / "settings.json"
-secrets = load_config(secret_file, settings_file)
+secrets = get_config()
 
 notificator = discordNotification(
     secrets["discord"]["discordWebhookUrlPerpetual"])
 importer = HistoricalDataImporter()
+# importerのDBセッションはスレッドセーフではないため、書き込みは1つずつ行う
+importer_lock = asyncio.Lock()
 logger.info("Discord notification and historical data importer initialized")
 
+# シグナルチェックで全シンボル共通に使うデータプロバイダ
+data_provider = MarketDataProvider()
+
 is_testnet = secrets["settings"].get("sandbox_mode", False)
 hyperliquid_exchange = HyperLiquidExchange(
     mainWalletAddress=secrets["hyperliquid"]["mainWalletAddress"],
@@ -148,12 +92,42 @@ sar_direction_tracker: dict[str, str | None] = {}
 # Key: symbol, Value: consecutive count of opposite SAR direction
 sar_opposite_counter: dict[str, int] = {}
 
+# Last candle timestamp an entry order was placed on, per symbol and side
+# Key: (symbol, "long" | "short"), Value: timestamp of the latest candle
+_last_acted: dict[tuple[str, str], pd.Timestamp] = {}
+
 trailing_manager = TrailingStopManagerHyperLiquid()
 background_tasks: set[asyncio.Task] = set()
 
 last_close_position_notification_time = datetime.now(timezone.utc)
 
 
+class _CloseEvent(NamedTuple):
+    """SARによるポジションクローズ通知1件分"""
+
+    symbol: str
+    closed_positions: list[dict]
+    reason: str
+    timeframe: str
+
+
+class _Detail(NamedTuple):
+    """クローズ通知に載せるポジション1件分の詳細"""
+
+    side: str
+    contracts: float
+    price: float
+    order_id: str
+
+
+# ポジションクローズ通知のキュー（close_notification_workerがまとめて送信）
+_close_event_queue: asyncio.Queue[_CloseEvent] = asyncio.Queue()
+# クローズ通知をまとめるための待機時間（秒）
+CLOSE_NOTIFICATION_BATCH_SECONDS = 0.5
+# Discordの1メッセージに含められるembedの上限
+DISCORD_MAX_EMBEDS = 10
+
+
 async def initialize_trailing_manager() -> None:
     """スクリプト起動時に既存のポジションとTP/SL注文を取得してTrailingManagerを初期化する"""
     logger.info("Initializing TrailingManager with existing positions...")
@@ -699,6 +673,9 @@ async def signal_check_loop() -> None:
     # 注文金額（USDC）
     amount_by_usdc = secrets["settings"]["perpetual"].get("amountByUSDC", 10.0)
 
+    # 取引所APIへの同時リクエスト数を制限する
+    semaphore = asyncio.Semaphore(SIGNAL_CHECK_CONCURRENCY)
+
     while True:
         # 次の実行時刻まで待機処理
         now = datetime.now(timezone.utc)
@@ -735,42 +712,72 @@ async def signal_check_loop() -> None:
         logger.info(
             f"[Signal Check] Fetching OHLCV data from {fromDateUtc} to {toDateUtc}")
 
-        # 各シンボルについて処理
-        for symbol in perp_symbols:
-            try:
-                logger.debug(f"Processing {symbol}")
-
-                # 過去1時間のOHLCVデータを取得
-                ohlcv = await hyperliquid_exchange.fetch_ohlcv_async(
-                    symbol=f"{symbol}",
+        # 各シンボルについて並行して処理（同時実行数はセマフォで制限）
+        await asyncio.gather(
+            *(
+                process_symbol_signal(
+                    symbol=symbol,
+                    fromDateUtc=fromDateUtc,
+                    toDateUtc=toDateUtc,
                     timeframe=timeframe_perp,
-                    fromDate=fromDateUtc,
-                    toDate=toDateUtc,
+                    amountByUSDC=amount_by_usdc,
+                    semaphore=semaphore,
                 )
+                for symbol in perp_symbols
+            ),
+            return_exceptions=True,
+        )
 
-                logger.debug(
-                    f"Fetched {len(ohlcv)} OHLCV records for {symbol}")
-                if ohlcv:
-                    logger.debug(
-                        f"First OHLCV record timestamp: {ohlcv[0][0]} ({datetime.fromtimestamp(ohlcv[0][0]/1000, tz=timezone.utc)})")
-                    logger.debug(
-                        f"Last OHLCV record timestamp: {ohlcv[-1][0]} ({datetime.fromtimestamp(ohlcv[-1][0]/1000, tz=timezone.utc)})")
 
-                # OHLCVデータの登録
-                importer.register_data(f"{symbol}", ohlcv)
-                logger.debug(f"Registered OHLCV data for {symbol.upper()}")
+async def process_symbol_signal(
+    symbol: str,
+    fromDateUtc: datetime,
+    toDateUtc: datetime,
+    timeframe: str,
+    amountByUSDC: float,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """1シンボル分のOHLCV取得・登録とシグナルチェックを行う。"""
+    async with semaphore:
+        try:
+            logger.debug(f"Processing {symbol}")
 
-                # シグナルチェック
-                await check_signal(
-                    startDate=fromDateUtc,
-                    endDate=toDateUtc,
-                    symbol=f"{symbol}",
-                    timeframe=timeframe_perp,
-                    amountByUSDC=amount_by_usdc,
-                )
-            except Exception as e:
-                logger.error(f"Error processing {symbol}: {e}")
-                continue
+            # 過去1時間のOHLCVデータを取得
+            ohlcv = await hyperliquid_exchange.fetch_ohlcv_async(
+                symbol=f"{symbol}",
+                timeframe=timeframe,
+                fromDate=fromDateUtc,
+                toDate=toDateUtc,
+            )
+
+            logger.debug(
+                f"Fetched {len(ohlcv)} OHLCV records for {symbol}")
+            if ohlcv:
+                first_ts = ohlcv[0][0]
+                last_ts = ohlcv[-1][0]
+                logger.debug(
+                    f"First OHLCV record timestamp: {first_ts} "
+                    f"({datetime.fromtimestamp(first_ts / 1000, tz=timezone.utc)})")
+                logger.debug(
+                    f"Last OHLCV record timestamp: {last_ts} "
+                    f"({datetime.fromtimestamp(last_ts / 1000, tz=timezone.utc)})")
+
+            # OHLCVデータの登録
+            # DB書き込みは同期処理のため別スレッドで実行し、他シンボルの処理を止めない
+            async with importer_lock:
+                await asyncio.to_thread(importer.register_data, f"{symbol}", ohlcv)
+            logger.debug(f"Registered OHLCV data for {symbol.upper()}")
+
+            # シグナルチェック
+            await check_signal(
+                startDate=fromDateUtc,
+                endDate=toDateUtc,
+                symbol=f"{symbol}",
+                timeframe=timeframe,
+                amountByUSDC=amountByUSDC,
+            )
+        except Exception as e:
+            logger.exception(f"Error processing {symbol}: {e}")
 
 
 async def check_trailing_stop(symbol: str, current_price: float) -> None:
@@ -823,7 +830,6 @@ async def check_signal(
     logger.debug(f"Checking signal for {symbol} from {startDate} to {endDate}")
 
     # Use MarketDataProvider to get DataFrame with indicators
-    data_provider = MarketDataProvider()
     df = data_provider.get_dataframe_with_indicators(
         symbol=symbol,
         interval=timeframe,
@@ -917,11 +923,18 @@ async def check_signal(
         if closed_positions:
             trailing_manager.remove_position(symbol=symbol)
             sar_opposite_counter[symbol] = 0  # Reset counter after closing
-            await send_close_position_notification(
-                symbol=symbol,
-                closed_positions=closed_positions,
-                reason=f"Consecutive opposite SAR ({sar_close_consecutive_count}x): position={current_position_side}, SAR={current_sar_direction}",
-                timeframe=timeframe,
+            # 通知は close_notification_worker でまとめて送信する
+            _close_event_queue.put_nowait(
+                _CloseEvent(
+                    symbol=symbol,
+                    closed_positions=closed_positions,
+                    reason=(
+                        f"Consecutive opposite SAR ({sar_close_consecutive_count}x): "
+                        f"position={current_position_side}, "
+                        f"SAR={current_sar_direction}"
+                    ),
+                    timeframe=timeframe,
+                )
             )
 
     # Check for new entry signals
@@ -940,22 +953,40 @@ async def check_signal(
     else:
         logger.debug(f"{symbol}: No signal detected")
 
+    # 同一足で同じ方向のシグナルが再度出ても重複して発注しない
+    latest_candle = df["timestamp"].iloc[-1]
     if long_signal:
-        await execute_long_order(
+        if _last_acted.get((symbol, "long")) == latest_candle:
+            logger.debug(
+                f"{symbol}: Long order already placed for candle "
+                f"{latest_candle}, skipping")
+            return
+        placed = await execute_long_order(
             symbol=symbol,
             timeframe=timeframe,
             df=df,
             amountByUSDC=amountByUSDC,
             reason=long_reason,
         )
+        # 発注に失敗した場合は記録せず、次回のチェックで再試行できるようにする
+        if placed:
+            _last_acted[(symbol, "long")] = latest_candle
     elif short_signal:
-        await execute_short_order(
+        if _last_acted.get((symbol, "short")) == latest_candle:
+            logger.debug(
+                f"{symbol}: Short order already placed for candle "
+                f"{latest_candle}, skipping")
+            return
+        placed = await execute_short_order(
             symbol=symbol,
             timeframe=timeframe,
             df=df,
             amountByUSDC=amountByUSDC,
             reason=short_reason,
         )
+        # 発注に失敗した場合は記録せず、次回のチェックで再試行できるようにする
+        if placed:
+            _last_acted[(symbol, "short")] = latest_candle
 
 
 async def execute_long_order(
@@ -964,8 +995,8 @@ async def execute_long_order(
     df: pd.DataFrame,
     amountByUSDC: float,
     reason: str = "",
-) -> None:
-    """ロングオーダーを発注する。
+) -> bool:
+    """ロングオーダーを発注し、発注できた場合はTrueを返す。
 
     同じ方向に追加注文する場合は、既存のTP/SL注文をキャンセルしてから
     新規注文を発注し、トレーリングストップの状態を引き継ぐ。
@@ -973,20 +1004,27 @@ async def execute_long_order(
     logger.info(f"{symbol}: Long signal detected! Placing long order...")
     logger.info(f"{symbol}: Reason: {reason}")
 
+    # 取引所メソッドは先にローカルへ束縛しておく
+    fetch_price = hyperliquid_exchange.fetch_price_async
+    fetch_tp_sl = hyperliquid_exchange.fetch_tp_sl_info
+    cancel_orders = hyperliquid_exchange.cancel_orders_async
+    create_order = hyperliquid_exchange.create_order_perp_long_async
+    fetch_usdc = hyperliquid_exchange.fetch_free_usdt_async
+
     try:
         # 現在価格を取得
-        ticker = await hyperliquid_exchange.fetch_price_async(f"{symbol}")
+        ticker = await fetch_price(f"{symbol}")
         current_price = ticker["last"]
 
         # 注文数量を計算
         amount = amountByUSDC / current_price
 
         # 既存のTP/SL注文をキャンセル（同じ方向の追加注文時に2重注文を防ぐ）
-        existing_tp_sl = await hyperliquid_exchange.fetch_tp_sl_info(symbol=symbol)
+        existing_tp_sl = await fetch_tp_sl(symbol=symbol)
         if existing_tp_sl is not None:
             logger.info(
                 f"{symbol}: Canceling existing TP/SL orders before new order")
-            await hyperliquid_exchange.cancel_orders_async(
+            await cancel_orders(
                 order_ids=[
                     existing_tp_sl.take_profit_order_id,
                     existing_tp_sl.stop_loss_order_id,
@@ -995,29 +1033,59 @@ async def execute_long_order(
             )
 
         # ロングオーダー発注（新しいTP/SL注文が作成される）
-        order_result = await hyperliquid_exchange.create_order_perp_long_async(
+        order_result = await create_order(
             symbol=f"{symbol}",
             amount=amount,
             price=current_price,
         )
-        logger.success(f"Successfully created long order for {symbol}")
+    except (NetworkError, ExchangeError) as e:
+        logger.error(f"Error creating long order for {symbol}: {e}")
+        await notificator.send_notification_async(
+            message=f"Error creating long order for {symbol}: {e}", files=[]
+        )
+        return False
+    except Exception as e:
+        # 想定外のエラーは通知だけ行って再送出する
+        # （process_symbol_signalで捕捉されるため、他シンボルの処理は止まらない）
+        await notificator.send_notification_async(
+            message=f"Error creating long order for {symbol}: {e}", files=[]
+        )
+        raise
 
-        # トレーリングストップ管理の更新
-        # 既存ポジションがあればトレーリング状態を引き継ぎ、オーダーIDのみ更新
-        current_tp_sl_info = await hyperliquid_exchange.fetch_tp_sl_info(
+    logger.success(f"Successfully created long order for {symbol}")
+
+    # トレーリングストップ管理の更新
+    # 既存ポジションがあればトレーリング状態を引き継ぎ、オーダーIDのみ更新
+    # 発注は成功しているため、TP/SL情報の取得に失敗しても成功通知は送る
+    try:
+        current_tp_sl_info = await fetch_tp_sl(
             symbol=symbol,
         )
-        trailing_manager.add_or_update_position(
-            symbol=symbol,
-            side=PositionSide.LONG,
-            entry_price=current_price,
-            stoploss_order_id=current_tp_sl_info.stop_loss_order_id,
-            initial_stoploss_price=current_tp_sl_info.stop_loss_trigger_price,
-            # trailing_activatedは指定しないことで、既存の状態を引き継ぐ
+    except Exception as e:
+        logger.error(
+            f"{symbol}: Failed to fetch TP/SL info after long order, "
+            f"trailing stop not updated: {e}"
         )
+    else:
+        if current_tp_sl_info is None:
+            logger.warning(
+                f"{symbol}: TP/SL info not found after long order, "
+                "trailing stop not updated"
+            )
+        else:
+            trailing_manager.add_or_update_position(
+                symbol=symbol,
+                side=PositionSide.LONG,
+                entry_price=current_price,
+                stoploss_order_id=current_tp_sl_info.stop_loss_order_id,
+                initial_stoploss_price=current_tp_sl_info.stop_loss_trigger_price,
+                # trailing_activatedは指定しないことで、既存の状態を引き継ぐ
+            )
 
-        # Discord通知
-        free_usdc = await hyperliquid_exchange.fetch_free_usdt_async()
+    # Discord通知
+    # 発注自体は成功しているため、ここでの失敗はログのみ（エラー通知は送らない）
+    try:
+        free_usdc = await fetch_usdc()
 
         embed = embed_object_create_helper_perp(
             symbol=symbol,
@@ -1048,12 +1116,11 @@ async def execute_long_order(
             message="", embeds=[embed], image_buffers=plot_buf
         )
         logger.info(f"Sent Discord notification for {symbol} long order")
-
     except Exception as e:
-        logger.error(f"Error creating long order for {symbol}: {e}")
-        await notificator.send_notification_async(
-            message=f"Error creating long order for {symbol}: {e}", files=[]
-        )
+        logger.error(
+            f"Error sending long order notification for {symbol}: {e}")
+
+    return True
 
 
 async def execute_short_order(
@@ -1062,8 +1129,8 @@ async def execute_short_order(
     df: pd.DataFrame,
     amountByUSDC: float,
     reason: str = "",
-) -> None:
-    """ショートオーダーを発注する。
+) -> bool:
+    """ショートオーダーを発注し、発注できた場合はTrueを返す。
 
     同じ方向に追加注文する場合は、既存のTP/SL注文をキャンセルしてから
     新規注文を発注し、トレーリングストップの状態を引き継ぐ。
@@ -1071,20 +1138,27 @@ async def execute_short_order(
     logger.info(f"{symbol}: Short signal detected! Placing short order...")
     logger.info(f"{symbol}: Reason: {reason}")
 
+    # 取引所メソッドは先にローカルへ束縛しておく
+    fetch_price = hyperliquid_exchange.fetch_price_async
+    fetch_tp_sl = hyperliquid_exchange.fetch_tp_sl_info
+    cancel_orders = hyperliquid_exchange.cancel_orders_async
+    create_order = hyperliquid_exchange.create_order_perp_short_async
+    fetch_usdc = hyperliquid_exchange.fetch_free_usdt_async
+
     try:
         # 現在価格を取得
-        ticker = await hyperliquid_exchange.fetch_price_async(f"{symbol}")
+        ticker = await fetch_price(f"{symbol}")
         current_price = ticker["last"]
 
         # 注文数量を計算
         amount = amountByUSDC / current_price
 
         # 既存のTP/SL注文をキャンセル（同じ方向の追加注文時に2重注文を防ぐ）
-        existing_tp_sl = await hyperliquid_exchange.fetch_tp_sl_info(symbol=symbol)
+        existing_tp_sl = await fetch_tp_sl(symbol=symbol)
         if existing_tp_sl is not None:
             logger.info(
                 f"{symbol}: Canceling existing TP/SL orders before new order")
-            await hyperliquid_exchange.cancel_orders_async(
+            await cancel_orders(
                 order_ids=[
                     existing_tp_sl.take_profit_order_id,
                     existing_tp_sl.stop_loss_order_id,
@@ -1093,30 +1167,59 @@ async def execute_short_order(
             )
 
         # ショートオーダー発注（新しいTP/SL注文が作成される）
-        order_result = await hyperliquid_exchange.create_order_perp_short_async(
+        order_result = await create_order(
             symbol=f"{symbol}",
             amount=amount,
             price=current_price,
         )
-        logger.success(f"Successfully created short order for {symbol}")
-
-        # トレーリングストップ管理の更新
-        # 既存ポジションがあればトレーリング状態を引き継ぎ、オーダーIDのみ更新
-        current_tp_sl_info = await hyperliquid_exchange.fetch_tp_sl_info(
-            symbol=symbol,
+    except (NetworkError, ExchangeError) as e:
+        logger.error(f"Error creating short order for {symbol}: {e}")
+        await notificator.send_notification_async(
+            message=f"Error creating short order for {symbol}: {e}", files=[]
         )
+        return False
+    except Exception as e:
+        # 想定外のエラーは通知だけ行って再送出する
+        # （process_symbol_signalで捕捉されるため、他シンボルの処理は止まらない）
+        await notificator.send_notification_async(
+            message=f"Error creating short order for {symbol}: {e}", files=[]
+        )
+        raise
+
+    logger.success(f"Successfully created short order for {symbol}")
 
-        trailing_manager.add_or_update_position(
+    # トレーリングストップ管理の更新
+    # 既存ポジションがあればトレーリング状態を引き継ぎ、オーダーIDのみ更新
+    # 発注は成功しているため、TP/SL情報の取得に失敗しても成功通知は送る
+    try:
+        current_tp_sl_info = await fetch_tp_sl(
             symbol=symbol,
-            side=PositionSide.SHORT,
-            entry_price=current_price,
-            stoploss_order_id=current_tp_sl_info.stop_loss_order_id,
-            initial_stoploss_price=current_tp_sl_info.stop_loss_trigger_price,
-            # trailing_activatedは指定しないことで、既存の状態を引き継ぐ
         )
+    except Exception as e:
+        logger.error(
+            f"{symbol}: Failed to fetch TP/SL info after short order, "
+            f"trailing stop not updated: {e}"
+        )
+    else:
+        if current_tp_sl_info is None:
+            logger.warning(
+                f"{symbol}: TP/SL info not found after short order, "
+                "trailing stop not updated"
+            )
+        else:
+            trailing_manager.add_or_update_position(
+                symbol=symbol,
+                side=PositionSide.SHORT,
+                entry_price=current_price,
+                stoploss_order_id=current_tp_sl_info.stop_loss_order_id,
+                initial_stoploss_price=current_tp_sl_info.stop_loss_trigger_price,
+                # trailing_activatedは指定しないことで、既存の状態を引き継ぐ
+            )
 
-        # Discord通知
-        free_usdc = await hyperliquid_exchange.fetch_free_usdt_async()
+    # Discord通知
+    # 発注自体は成功しているため、ここでの失敗はログのみ（エラー通知は送らない）
+    try:
+        free_usdc = await fetch_usdc()
 
         embed = embed_object_create_helper_perp(
             symbol=symbol,
@@ -1147,12 +1250,11 @@ async def execute_short_order(
             message="", embeds=[embed], image_buffers=plot_buf
         )
         logger.info(f"Sent Discord notification for {symbol} short order")
-
     except Exception as e:
-        logger.error(f"Error creating short order for {symbol}: {e}")
-        await notificator.send_notification_async(
-            message=f"Error creating short order for {symbol}: {e}", files=[]
-        )
+        logger.error(
+            f"Error sending short order notification for {symbol}: {e}")
+
+    return True
 
 
 def embed_object_create_helper_perp(
@@ -1230,190 +1332,299 @@ def embed_object_create_helper_perp(
     return embed
 
 
-async def send_close_position_notification(
-    symbol: str,
-    closed_positions: list[dict],
-    reason: str,
-    timeframe: str,
-) -> None:
-    """ポジションクローズ時のDiscord通知を送信する。"""
+async def close_notification_worker() -> None:
+    """クローズイベントを短時間まとめてから、1回の送信で通知する。"""
+    while True:
+        events = [await _close_event_queue.get()]
+
+        # 同じ足で他シンボルのクローズが続く場合に備えて少し待ってからまとめる
+        await asyncio.sleep(CLOSE_NOTIFICATION_BATCH_SECONDS)
+        while not _close_event_queue.empty():
+            events.append(_close_event_queue.get_nowait())
+
+        await send_close_position_notification(events)
+
+
+async def send_close_position_notification(events: list[_CloseEvent]) -> None:
+    """ポジションクローズ時のDiscord通知を送信する。
+
+    複数シンボルのクローズは残高取得1回・Webhook送信1回（シンボルごとのembed）にまとめる。
+    """
+    symbols = ", ".join(event.symbol for event in events)
     try:
-        logger.info(f"Sending close position notification for {symbol}")
+        logger.info(f"Sending close position notification for {symbols}")
 
         # 残高を取得
         free_usdc = await hyperliquid_exchange.fetch_free_usdt_async()
 
-        # クローズされたポジションの情報を集約
-        total_contracts = 0.0
-        position_details = []
-
-        for pos in closed_positions:
-            contracts = pos.get("amount", 0.0)
-            total_contracts += contracts
-
-            # ポジション詳細を追加
-            side = pos.get("side", "N/A")
-            price = pos.get("price", 0.0)
-            order_id = pos.get("id", "N/A")
-
-            position_details.append({
-                "side": side,
-                "contracts": contracts,
-                "price": price,
-                "order_id": order_id,
-            })
-
-        # Embed作成
-        embed = {
-            "title": f":octagonal_sign: ({timeframe}) {symbol} ポジションをクローズしました",
-            "color": 16776960,  # 黄色
-            "fields": [
-                {
-                    "name": "クローズ理由",
-                    "value": f"`{reason}`",
-                    "inline": False,
-                },
-                {
-                    "name": "クローズしたポジション数",
-                    "value": f"`{len(closed_positions)}`",
-                    "inline": True,
-                },
-                {
-                    "name": "残りUSDC",
-                    "value": f"`{free_usdc}`",
-                    "inline": True,
-                },
-            ],
-            "footer": {
-                "text": "buy_perp.py | hyperliquid",
-            },
-        }
-
-        # 各ポジションの詳細を追加
-        for i, detail in enumerate(position_details, 1):
-            embed["fields"].append({
-                "name": f"Position #{i} - {detail['side'].upper()}",
-                "value": (
-                    f"数量: `{detail['contracts']}`\n"
-                    f"価格: `{detail['price']}`\n"
-                    f"Order ID: `{detail['order_id']}`"
-                ),
-                "inline": True,
-            })
+        embeds = [
+            create_close_position_embed(event, free_usdc) for event in events
+        ]
 
-        await notificator.send_notification_embed_with_file(
-            message="", embeds=[embed], image_buffers=[]
-        )
-        logger.info(f"Close position notification sent for {symbol}")
+        # Discordの1メッセージあたりのembed上限（10件）ごとに送信
+        for i in range(0, len(embeds), DISCORD_MAX_EMBEDS):
+            await notificator.send_notification_embed_with_file(
+                message="",
+                embeds=embeds[i:i + DISCORD_MAX_EMBEDS],
+                image_buffers=[],
+            )
+        logger.info(f"Close position notification sent for {symbols}")
 
     except Exception as e:
         logger.error(
-            f"Error sending close position notification for {symbol}: {e}")
+            f"Error sending close position notification for {symbols}: {e}")
 
 
-def notification_plot_buff(
-    df: pd.DataFrame,
-    timeframe: str,
-    symbol: str,
-    entry_price: float,
-) -> BytesIO:
-    """グラフを作成し、BytesIOとして返す。"""
-    logger.debug(f"Creating plot for {symbol}")
+def create_close_position_embed(event: _CloseEvent, free_usdc: float) -> dict:
+    """1シンボル分のクローズ通知embedを作成する。"""
+    # クローズされたポジションの情報を集約
+    total_contracts = 0.0
+    position_details: list[_Detail] = []
+
+    for pos in event.closed_positions:
+        contracts = pos.get("amount", 0.0)
+        total_contracts += contracts
+
+        # ポジション詳細を追加
+        side = pos.get("side", "N/A")
+        price = pos.get("price", 0.0)
+        order_id = pos.get("id", "N/A")
+
+        position_details.append(_Detail(side, contracts, price, order_id))
+
+    # Embed作成
+    embed = {
+        "title": f":octagonal_sign: ({event.timeframe}) {event.symbol} ポジションをクローズしました",
+        "color": 16776960,  # 黄色
+        "fields": [
+            {
+                "name": "クローズ理由",
+                "value": f"`{event.reason}`",
+                "inline": False,
+            },
+            {
+                "name": "クローズしたポジション数",
+                "value": f"`{len(event.closed_positions)}`",
+                "inline": True,
+            },
+            {
+                "name": "残りUSDC",
+                "value": f"`{free_usdc}`",
+                "inline": True,
+            },
+        ],
+        "footer": {
+            "text": "buy_perp.py | hyperliquid",
+        },
+    }
+
+    # 各ポジションの詳細を追加
+    for i, detail in enumerate(position_details, 1):
+        embed["fields"].append({
+            "name": f"Position #{i} - {detail.side.upper()}",
+            "value": (
+                f"数量: `{detail.contracts}`\n"
+                f"価格: `{detail.price}`\n"
+                f"Order ID: `{detail.order_id}`"
+            ),
+            "inline": True,
+        })
+
+    return embed
+
+
+class _SymbolChart(NamedTuple):
+    """シンボルごとの通知用Figureと、描画ごとにデータを差し替えるアーティスト。"""
+
+    fig: Figure
+    ax: Axes
+    close_line: Line2D
+    sar_up: PathCollection
+    sar_down: PathCollection
+    sma_20: Line2D
+    sma_50: Line2D
+    entry_line: Line2D
+    entry_text: Text
 
-    # 最新の60データポイントのみ使用
-    df = df.tail(60).copy()
 
-    fig, ax1 = plt.subplots(1, 1, figsize=(12, 8))
+# シンボルごとに作成済みのグラフを保持する
+# 2回目以降はデータのみ差し替えて再描画し、Figure/軸設定の再構築を省く
+_symbol_chart_cache: dict[str, _SymbolChart] = {}
+
+
+def _create_symbol_chart() -> _SymbolChart:
+    """空のアーティストを持つグラフを作成する（シンボルごとに初回のみ）。"""
+    # pyplotの管理下に置かないFigure（キャッシュしてもplt側に溜まらない）
+    fig = Figure(figsize=(12, 8))
+    ax1 = fig.subplots(1, 1)
 
     # 価格チャート
-    ax1.plot(
-        df["timestamp"], df["close"], label="Close Price", color="blue", linewidth=2
+    (close_line,) = ax1.plot(
+        [], [], label="Close Price", color="blue", linewidth=2
     )
 
     # SARをドットで表示（トレンド転換で色を変更）
-    if "sar_up" in df.columns:
-        sar_up_mask = ~pd.isna(df["sar_up"])
-        ax1.scatter(
-            df.loc[sar_up_mask, "timestamp"],
-            df.loc[sar_up_mask, "sar_up"],
-            color="green",
-            s=30,
-            label="SAR (Bullish)",
-            alpha=0.8,
-        )
-
-    if "sar_down" in df.columns:
-        sar_down_mask = ~pd.isna(df["sar_down"])
-        ax1.scatter(
-            df.loc[sar_down_mask, "timestamp"],
-            df.loc[sar_down_mask, "sar_down"],
-            color="red",
-            s=30,
-            label="SAR (Bearish)",
-            alpha=0.8,
-        )
+    sar_up = ax1.scatter(
+        [], [], color="green", s=30, label="SAR (Bullish)", alpha=0.8
+    )
+    sar_down = ax1.scatter(
+        [], [], color="red", s=30, label="SAR (Bearish)", alpha=0.8
+    )
 
     # SMA20（オレンジゴールド）
-    if "sma_20" in df.columns:
-        ax1.plot(
-            df["timestamp"],
-            df["sma_20"],
-            label="SMA 20",
-            color="#FFA726",
-            linewidth=2.2,
-            alpha=0.85,
-            linestyle="-",
-            zorder=2,
-        )
+    (sma_20,) = ax1.plot(
+        [],
+        [],
+        label="SMA 20",
+        color="#FFA726",
+        linewidth=2.2,
+        alpha=0.85,
+        linestyle="-",
+        zorder=2,
+    )
 
     # SMA50
-    if "sma_50" in df.columns:
-        ax1.plot(
-            df["timestamp"],
-            df["sma_50"],
-            label="SMA 50",
-            color="#42A5F5",
-            linewidth=2.2,
-            alpha=0.85,
-            linestyle="-",
-            zorder=2,
-        )
+    (sma_50,) = ax1.plot(
+        [],
+        [],
+        label="SMA 50",
+        color="#42A5F5",
+        linewidth=2.2,
+        alpha=0.85,
+        linestyle="-",
+        zorder=2,
+    )
 
     ax1.grid(True, alpha=0.3)
-    ax1.set_title(f"{symbol} Price with Parabolic SAR ({timeframe})")
     ax1.set_ylabel("Price (USD)")
-    ax1.legend()
-
-    if entry_price > 0:
-        ax1.axhline(
-            entry_price,
-            color="purple",
-            ls="-",
-            lw=2,
-            alpha=0.7,
-            label="Entry Price",
-        )
-        ax1.text(
-            df["timestamp"].iloc[0],
-            entry_price,
-            f" Entry : {entry_price:.2f}",
-            va="bottom",
-            ha="left",
-            fontsize=9,
-        )
+    ax1.legend(loc="upper left", framealpha=0.8)
+
+    # エントリー価格（legend作成後に追加して凡例には含めない）
+    entry_line = ax1.axhline(
+        0,
+        color="purple",
+        ls="-",
+        lw=2,
+        alpha=0.7,
+        label="Entry Price",
+        visible=False,
+    )
+    # 凡例（左上）と重ならないよう右端に表示
+    entry_text = ax1.text(
+        0, 0, "", va="bottom", ha="right", fontsize=9, visible=False
+    )
 
     # 日付ラベルの重なりを防ぐ
     ax1.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
     ax1.xaxis.set_major_locator(mdates.MinuteLocator(interval=5))
+    ax1.tick_params(axis="x", labelrotation=45)
+
+    # 余白は固定値にして、保存時のbbox計測（bbox_inches="tight"）を省く
+    fig.subplots_adjust(left=0.08, right=0.98, top=0.93, bottom=0.15)
+
+    return _SymbolChart(
+        fig=fig,
+        ax=ax1,
+        close_line=close_line,
+        sar_up=sar_up,
+        sar_down=sar_down,
+        sma_20=sma_20,
+        sma_50=sma_50,
+        entry_line=entry_line,
+        entry_text=entry_text,
+    )
+
+
+def _column_values(df: pd.DataFrame, column: str, window: slice) -> np.ndarray:
+    """列の表示範囲をfloat配列で返す（列がなければ空配列）。"""
+    if column not in df.columns:
+        return np.empty(0)
+    values: np.ndarray = df[column].to_numpy(dtype=float)[window]
+    return values
+
+
+def _set_scatter_values(
+    collection: PathCollection, x: np.ndarray, values: np.ndarray
+) -> None:
+    """NaNを除いた点を散布図に設定する。"""
+    if values.size == 0:
+        collection.set_offsets(np.empty((0, 2)))
+        return
+    # pandasのラベルインデックスを介さず、numpy配列上でマスクする
+    mask = ~np.isnan(values)
+    collection.set_offsets(np.column_stack((x[mask], values[mask])))
 
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+
+def notification_plot_buff(
+    df: pd.DataFrame,
+    timeframe: str,
+    symbol: str,
+    entry_price: float,
+) -> BytesIO:
+    """グラフを作成し、BytesIOとして返す。"""
+    logger.debug(f"Creating plot for {symbol}")
+
+    # 最新の60データポイントのみ使用
+    # DataFrameはコピーせず、描画に使う列のnumpy配列だけを切り出す
+    window = slice(max(0, len(df) - 60), len(df))
+
+    if symbol not in _symbol_chart_cache:
+        _symbol_chart_cache[symbol] = _create_symbol_chart()
+    chart = _symbol_chart_cache[symbol]
+    fig = chart.fig
+
+    # 日付は数値に変換してからアーティストへ渡す
+    x = mdates.date2num(df["timestamp"].to_numpy()[window])
+    close = df["close"].to_numpy(dtype=float)[window]
+    sar_up = _column_values(df, "sar_up", window)
+    sar_down = _column_values(df, "sar_down", window)
+    sma_20 = _column_values(df, "sma_20", window)
+    sma_50 = _column_values(df, "sma_50", window)
+
+    chart.close_line.set_data(x, close)
+    _set_scatter_values(chart.sar_up, x, sar_up)
+    _set_scatter_values(chart.sar_down, x, sar_down)
+    if sma_20.size:
+        chart.sma_20.set_data(x, sma_20)
+    else:
+        chart.sma_20.set_data([], [])
+    if sma_50.size:
+        chart.sma_50.set_data(x, sma_50)
+    else:
+        chart.sma_50.set_data([], [])
+
+    chart.ax.set_title(f"{symbol} Price with Parabolic SAR ({timeframe})")
+
+    has_entry = entry_price > 0
+    chart.entry_line.set_visible(has_entry)
+    chart.entry_text.set_visible(has_entry)
+    if has_entry:
+        chart.entry_line.set_ydata([entry_price, entry_price])
+        chart.entry_text.set_position((x[-1], entry_price))
+        chart.entry_text.set_text(f"Entry : {entry_price:.2f} ")
+
+    # 表示範囲は明示的に指定する（オートスケールと同じ5%の余白）
+    # 散布図（SAR）はrelimの対象外のため、表示する値から直接範囲を求める
+    x_margin = (x[-1] - x[0]) * 0.05
+    chart.ax.set_xlim(x[0] - x_margin, x[-1] + x_margin)
+    y_values = np.concatenate(
+        [close, sar_up, sar_down, sma_20, sma_50]
+        + ([np.array([entry_price])] if has_entry else [])
+    )
+    y_min, y_max = np.nanmin(y_values), np.nanmax(y_values)
+    y_margin = (y_max - y_min) * 0.05
+    chart.ax.set_ylim(y_min - y_margin, y_max + y_margin)
 
     # 画像をメモリ上に保存
     img_buffer = BytesIO()
-    plt.savefig(img_buffer, format="png", dpi=150, bbox_inches="tight")
+    # Discord側で縮小表示されるためdpiは100で十分。圧縮率より速度を優先する
+    fig.savefig(
+        img_buffer,
+        format="png",
+        dpi=100,
+        pil_kwargs={"optimize": False, "compress_level": 1},
+    )
     img_buffer.seek(0)
-    plt.close()
 
     logger.debug(f"Plot for {symbol} created successfully")
     return img_buffer
@@ -1431,6 +1642,9 @@ async def main() -> None:
         await hyperliquid_exchange.ws_client.connect()
         logger.info("WebSocket connected before subscriptions")
 
+    # 決済時の価格はWebSocketで受信した中値を使う（REST往復を省く）
+    await hyperliquid_exchange.subscribe_all_mids_ws()
+
     # Start single WebSocket listener for all subscriptions
     listener_task = asyncio.create_task(
         hyperliquid_exchange.start_ws_listener())
@@ -1439,14 +1653,24 @@ async def main() -> None:
     # Wait a bit for listener to be ready
     await asyncio.sleep(0.5)
 
+    # Discord webhookへのPOSTは1つのセッションで接続（TLS）を使い回す
+    # （セッション未設定時の同期requestsによる送信でイベントループを止めない）
+    connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=300)
+    session = aiohttp.ClientSession(connector=connector)
+    notificator.session = session
+
     try:
         # シグナルチェックループとトレーリングストップループを並行実行
         await asyncio.gather(
             signal_check_loop(),
             trailing_stop_loop(),
             close_position_notification_loop(),
+            close_notification_worker(),
         )
     finally:
+        notificator.session = None
+        await session.close()
+
         # Clean up listener on exit
         listener_task.cancel()
         try:
@@ -1458,7 +1682,7 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_event_loop(main())
     except KeyboardInterrupt:
         logger.info("Application stopped by user")
     except Exception as e:
@@ -1,98 +1,43 @@
-import sys
+import asyncio
+import re
+import signal
+import threading
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from io import BytesIO
-from pathlib import Path
+from typing import Any, NamedTuple, TypeVar
 
+import aiohttp
 import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
-import seaborn as sns
 from loguru import logger
-from matplotlib import font_manager
-from matplotlib import pyplot as plt
-
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
+
+from crypto_spot_collector.apps._bootstrap import (
+    configure_matplotlib,
+    get_config,
+    setup_logging,
+)
 from crypto_spot_collector.apps.import_historical_data import HistoricalDataImporter
 from crypto_spot_collector.checkers.sar_checker import SARChecker
 from crypto_spot_collector.exchange.bybit import BybitExchange
 from crypto_spot_collector.notification.discord import discordNotification
-from crypto_spot_collector.providers.market_data_provider import MarketDataProvider
+from crypto_spot_collector.providers.market_data_provider import (
+    IndicatorFrame,
+    MarketDataProvider,
+)
+from crypto_spot_collector.repository.ohlcv_repository import OHLCVRepository
 from crypto_spot_collector.repository.trade_data_repository import TradeDataRepository
 from crypto_spot_collector.utils.dataframe import append_dates_with_nearest
-from crypto_spot_collector.utils.secrets import load_config
 from crypto_spot_collector.utils.trade_data import create_update_trade_data
 
-# ログ設定
-# ログフォルダのパスを取得（プロジェクトルート/logs）
-LOG_DIR = Path(__file__).parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
-
-# ログファイル名（日付付き）
-log_file = LOG_DIR / f"buy_spot_{datetime.now().strftime('%Y%m%d')}.log"
-
-# loguruのログ設定
-# デフォルトのハンドラーを削除
-logger.remove()
-
-# 標準出力にログを表示（INFOレベル以上、docker logsで確認可能）
-logger.add(
-    sink=sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="INFO",
-    colorize=True,
-)
-
-# ファイルにログを保存（DEBUGレベル以上、日次ローテーション）
-logger.add(
-    sink=log_file,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="INFO",
-    rotation="00:00",  # 毎日0時にローテーション
-    retention="30 days",  # 30日間保持
-    compression="zip",  # 古いログファイルをzip圧縮
-    encoding="utf-8",
-)
-
-# --- seaborn 設定 ---
-# ライトテーマでいい感じのスタイルを設定
-sns.set_style("whitegrid")
-sns.set_palette("husl")
-
-# カスタムTTFフォントを使用する設定
-# 使い方: fontsフォルダにTTFファイルを配置して、ファイル名を指定
-# 例: "fonts/Inter-Regular.ttf" or "fonts/Roboto-Regular.ttf"
-CUSTOM_FONT_PATH = Path(__file__).parent / "font" / "CourierPrime-Regular.ttf"
-
-if CUSTOM_FONT_PATH and Path(CUSTOM_FONT_PATH).exists():
-    # TTFファイルを登録
-    font_manager.fontManager.addfont(CUSTOM_FONT_PATH)
-    custom_font = font_manager.FontProperties(fname=CUSTOM_FONT_PATH)
-    plt.rcParams["font.family"] = custom_font.get_name()
-    print(f"カスタムフォントを使用: {custom_font.get_name()}")
-else:
-    # デフォルトフォント（システムフォント）
-    plt.rcParams["font.family"] = "sans-serif"
-    plt.rcParams["font.sans-serif"] = ["Arial", "Helvetica", "DejaVu Sans"]
-    if CUSTOM_FONT_PATH:
-        print(
-            f"警告: {CUSTOM_FONT_PATH} が見つかりません。デフォルトフォントを使用します。"
-        )
-
-plt.rcParams["font.size"] = 11
-
-# ライトテーマの配色
-plt.rcParams["figure.facecolor"] = "#FFFFFF"
-plt.rcParams["axes.facecolor"] = "#F8F9FA"
-plt.rcParams["axes.edgecolor"] = "#CCCCCC"
-plt.rcParams["grid.color"] = "#E0E0E0"
-plt.rcParams["grid.linestyle"] = "--"
-plt.rcParams["grid.linewidth"] = 0.8
-plt.rcParams["text.color"] = "#2C3E50"
-plt.rcParams["axes.labelcolor"] = "#2C3E50"
-plt.rcParams["xtick.color"] = "#2C3E50"
-plt.rcParams["ytick.color"] = "#2C3E50"
-
-# -------
-
-
 spot_symbol = [
     "btc",
     "eth",
@@ -109,30 +54,153 @@ spot_symbol = [
     "xaut",
 ]
 
-logger.info("Initializing crypto spot collector script")
-secret_file = Path(__file__).parent / "secrets.json"
-settings_file = Path(__file__).parent / "settings.json"
-secrets = load_config(secret_file, settings_file)
 
-notificator = discordNotification(secrets["discord"]["discordWebhookUrl"])
-importer = HistoricalDataImporter()
-logger.info("Discord notification and historical data importer initialized")
+@dataclass(slots=True)
+class AppContext:
+    """設定ファイルの内容と、通知・DB・取引所のクライアント。"""
 
-bybit_exchange = BybitExchange(
-    apiKey=secrets["bybit"]["apiKey"], secret=secrets["bybit"]["secret"]
-)
-logger.info("Bybit exchange client initialized")
+    secrets: dict[str, Any]
+    notificator: discordNotification
+    importer: HistoricalDataImporter
+    bybit_exchange: BybitExchange
+    data_provider: MarketDataProvider
+
+
+# _initialize()で設定される
+# （import時に設定読込・DB接続・取引所クライアント作成を行わないようにする）
+_app: AppContext | None = None
+
+
+def _get_app() -> AppContext:
+    """_initialize()で作成したAppContextを返す。"""
+    if _app is None:
+        raise RuntimeError("buy_spot is not initialized. Call _initialize() first.")
+    return _app
+
+
+def _initialize() -> None:
+    """ログ・グラフ設定と、設定ファイル・通知・取引所クライアントを初期化する。
+
+    スクリプトとして実行された場合のみ呼び出す。
+    """
+    global _app
+
+    setup_logging("buy_spot")
+    configure_matplotlib()
+
+    logger.info("Initializing crypto spot collector script")
+    secrets = get_config()
+
+    notificator = discordNotification(secrets["discord"]["discordWebhookUrl"])
+    importer = HistoricalDataImporter()
+    logger.info("Discord notification and historical data importer initialized")
+
+    bybit_exchange = BybitExchange(
+        apiKey=secrets["bybit"]["apiKey"], secret=secrets["bybit"]["secret"]
+    )
+    logger.info("Bybit exchange client initialized")
+
+    # 同じ時刻の複数時間足チェックでは1h足をDBから1回だけ読む
+    # リポジトリはループ全体で1つを使い回し、チェックごとに作り直さない
+    data_provider = MarketDataProvider(cache_rows=True, repository=OHLCVRepository())
+
+    _app = AppContext(
+        secrets=secrets,
+        notificator=notificator,
+        importer=importer,
+        bybit_exchange=bybit_exchange,
+        data_provider=data_provider,
+    )
+
+
+# Bybit APIへの同時リクエスト数の上限（レート制限対策）
+BYBIT_CONCURRENCY = 5
+# 同時に発注する数の上限（アカウント単位の発注レート制限対策）
+ORDER_CONCURRENCY = 4
+
+# シグナル判定に使うパラボリックSARの設定
+SAR_CONFIG = {"step": 0.02, "max_step": 0.2}
+
+# 日本時間（時間足の区切り判定に使用）
+JST = timezone(timedelta(hours=9))
+
+# 時間足文字列（例: "4h", "15m", "1d"）
+TIMEFRAME_PATTERN = re.compile(r"(\d+)[mhd]")
+
+T = TypeVar("T")
+
+# 停止要求（SIGINT/SIGTERM）を待機中のループへ伝えるイベント
+shutdown_event = asyncio.Event()
+
+# Discordの1メッセージに含められるembed/添付ファイルの上限
+DISCORD_MAX_EMBEDS = 10
+
+# シグナル通知1件分（embed, (グラフ画像, ファイル名)）
+SignalNotification = tuple[dict[str, Any], tuple[bytes, str]]
+
+
+@dataclass(frozen=True, slots=True)
+class TimeframeSetting:
+    """settings.jsonの時間足設定を、ループ前に一度だけ解析したもの。"""
+
+    timeframe: str
+    # 時間足の間隔（時間数）。JSTの時刻がこの倍数のときにチェックする
+    delta: int
+    amount_by_usdt: float
+    # SARCheckerは判定間で状態を持たないため使い回せる
+    sar_checker: SARChecker
+
+    @classmethod
+    def from_setting(cls, setting: dict[str, Any]) -> "TimeframeSetting":
+        return cls(
+            timeframe=setting["timeframe"],
+            delta=get_timeframe_delta(setting["timeframe"]),
+            amount_by_usdt=setting["amountBuyUSDT"],
+            sar_checker=SARChecker(
+                consecutive_count=setting["consecutivePositiveCount"]
+            ),
+        )
+
+
+# シグナル通知のキュー（signal_notification_workerがまとめて送信）
+_signal_notification_queue: asyncio.Queue[list[SignalNotification]] = asyncio.Queue()
+
+
+async def run_with_semaphore(semaphore: asyncio.Semaphore, coro: Awaitable[T]) -> T:
+    """セマフォを取得してからコルーチンを実行する。"""
+    async with semaphore:
+        return await coro
+
+
+async def wait_for_shutdown(timeout: float) -> bool:
+    """最大timeout秒待機し、その間に停止要求があればTrueを返す。"""
+    try:
+        # タイムアウトはイベントループの単調時計で計られるため、NTP補正の影響を受けない
+        await asyncio.wait_for(shutdown_event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
 
 
 async def main() -> None:
     # 毎時0分に実行
     logger.info("Starting buy spot script")
+    app = _get_app()
+
+    # SIGINT/SIGTERMで待機中のループを即座に終了できるようにする
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, shutdown_event.set)
+        except NotImplementedError:
+            # Windowsではシグナルハンドラを登録できない
+            pass
 
     logger.info("---- Settings ----")
     logger.info(
-        f"Discord Webhook URL: {secrets['discord']['discordWebhookUrl']}")
+        f"Discord Webhook URL: {app.secrets['discord']['discordWebhookUrl']}")
     logger.info(f"Spot Symbols: {spot_symbol}")
-    for setting in secrets["settings"]["timeframes"]:
+    for setting in app.secrets["settings"]["timeframes"]:
         logger.info("------------------")
         timeframe = setting["timeframe"]
         amountByUSDT = setting["amountBuyUSDT"]
@@ -143,17 +211,43 @@ async def main() -> None:
         logger.info(f"consecutivePositiveCount: {consecutivePositiveCount}")
     logger.info("------------------")
 
+    # Discord webhookへのPOSTは1つのセッションで接続（TLS）を使い回す
+    connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=300)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        app.notificator.session = session
+        notification_task = asyncio.create_task(signal_notification_worker())
+        try:
+            await spot_loop()
+        finally:
+            # 未送信の通知を送り切ってからワーカーを止める
+            await _signal_notification_queue.join()
+            notification_task.cancel()
+            app.notificator.session = None
+
+
+async def spot_loop() -> None:
+    """毎時0分に足の取得・シグナルチェック・注文履歴の更新を行う。"""
+    app = _get_app()
+    semaphore = asyncio.Semaphore(BYBIT_CONCURRENCY)
+    order_semaphore = asyncio.Semaphore(ORDER_CONCURRENCY)
+    # 時間足の設定はループに入る前に一度だけ解析しておく
+    timeframe_settings = [
+        TimeframeSetting.from_setting(setting)
+        for setting in app.secrets["settings"]["timeframes"]
+    ]
+
     while True:
         # 次の1時間まで待機処理
         now = datetime.now(timezone.utc)
         logger.info(f"Current time: {now}")
-        next_run = (now + timedelta(hours=1)).replace(minute=0,
-                                                      second=0, microsecond=0)
-        wait_seconds = (next_run - now).total_seconds()
+        wait_seconds = 3600 - (time.time() % 3600)
+        next_run = (now + timedelta(seconds=wait_seconds)).replace(microsecond=0)
         logger.info(
             f"Waiting for {wait_seconds} seconds until next run at {next_run} UTC"
         )
-        await asyncio.sleep(wait_seconds)
+        if await wait_for_shutdown(wait_seconds):
+            logger.info("Shutdown requested, stopping buy spot loop")
+            break
 
         # 時間足の取得・登録
         toDateUtc = datetime.now(timezone.utc).replace(
@@ -161,67 +255,102 @@ async def main() -> None:
         )
         fromDateUtc = toDateUtc - timedelta(days=7)
 
-        logger.info(f"Fetching OHLCV data from {fromDateUtc} to {toDateUtc}")
-
-        # 過去1日のOHLCVデータを取得して登録
-        for symbol in spot_symbol:
-            logger.debug(f"Processing {symbol.upper()}/USDT")
-            ohlcv = await bybit_exchange.fetch_ohlcv_async(
-                symbol=f"{symbol.upper()}/USDT",
-                timeframe="1h",
-                fromDate=fromDateUtc,
-                toDate=toDateUtc,
-            )
+        # 現時刻が時間足の区切り目になっている設定のみシグナルチェックを実行
+        jst_hour = toDateUtc.astimezone(JST).hour
+        active_settings: list[TimeframeSetting] = []
+        for tf in timeframe_settings:
+            if jst_hour % tf.delta == 0:
+                active_settings.append(tf)
+            else:
+                logger.info(
+                    f"Current hour {jst_hour} is not a multiple of {tf.delta}, "
+                    "skipping signal check"
+                )
 
-            # OHLCVデータの登録
-            importer.register_data(symbol.upper(), ohlcv)
-            logger.debug(f"Registered OHLCV data for {symbol.upper()}")
+        if active_settings:
+            await fetch_and_register_ohlcv(semaphore, fromDateUtc, toDateUtc)
+        else:
+            # 取得しなかった足は次回の取得時にDBの最新足から補完される
+            logger.info("No timeframe triggers this hour, skipping OHLCV fetch")
 
-        for setting in secrets["settings"]["timeframes"]:
+        for tf in active_settings:
             # spot_symbol = setting["spotSymbol"]
-            timeframe = setting["timeframe"]
-            amountByUSDT = setting["amountBuyUSDT"]
-            consecutivePositiveCount = setting["consecutivePositiveCount"]
-
-            timeframe_delta = int(
-                timeframe.replace("m", "").replace("h", "").replace("d", "")
+            timeframe = tf.timeframe
+            amountByUSDT = tf.amount_by_usdt
+            sar_checker = tf.sar_checker
+
+            logger.info(f"Checking signals... timeframe={timeframe}")
+            checkEndDate = toDateUtc
+            checkStartDate = checkEndDate - timedelta(days=14)
+
+            # 全シンボルのインジケーター付きデータを1回のクエリで取得
+            # SARだけで買いシグナルが出ないシンボルは、SMA等の計算を省いて除外する
+            logger.debug(
+                "Fetching indicators from {} to {}", checkStartDate, checkEndDate)
+            dataframes = app.data_provider.get_dataframes_with_indicators(
+                symbols=[symbol.upper() for symbol in spot_symbol],
+                interval=timeframe,
+                from_datetime=checkStartDate,
+                to_datetime=checkEndDate,
+                sma_windows=[50, 100],
+                sar_config=SAR_CONFIG,
+                prefilter=sar_checker.check_long_values,
+            )
+            candidate_symbols = [
+                symbol for symbol in spot_symbol if symbol.upper() in dataframes
+            ]
+            logger.info(
+                f"Signal candidates ({timeframe}): "
+                f"{[symbol.upper() for symbol in candidate_symbols]}"
             )
 
-            # 現時刻が時間足の区切り目であればシグナルチェックを実行
-            toJst = toDateUtc.astimezone(timezone(timedelta(hours=9)))
-            if toJst.hour % timeframe_delta == 0:
-                logger.info(f"Checking signals... timeframe={timeframe}")
-                checkEndDate = toDateUtc
-                checkStartDate = checkEndDate - timedelta(days=14)
-
-                for symbol in spot_symbol:
-                    logger.debug(f"Checking signal for {symbol.upper()}")
-                    await check_signal(
-                        startDate=checkStartDate,
-                        endDate=checkEndDate,
+            # 発注部分のみセマフォで制限し、グラフ描画は並行して進める
+            signal_results = await asyncio.gather(
+                *(
+                    check_signal(
+                        df=dataframes[symbol.upper()],
                         symbol=symbol.upper(),
                         timeframe=timeframe,
                         amountByUSDT=amountByUSDT,
-                        consecutivePositiveCount=consecutivePositiveCount,
+                        sar_checker=sar_checker,
+                        order_semaphore=order_semaphore,
                     )
-            else:
-                logger.info(
-                    f"Current hour {toJst.hour} is not a multiple of {timeframe_delta}, skipping signal check"
-                )
+                    for symbol in candidate_symbols
+                ),
+                return_exceptions=True,
+            )
+            notifications: list[SignalNotification] = []
+            for symbol, result in zip(candidate_symbols, signal_results):
+                if isinstance(result, BaseException):
+                    logger.error(
+                        f"Error checking signal for {symbol.upper()}: {result}")
+                elif result is not None:
+                    notifications.append(result)
+
+            # 同じサイクルで検知したシグナルはまとめて通知する
+            # （送信はワーカーに任せ、Discordの応答を待たずに次の処理へ進む）
+            if notifications:
+                _signal_notification_queue.put_nowait(notifications)
 
         # オーダーDBデータの更新
         logger.info("Updating trade data in database...")
 
-        for symbol in spot_symbol:
-            closed_trades = await bybit_exchange.fetch_close_orders_all_async(
-                symbol=symbol.upper()
-            )
-            open_trades = await bybit_exchange.fetch_open_orders_all_async(
-                symbol=symbol.upper()
-            )
-            canceled_trades = await bybit_exchange.fetch_canceled_orders_all_async(
-                symbol=symbol.upper()
-            )
+        # 全シンボルの注文履歴を並行して取得
+        trade_results = await asyncio.gather(
+            *(
+                run_with_semaphore(semaphore, fetch_trade_history(symbol))
+                for symbol in spot_symbol
+            ),
+            return_exceptions=True,
+        )
+
+        for symbol, trades in zip(spot_symbol, trade_results):
+            if isinstance(trades, BaseException):
+                logger.error(
+                    f"Error fetching trade data for {symbol.upper()}: {trades}")
+                continue
+
+            closed_trades, open_trades, canceled_trades = trades
             create_update_trade_data(
                 symbol=symbol,
                 open_trades=open_trades,
@@ -234,160 +363,270 @@ async def main() -> None:
         #     await notify_current_portfolio()
 
 
+def get_timeframe_delta(timeframe: str) -> int:
+    """時間足文字列（例: "4h"）から数値部分を取り出す。"""
+    match = TIMEFRAME_PATTERN.fullmatch(timeframe)
+    if match is None:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    return int(match.group(1))
+
+
+async def fetch_and_register_ohlcv(
+    semaphore: asyncio.Semaphore, fromDateUtc: datetime, toDateUtc: datetime
+) -> None:
+    """全シンボルの1時間足を取得し、DBへ登録する。"""
+    app = _get_app()
+    logger.info(f"Fetching OHLCV data from {fromDateUtc} to {toDateUtc}")
+
+    # DBに登録済みの最新足以降のみを取得する（最新足は未確定の可能性があるため含める）
+    with OHLCVRepository() as ohlcv_repo:
+        latest_timestamps = ohlcv_repo.get_latest_timestamps(
+            [symbol.upper() for symbol in spot_symbol]
+        )
+    fetch_from = {
+        symbol: get_fetch_start(
+            latest_timestamps.get(symbol.upper()), fromDateUtc)
+        for symbol in spot_symbol
+    }
+
+    # OHLCVデータを並行して取得
+    ohlcv_results = await asyncio.gather(
+        *(
+            run_with_semaphore(
+                semaphore,
+                app.bybit_exchange.fetch_ohlcv_async(
+                    symbol=f"{symbol.upper()}/USDT",
+                    timeframe="1h",
+                    fromDate=fetch_from[symbol],
+                    toDate=toDateUtc,
+                ),
+            )
+            for symbol in spot_symbol
+        ),
+        return_exceptions=True,
+    )
+
+    # OHLCVデータの登録
+    for symbol, ohlcv in zip(spot_symbol, ohlcv_results):
+        if isinstance(ohlcv, BaseException):
+            logger.error(
+                f"Error fetching OHLCV data for {symbol.upper()}/USDT: {ohlcv}")
+            continue
+
+        app.importer.register_data(symbol.upper(), ohlcv)
+        logger.debug("Registered OHLCV data for {}", symbol.upper())
+
+
+async def fetch_trade_history(
+    symbol: str,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """シンボルのクローズ・オープン・キャンセル注文を並行して取得する。
+
+    クローズ・キャンセル注文は注文履歴APIから1回で取得して振り分け、
+    オープン注文のみ別のAPIで取得する。
+
+    Returns:
+        (closed_trades, open_trades, canceled_trades)
+    """
+    bybit_exchange = _get_app().bybit_exchange
+    (closed_trades, canceled_trades), open_trades = await asyncio.gather(
+        bybit_exchange.fetch_closed_and_canceled_orders_all_async(
+            symbol=symbol.upper()
+        ),
+        bybit_exchange.fetch_open_orders_all_async(symbol=symbol.upper()),
+    )
+    return closed_trades, open_trades, canceled_trades
+
+
+def get_fetch_start(latest: datetime | None, default_from: datetime) -> datetime:
+    """OHLCVの取得開始日時を決める。
+
+    DBに登録済みの最新足があればそこから取得し、なければ（または古すぎれば）
+    default_fromから取得する。DBの日時はtimezoneなしのUTC。
+    """
+    if latest is None:
+        return default_from
+    return max(latest.replace(tzinfo=timezone.utc), default_from)
+
+
+async def signal_notification_worker() -> None:
+    """キューに溜まったシグナル通知を取り出し、まとめて送信する。"""
+    while True:
+        batches = [await _signal_notification_queue.get()]
+        while not _signal_notification_queue.empty():
+            batches.append(_signal_notification_queue.get_nowait())
+
+        try:
+            await send_signal_notifications(
+                [notification for batch in batches for notification in batch]
+            )
+        finally:
+            for _ in batches:
+                _signal_notification_queue.task_done()
+
+
+async def send_signal_notifications(notifications: list[SignalNotification]) -> None:
+    """シグナル通知をDiscordの上限（10件）ごとに1メッセージへまとめて送信する。"""
+    notificator = _get_app().notificator
+    for i in range(0, len(notifications), DISCORD_MAX_EMBEDS):
+        chunk = notifications[i:i + DISCORD_MAX_EMBEDS]
+        try:
+            await notificator.send_notification_embed_with_file(
+                message="",
+                embeds=[embed for embed, _ in chunk],
+                image_buffers=[image for _, image in chunk],
+            )
+            logger.info(
+                f"Sent Discord notification for {len(chunk)} signal(s)")
+        except Exception as e:
+            logger.error(f"Error sending signal notifications: {e}")
+
+
 async def check_signal(
-    startDate: datetime,
-    endDate: datetime,
+    df: pd.DataFrame,
     symbol: str,
     timeframe: str,
     amountByUSDT: float,
-    consecutivePositiveCount: int,
-) -> None:
-    """Check for SAR buy/sell signals and send Discord notification if detected."""
-
-    logger.debug(f"Checking signal for {symbol} from {startDate} to {endDate}")
-
-    # Use MarketDataProvider to get DataFrame with indicators
-    data_provider = MarketDataProvider()
-    df = data_provider.get_dataframe_with_indicators(
-        symbol=symbol,
-        interval=timeframe,
-        from_datetime=startDate,
-        to_datetime=endDate,
-        sma_windows=[50, 100],
-        sar_config={"step": 0.02, "max_step": 0.2},
-    )
+    sar_checker: SARChecker,
+    order_semaphore: asyncio.Semaphore,
+) -> SignalNotification | None:
+    """Check for SAR buy signals and place an order if detected.
+
+    df is the indicator DataFrame from MarketDataProvider for this symbol.
+    sar_checker is the shared checker for this timeframe setting.
+    order_semaphore limits concurrent order requests across symbols.
+    Returns the Discord embed and chart for the placed order (sent in a batch
+    by the caller), or None when no order was placed.
+    """
+
+    logger.debug("Checking signal for {}", symbol)
+    app = _get_app()
 
-    logger.debug(f"Retrieved {len(df)} OHLCV records for {symbol}")
+    logger.debug("Retrieved {} OHLCV records for {}", len(df), symbol)
 
     if df.empty:
         logger.warning(f"No data available for {symbol}")
-        return
+        return None
+
+    # 判定・描画で使う列は配列として一度だけ取り出す
+    iframe = IndicatorFrame.from_dataframe(df)
 
     # Use SARChecker to check for buy signal
-    sar_checker = SARChecker(consecutive_count=consecutivePositiveCount)
-    sar_up_signal = sar_checker.check(df)
+    sar_up_signal = sar_checker.check_long_values(iframe.sar_up)
     logger.info(f"{symbol}: SAR Up Signal: {sar_up_signal}")
 
-    # デバッグ用：実際の値を表示
-    logger.debug(f"{symbol}: Recent SAR Up values (newest first):")
     if sar_up_signal:
         logger.info(f"{symbol}: SAR buy signal detected! Placing order...")
         order_result = None
         try:
-            _, order_result = await bybit_exchange.create_order_spot_async(
-                amountByUSDT=amountByUSDT, symbol=symbol
-            )
+            async with order_semaphore:
+                _, order_result = await app.bybit_exchange.create_order_spot_async(
+                    amountByUSDT=amountByUSDT, symbol=symbol
+                )
             logger.success(f"Successfully created spot order for {symbol}")
         except Exception as e:
             logger.error(f"Error creating spot order for {symbol}: {e}")
-            await notificator.send_notification_async(
+            await app.notificator.send_notification_async(
                 message=f"Error creating spot order for {symbol}: {e}", files=[]
             )
-            return
+            return None
 
-        # Discord通知
-        free_usdt = await bybit_exchange.fetch_free_usdt_async()
+        # Discord通知の内容を作成（送信は呼び出し元でまとめて行う）
+        free_usdt = await app.bybit_exchange.fetch_free_usdt_async()
         # average_price = bybit_exchange.fetch_average_buy_price_spot(symbol)
-        with TradeDataRepository() as repo:
-            _, average_price = repo.get_current_position_and_avg_price(
+
+        # 平均取得価格とグラフ用の売買履歴は同じセッションで取得する
+        with TradeDataRepository() as trade_repo:
+            _, average_price = trade_repo.get_current_position_and_avg_price(
                 symbol=symbol)
 
-        embed = discordNotification.embed_object_create_helper(
-            symbol=symbol,
-            price=order_result.price,
-            amount=order_result.amount,
-            freeUsdt=free_usdt,
-            order_value=order_result.order_value,
-            order_id=order_result.order_id,
-            footer="buy_spot.py | bybit",
-            timeframe=timeframe,
-        )
+            embed = discordNotification.embed_object_create_helper(
+                symbol=symbol,
+                price=order_result.price,
+                amount=order_result.amount,
+                freeUsdt=free_usdt,
+                order_value=order_result.order_value,
+                order_id=order_result.order_id,
+                footer="buy_spot.py | bybit",
+                timeframe=timeframe,
+            )
 
-        # グラフ作成
-        plot_buf = [
-            (
-                notification_plot_buff(
-                    df=df,
-                    timeframe=timeframe,
-                    symbol=symbol,
-                    average_price=average_price,
-                    limit_price=order_result.price,
-                ),
-                f"{symbol}_sar.png",
+            # グラフ作成（CPU処理のためイベントループを止めないよう別スレッドで実行）
+            plot_buffer = await asyncio.to_thread(
+                notification_plot_buff,
+                iframe=iframe,
+                timeframe=timeframe,
+                symbol=symbol,
+                average_price=average_price,
+                limit_price=order_result.price,
+                trade_repo=trade_repo,
             )
-        ]
-        await notificator.send_notification_embed_with_file(
-            message="", embeds=[embed], image_buffers=plot_buf
+
+        # デバッグ用：実際の値を表示（1回のログ出力にまとめる）
+        # 文字列の組み立てはDEBUGが有効な場合のみ行う
+        logger.opt(lazy=True).debug(
+            "{}: Recent SAR Up values (newest first): {}",
+            lambda: symbol,
+            lambda: ", ".join(
+                f"{i}: {sar_up}"
+                for i, sar_up in enumerate(iframe.sar_up[-10:][::-1])
+            ),
         )
-        logger.info(f"Sent Discord notification for {symbol}")
 
-        for i, sar_up in enumerate(df["sar_up"].tail(10)[::-1]):
-            logger.debug(f"  {i}: {sar_up}")
-    else:
-        logger.debug(f"{symbol}: No SAR Up signal detected.")
+        return embed, (plot_buffer, f"{symbol}_sar.png")
 
+    logger.debug("{}: No SAR Up signal detected.", symbol)
+    return None
 
-def notification_plot_buff(
-    df: pd.DataFrame,
-    timeframe: str,
-    symbol: str,
-    average_price: float,
-    limit_price: float,
-) -> BytesIO:
-    logger.debug(f"Creating plot for {symbol}")
 
-    # Fetch buy/sell trade data for the same time period
-    startDate = df["timestamp"].min()
-    endDate = df["timestamp"].max()
+# シグナル通知用のグラフ（スレッドごとに初回のみ作成し、以降はデータだけ差し替えて使い回す）
+# notification_plot_buffはasyncio.to_threadから並行して呼ばれるため、
+# 同じFigureを複数スレッドで同時に描画しないようスレッドローカルに持つ
+_signal_chart_local = threading.local()
 
-    with TradeDataRepository() as repo:
-        buy_trades = repo.get_closed_long_positions_date(
-            symbol=symbol, start_date=startDate, end_date=endDate
-        )
-        sell_trades = repo.get_closed_short_positions_date(
-            symbol=symbol, start_date=startDate, end_date=endDate
-        )
 
-        buy_dates = [trade.timestamp_utc for trade in buy_trades]
-        sell_dates = [trade.timestamp_utc for trade in sell_trades]
+class _SignalChart(NamedTuple):
+    """シグナル通知用のFigureと、描画ごとにデータを差し替えるアーティスト。"""
+
+    fig: Figure
+    ax: Axes
+    close_line: Line2D
+    sar_up: PathCollection
+    sar_down: PathCollection
+    sma_50: Line2D
+    buy: PathCollection
+    sell: PathCollection
+    average_line: Line2D
+    average_text: Text
+    limit_line: Line2D
+    limit_text: Text
+
 
-        df = append_dates_with_nearest(df, "buy_date", buy_dates)
-        df = append_dates_with_nearest(df, "sell_date", sell_dates)
+def _create_signal_chart() -> _SignalChart:
+    """グリッド・ラベル・凡例などの固定部分を含むシグナル通知用のグラフを作成する。"""
+    # pyplotの管理下に置かないFigure（plt.closeせずに保持できる）
+    # constrained_layoutで余白を調整し、tight_layout/bbox_inches="tight"を省く
+    fig = Figure(figsize=(10, 6), layout="constrained")
+    ax = fig.subplots(1, 1)
+    empty = np.empty((0, 2))
 
-    fig, ax1 = plt.subplots(1, 1, figsize=(12, 8))
     # 価格チャート
-    ax1.plot(
-        df["timestamp"], df["close"], label="Close Price", color="blue", linewidth=2
-    )
+    (close_line,) = ax.plot([], [], label="Close Price", color="blue", linewidth=2)
 
     # SARをドットで表示（トレンド転換で色を変更）
-    sar_up_mask = ~pd.isna(df["sar_up"])
-    sar_down_mask = ~pd.isna(df["sar_down"])
-
     # 上昇トレンド時のSAR（緑色）
-    ax1.scatter(
-        df.loc[sar_up_mask, "timestamp"],
-        df.loc[sar_up_mask, "sar_up"],
-        color="green",
-        s=30,
-        label="SAR (Bullish)",
-        alpha=0.8,
+    sar_up = ax.scatter(
+        empty[:, 0], empty[:, 1], color="green", s=30, label="SAR (Bullish)", alpha=0.8
     )
-
     # 下降トレンド時のSAR（赤色）
-    ax1.scatter(
-        df.loc[sar_down_mask, "timestamp"],
-        df.loc[sar_down_mask, "sar_down"],
-        color="red",
-        s=30,
-        label="SAR (Bearish)",
-        alpha=0.8,
+    sar_down = ax.scatter(
+        empty[:, 0], empty[:, 1], color="red", s=30, label="SAR (Bearish)", alpha=0.8
     )
 
     # SMA50（オレンジゴールド）
-    ax1.plot(
-        df["timestamp"],
-        df["sma_50"],
+    (sma_50,) = ax.plot(
+        [],
+        [],
         label="SMA 50",
         color="#FFA726",
         linewidth=2.2,
@@ -397,10 +636,9 @@ def notification_plot_buff(
     )
 
     # ロングした日時をグラフに反映
-    buy_signal_data = df.loc[df["buy_date"].notna()]
-    ax1.scatter(
-        buy_signal_data["timestamp"],
-        buy_signal_data["close"],
+    buy = ax.scatter(
+        empty[:, 0],
+        empty[:, 1],
         color="#7CFF82",  # 落ち着いたグリーン
         s=100,
         label="Buy",
@@ -412,10 +650,9 @@ def notification_plot_buff(
     )
 
     # ショートした日時をグラフに反映
-    sell_signal_data = df.loc[df["sell_date"].notna()]
-    ax1.scatter(
-        sell_signal_data["timestamp"],
-        sell_signal_data["close"],
+    sell = ax.scatter(
+        empty[:, 0],
+        empty[:, 1],
         color="#FF6E6E",  # ソフトなレッド
         s=100,
         label="Sell",
@@ -426,62 +663,150 @@ def notification_plot_buff(
         zorder=5,
     )
 
-    ax1.grid(True, alpha=0.3)
-    ax1.set_title(f"{symbol} Price with Parabolic SAR ({timeframe})")
-    ax1.set_ylabel("Price (USD)")
-    ax1.legend()
-
-    if average_price > 0:
-        ax1.axhline(
-            average_price,
-            color="green",
-            ls="--",
-            lw=1,
-            alpha=0.7,
-            label="Average Buy Price",
-        )
-        ax1.text(
-            df["timestamp"].iloc[0],
-            average_price,
-            f" Average Buy : {average_price:.2f}",
-            va="bottom",
-            ha="left",
-            fontsize=9,
-        )
+    ax.grid(True, alpha=0.3)
+    ax.set_ylabel("Price (USD)")
+    ax.legend()
 
-    if limit_price > 0:
-        ax1.axhline(
-            limit_price, color="green", ls="-", lw=1, alpha=0.7, label="Limit Buy Price"
-        )
-        ax1.text(
-            df["timestamp"].iloc[0],
-            limit_price,
-            f" Limit Buy : {limit_price:.2f}",
-            va="bottom",
-            ha="left",
-            fontsize=9,
-        )
+    # 平均取得価格・指値価格（凡例には含めない）
+    average_line = ax.axhline(
+        0, color="green", ls="--", lw=1, alpha=0.7, label="Average Buy Price"
+    )
+    average_text = ax.text(0, 0, "", va="bottom", ha="left", fontsize=9)
+    limit_line = ax.axhline(
+        0, color="green", ls="-", lw=1, alpha=0.7, label="Limit Buy Price"
+    )
+    limit_text = ax.text(0, 0, "", va="bottom", ha="left", fontsize=9)
 
     # 日付ラベルの重なりを防ぐ
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d %H:%M"))
-    ax1.xaxis.set_major_locator(mdates.HourLocator(interval=12))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%m/%d %H:%M"))
+    ax.xaxis.set_major_locator(mdates.HourLocator(interval=12))
+    ax.tick_params(axis="x", labelrotation=45)
+
+    return _SignalChart(
+        fig=fig,
+        ax=ax,
+        close_line=close_line,
+        sar_up=sar_up,
+        sar_down=sar_down,
+        sma_50=sma_50,
+        buy=buy,
+        sell=sell,
+        average_line=average_line,
+        average_text=average_text,
+        limit_line=limit_line,
+        limit_text=limit_text,
+    )
+
+
+def _get_signal_chart() -> _SignalChart:
+    """現在のスレッド用のシグナル通知グラフを取得する（初回のみ作成）。"""
+    chart: _SignalChart | None = getattr(_signal_chart_local, "chart", None)
+    if chart is None:
+        chart = _create_signal_chart()
+        _signal_chart_local.chart = chart
+    return chart
+
+
+def _set_price_line(
+    line: Line2D, text: Text, x: float, price: float, label: str
+) -> None:
+    """価格の水平線と注記を更新する（priceが0以下なら非表示）。"""
+    visible = price > 0
+    line.set_visible(visible)
+    text.set_visible(visible)
+    if visible:
+        line.set_ydata([price, price])
+        text.set_position((x, price))
+        text.set_text(f" {label} : {price:.2f}")
 
-    plt.xticks(rotation=45)
-    plt.tight_layout()
 
-    # 画像をメモリ上に保存
+def notification_plot_buff(
+    iframe: IndicatorFrame,
+    timeframe: str,
+    symbol: str,
+    average_price: float,
+    limit_price: float,
+    trade_repo: TradeDataRepository,
+) -> bytes:
+    logger.debug("Creating plot for {}", symbol)
+    df = iframe.df
+
+    # Fetch buy/sell trade data for the same time period
+    startDate = df["timestamp"].min()
+    endDate = df["timestamp"].max()
+
+    buy_trades = trade_repo.get_closed_long_positions_date(
+        symbol=symbol, start_date=startDate, end_date=endDate
+    )
+    sell_trades = trade_repo.get_closed_short_positions_date(
+        symbol=symbol, start_date=startDate, end_date=endDate
+    )
+
+    buy_dates = [trade.timestamp_utc for trade in buy_trades]
+    sell_dates = [trade.timestamp_utc for trade in sell_trades]
+
+    df = append_dates_with_nearest(df, "buy_date", buy_dates)
+    df = append_dates_with_nearest(df, "sell_date", sell_dates)
+
+    # DataFrameの.locを経由せず、numpy配列と描画対象のインデックスで直接切り出す
+    # 日時はmatplotlibの数値に一度だけ変換し、描画のたびの変換を省く
+    ts = mdates.date2num(iframe.timestamp)
+    close = iframe.close
+    sar_up = iframe.sar_up
+    sar_down = iframe.sar_down
+    sma_50 = iframe.sma[50]
+    sar_up_idx = np.flatnonzero(~np.isnan(sar_up))
+    sar_down_idx = np.flatnonzero(~np.isnan(sar_down))
+    buy_idx = np.flatnonzero(df["buy_date"].notna().to_numpy())
+    sell_idx = np.flatnonzero(df["sell_date"].notna().to_numpy())
+
+    # 固定部分（グリッド・凡例・軸の書式）は作成済みのものを使い、データだけ差し替える
+    chart = _get_signal_chart()
+    chart.close_line.set_data(ts, close)
+    chart.sar_up.set_offsets(np.column_stack((ts[sar_up_idx], sar_up[sar_up_idx])))
+    chart.sar_down.set_offsets(
+        np.column_stack((ts[sar_down_idx], sar_down[sar_down_idx]))
+    )
+    chart.sma_50.set_data(ts, sma_50)
+    chart.buy.set_offsets(np.column_stack((ts[buy_idx], close[buy_idx])))
+    chart.sell.set_offsets(np.column_stack((ts[sell_idx], close[sell_idx])))
+    chart.ax.set_title(f"{symbol} Price with Parabolic SAR ({timeframe})")
+
+    _set_price_line(
+        chart.average_line, chart.average_text, ts[0], average_price, "Average Buy"
+    )
+    _set_price_line(chart.limit_line, chart.limit_text, ts[0], limit_price, "Limit Buy")
+
+    # 表示範囲は明示的に指定する（オートスケールと同じ5%の余白）
+    # 散布図はrelimの対象外のため、表示する値から直接範囲を求める
+    x_margin = (ts[-1] - ts[0]) * 0.05
+    chart.ax.set_xlim(ts[0] - x_margin, ts[-1] + x_margin)
+    y_values = np.concatenate(
+        [close, sar_up, sar_down, sma_50]
+        + [np.array([price]) for price in (average_price, limit_price) if price > 0]
+    )
+    y_min, y_max = np.nanmin(y_values), np.nanmax(y_values)
+    y_margin = (y_max - y_min) * 0.05
+    chart.ax.set_ylim(y_min - y_margin, y_max + y_margin)
+
+    # 画像をメモリ上に保存（Discord表示では100dpiで十分）
+    # PNGの圧縮は最低レベルにして、エンコード時間を優先する
     img_buffer1 = BytesIO()
-    plt.savefig(img_buffer1, format="png", dpi=150, bbox_inches="tight")
-    img_buffer1.seek(0)
-    plt.close()
+    chart.fig.savefig(
+        img_buffer1,
+        format="png",
+        dpi=100,
+        pil_kwargs={"optimize": False, "compress_level": 1},
+    )
 
-    logger.debug(f"Plot for {symbol} created successfully")
-    return img_buffer1
+    logger.debug("Plot for {} created successfully", symbol)
+    # 送信側はbytesをそのまま添付できるため、バッファではなく内容を返す
+    # （getvalue()は内部のbytesをそのまま返し、コピーしない）
+    return img_buffer1.getvalue()
 
 
 if __name__ == "__main__":
-    import asyncio
-
+    _initialize()
     logger.info("Starting crypto spot collector application")
     try:
         asyncio.run(main())
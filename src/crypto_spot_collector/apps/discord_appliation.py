@@ -1,64 +1,21 @@
 import asyncio
-import sys
-from datetime import datetime
-from pathlib import Path
 
 import discord
 from discord.ext import commands
 from loguru import logger
 
+from crypto_spot_collector.apps._bootstrap import get_config, setup_logging
 from crypto_spot_collector.exchange.bybit import BybitExchange
 
 # from crypto_spot_collector.discord.cogs.greet import GreetCog
-from crypto_spot_collector.utils.secrets import load_config
 from crypto_spot_collector.utils.version import get_version_from_git
 
 intents = discord.Intents.default()
 bot = commands.Bot(command_prefix="!", intents=intents)
 
-# ログ設定
-# ログフォルダのパスを取得（プロジェクトルート/logs）
-LOG_DIR = Path(__file__).parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
+setup_logging("discord_application", stdout_level="DEBUG", file_level="DEBUG")
 
-# ログファイル名（日付付き）
-log_file = LOG_DIR / \
-    f"discord_application_{datetime.now().strftime('%Y%m%d')}.log"
-
-# loguruのログ設定
-# デフォルトのハンドラーを削除
-logger.remove()
-
-# 標準出力にログを表示（INFOレベル以上、docker logsで確認可能）
-logger.add(
-    sink=sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="DEBUG",
-    colorize=True
-)
-
-# ファイルにログを保存（DEBUGレベル以上、日次ローテーション）
-logger.add(
-    sink=log_file,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG",
-    rotation="00:00",  # 毎日0時にローテーション
-    retention="30 days",  # 30日間保持
-    compression="zip",  # 古いログファイルをzip圧縮
-    encoding="utf-8"
-)
-
-# ログ設定
-# ログフォルダのパスを取得（プロジェクトルート/logs）
-LOG_DIR = Path(__file__).parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
-# ログファイル名（日付付き）
-log_file = LOG_DIR / \
-    f"discord_application_{datetime.now().strftime('%Y%m%d')}.log"
-
-secret_file = Path(__file__).parent / "secrets.json"
-settings_file = Path(__file__).parent / "settings.json"
-secrets = load_config(secret_file, settings_file)
+secrets = get_config()
 
 BOT_TOKEN = secrets["discord"]["discordBotToken"]
 
@@ -1,53 +1,23 @@
-import sys
-from datetime import datetime, timedelta
-from pathlib import Path
+import asyncio
 from typing import Any
 
 from loguru import logger
 
+from crypto_spot_collector.apps._bootstrap import (
+    get_config,
+    run_event_loop,
+    setup_logging,
+)
 from crypto_spot_collector.apps.import_historical_data import HistoricalDataImporter
 from crypto_spot_collector.exchange.hyperliquid import HyperLiquidExchange
 from crypto_spot_collector.exchange.types import PositionSide
 from crypto_spot_collector.repository.ohlcv_repository import OHLCVRepository
-from crypto_spot_collector.utils.secrets import load_config
-
-# ログ設定
-# ログフォルダのパスを取得（プロジェクトルート/logs）
-LOG_DIR = Path(__file__).parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
-
-# ログファイル名（日付付き）
-log_file = LOG_DIR / \
-    f"hyperliquid_perp_{datetime.now().strftime('%Y%m%d')}.log"
-
-# loguruのログ設定
-# デフォルトのハンドラーを削除
-logger.remove()
-
-# 標準出力にログを表示（INFOレベル以上、docker logsで確認可能）
-logger.add(
-    sink=sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    level="DEBUG",
-    colorize=True,
-)
-
-# ファイルにログを保存（DEBUGレベル以上、日次ローテーション）
-logger.add(
-    sink=log_file,
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="INFO",
-    rotation="00:00",  # 毎日0時にローテーション
-    retention="30 days",  # 30日間保持
-    compression="zip",  # 古いログファイルをzip圧縮
-    encoding="utf-8",
-)
+from crypto_spot_collector.utils.json_codec import loads
 
+setup_logging("hyperliquid_perp", stdout_level="DEBUG")
 
 logger.info("Initializing crypto spot collector script")
-secret_file = Path(__file__).parent / "secrets.json"
-settings_file = Path(__file__).parent / "settings.json"
-secrets = load_config(secret_file, settings_file)
+secrets = get_config()
 
 repo = OHLCVRepository()
 importer = HistoricalDataImporter()
@@ -55,10 +25,21 @@ importer = HistoricalDataImporter()
 
 logger.info("Configuration loaded successfully")
 
+# WebSocketで受信したキャンドルはまとめてDBへ書き込む
+CANDLE_FLUSH_INTERVAL_SECONDS = 1.0
+CANDLE_FLUSH_SIZE = 64
+
+# 書き込み待ちのキャンドル（開始時刻ごとに最新の値だけを保持し、
+# 同じ足の途中更新は最後に受信したものだけを書き込む）
+_candle_buf: dict[Any, list[Any]] = {}
+# importerのDBセッションはスレッドセーフではないため、書き込みは1つずつ行う
+_candle_flush_lock = asyncio.Lock()
+# 件数超過時に起動した書き込みタスク（GCで消えないよう参照を保持する）
+_background_tasks: set[asyncio.Task[int]] = set()
+
 
 async def test_minimal_ws() -> None:
     """最小限のWebSocket購読テスト - candleを購読"""
-    import asyncio
     import json
     import time
 
@@ -66,7 +47,7 @@ async def test_minimal_ws() -> None:
 
     ws_url = "wss://api.hyperliquid.xyz/ws"
 
-    async with websockets.connect(ws_url) as websocket:
+    async with websockets.connect(ws_url, compression=None) as websocket:
         # XRPの1分足キャンドルを購読
         subscription = {
             "method": "subscribe",
@@ -86,7 +67,7 @@ async def test_minimal_ws() -> None:
         for i in range(20):
             message = await websocket.recv()
             current_time = time.time()
-            data = json.loads(message)
+            data = loads(message)
 
             # 前回からの経過時間を計算
             interval_seconds = None
@@ -118,7 +99,7 @@ async def test_minimal_ws() -> None:
 def handle_candle(candles: Any) -> None:
     """キャンドルデータを受信したときのコールバック"""
     # nonlocal candle_count
-    logger.info(f"handle_candle called! Received data: {candles}")
+    logger.info("handle_candle called! Received data: {}", candles)
     for candle in candles if isinstance(candles, list) else [candles]:
         # candle_count += 1
 
@@ -135,13 +116,9 @@ def handle_candle(candles: Any) -> None:
             candle.get("v"),
         ]
 
-        logger.debug(f"Prepared OHLCV data: {ohlvc_data}")
+        logger.debug("Prepared OHLCV data: {}", ohlvc_data)
 
-        result = importer.register_data(
-            symbol="XRP_ws",
-            data=[ohlvc_data]
-        )
-        logger.info(f"register_data returned: {result}")
+        _candle_buf[candle.get("t")] = ohlvc_data
 
         logger.info(
             f"Symbol: {candle.get('s')}, "
@@ -166,6 +143,46 @@ def handle_candle(candles: Any) -> None:
         #     f"Trades: {candle.get('n')}"
         # )
 
+    if len(_candle_buf) >= CANDLE_FLUSH_SIZE:
+        task = asyncio.get_running_loop().create_task(flush_candles())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+async def flush_candles() -> int:
+    """書き込み待ちのキャンドルを1回のregister_dataでまとめて登録する"""
+    if not _candle_buf:
+        return 0
+
+    data = list(_candle_buf.values())
+    _candle_buf.clear()
+
+    try:
+        # DB書き込みは同期処理のため別スレッドで実行し、WebSocketの受信を止めない
+        async with _candle_flush_lock:
+            result: int = await asyncio.to_thread(
+                importer.register_data,
+                symbol="XRP_ws",
+                data=data
+            )
+    except Exception as e:
+        logger.error(f"Error flushing candles: {e}")
+        # 書き込めなかったキャンドルはバッファへ戻して次回再送する
+        # （待機中に同じ足の新しい値を受信していればそちらを優先する）
+        for row in data:
+            _candle_buf.setdefault(row[0], row)
+        return 0
+
+    logger.info(f"register_data returned: {result}")
+    return result
+
+
+async def candle_flush_loop() -> None:
+    """一定間隔で書き込み待ちのキャンドルをDBへ登録する"""
+    while True:
+        await asyncio.sleep(CANDLE_FLUSH_INTERVAL_SECONDS)
+        await flush_candles()
+
 
 async def main() -> None:
     # HyperLiquidExchangeのWebSocket機能をテスト
@@ -187,6 +204,8 @@ async def main() -> None:
 
     logger.info("Starting WebSocket listener task...")
 
+    flush_task = asyncio.create_task(candle_flush_loop())
+
     try:
         symbol = "XRP/USDC:USDC"
 
@@ -241,7 +260,9 @@ async def main() -> None:
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
     finally:
-        # クリーンアップ
+        # クリーンアップ（書き込み待ちのキャンドルを登録してから終了する）
+        flush_task.cancel()
+        await flush_candles()
         await hyperliquid_exchange.close()
         listener_task.cancel()
         try:
@@ -250,6 +271,4 @@ async def main() -> None:
             pass
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
+    run_event_loop(main())
@@ -1,16 +1,14 @@
 """過去トレードデータをすべて取得してtrade_dataテーブルに挿入・更新するスクリプト。"""
 import asyncio
-from pathlib import Path
+from typing import Any
 
 from loguru import logger
 
+from crypto_spot_collector.apps._bootstrap import get_config
 from crypto_spot_collector.exchange.bybit import BybitExchange
-from crypto_spot_collector.utils.secrets import load_config
 from crypto_spot_collector.utils.trade_data import create_update_trade_data
 
-secret_file = Path(__file__).parent / "secrets.json"
-settings_file = Path(__file__).parent / "settings.json"
-secrets = load_config(secret_file, settings_file)
+secrets = get_config()
 
 spot_symbol = ["btc", "eth", "xrp", "sol", "link",
                "avax", "hype", "bnb", "doge", "wld", "ltc", "pol",
@@ -19,24 +17,53 @@ spot_symbol = ["btc", "eth", "xrp", "sol", "link",
 # spot_symbol = ["ltc"]
 
 
+# 取引所APIへの同時リクエスト数の上限
+FETCH_CONCURRENCY = 4
+
+
+async def fetch_trade_history(
+    bybit_exchange: BybitExchange, symbol: str, semaphore: asyncio.Semaphore
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """シンボルのクローズ・オープン・キャンセル注文を取得する。
+
+    Returns:
+        (closed_trades, open_trades, canceled_trades)
+    """
+    async with semaphore:
+        logger.info(f"Fetching all trade data for {symbol.upper()}...")
+        (closed_trades, canceled_trades), open_trades = await asyncio.gather(
+            bybit_exchange.fetch_closed_and_canceled_orders_all_async(
+                symbol=symbol.upper()
+            ),
+            bybit_exchange.fetch_open_orders_all_async(symbol=symbol.upper()),
+        )
+    return closed_trades, open_trades, canceled_trades
+
+
 async def main() -> None:
     bybit_exchange = BybitExchange(
         apiKey=secrets["bybit"]["apiKey"],
         secret=secrets["bybit"]["secret"]
     )
 
-    for symbol in spot_symbol:
-        logger.info(f"Fetching all trade data for {symbol.upper()}...")
-
-        # 過去トレードデータをすべて取得
-        closed_trades = bybit_exchange.fetch_close_orders_all(
-            symbol=symbol.upper())
+    async with bybit_exchange:
+        # 全シンボルの注文履歴を並行して取得
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        trade_results = await asyncio.gather(
+            *(
+                fetch_trade_history(bybit_exchange, symbol, semaphore)
+                for symbol in spot_symbol
+            ),
+            return_exceptions=True,
+        )
 
-        open_trades = bybit_exchange.fetch_open_orders_all(
-            symbol=symbol.upper())
+    for symbol, trades in zip(spot_symbol, trade_results):
+        if isinstance(trades, BaseException):
+            logger.error(
+                f"Error fetching trade data for {symbol.upper()}: {trades}")
+            continue
 
-        canceled_trades = bybit_exchange.fetch_canceled_orders_all(
-            symbol=symbol.upper())
+        closed_trades, open_trades, canceled_trades = trades
 
         logger.info(
             f"Total {len(closed_trades)} trade records fetched for {symbol.upper()}.")
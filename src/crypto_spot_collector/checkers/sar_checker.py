@@ -2,6 +2,7 @@
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -37,13 +38,9 @@ class SARChecker(SignalChecker):
         Returns:
             True if signal is detected, False otherwise
         """
-        consecutive = 0
-
-        # 最初に連続する数値の個数を数える
-        for value in values:
-            if pd.isna(value):
-                break
-            consecutive += 1
+        # 最初に連続する数値の個数を数える（= 最初のNaNの位置）
+        is_nan = np.isnan(np.asarray(values, dtype=np.float64))
+        consecutive = int(is_nan.argmax()) if is_nan.any() else len(is_nan)
 
         logger.debug(
             f"Consecutive {signal_type} SAR values ({column_name}): {consecutive}")
@@ -57,7 +54,7 @@ class SARChecker(SignalChecker):
             return False
 
         # 指定数の数値の後にNaNがあるかチェック
-        if consecutive < len(values) and pd.isna(values[consecutive]):
+        if consecutive < len(is_nan):
             logger.debug(
                 f"SAR {signal_type} signal confirmed: {self.consecutive_count} "
                 f"consecutive values after NaN"
@@ -90,22 +87,41 @@ class SARChecker(SignalChecker):
 
         # より多くのデータを確認（最大100件）
         check_count = min(100, len(df))
-        recent_values = df["sar_up"].tail(check_count).values[::-1]
+        # NumPy配列のスライス・逆順はビューなのでSeriesのコピーを作らない
+        recent_values = df["sar_up"].to_numpy()[-check_count:][::-1]
+
+        # デバッグ用: df最新・最古の10件と最新10件の値を表示
+        # スライスと文字列化はDEBUGが有効な場合のみ行う
+        lazy_logger = logger.opt(lazy=True)
+        lazy_logger.debug(
+            "DataFrame head (oldest 10 rows):\n{}", lambda: df.head(10))
+        lazy_logger.debug(
+            "DataFrame tail (newest 10 rows):\n{}", lambda: df.tail(10))
+        lazy_logger.debug(
+            "Latest 10 sar_up values (newest -> oldest): {}",
+            lambda: recent_values[:10])
+        logger.debug("Total data points checked: {}", check_count)
 
-        # デバッグ用: df最新・最古の10件を表示
-        logger.debug(
-            f"DataFrame head (oldest 10 rows):\n{df.head(10)}")
-        logger.debug(
-            f"DataFrame tail (newest 10 rows):\n{df.tail(10)}")
-        # デバッグ用: tail(10) の sar_up 値を直接表示
-        tail_sar_up = df["sar_up"].tail(10).values
-        logger.debug(
-            f"df['sar_up'].tail(10).values (oldest -> newest): {tail_sar_up}")
-        # デバッグ用: 最新10件の値を表示
-        logger.debug(
-            f"Latest 10 sar_up values (newest -> oldest): {recent_values[:10]}")
-        logger.debug(f"Total data points checked: {check_count}")
+        return self._check_consecutive_values(recent_values, "sar_up", "long")
+
+    def check_long_values(self, sar_up: np.ndarray) -> bool:
+        """
+        Check for SAR long (buy) signal from a sar_up array.
+
+        check_longと同じ判定を、DataFrameを経由せずにNumPy配列で行う。
+
+        Args:
+            sar_up: sar_up values (oldest -> newest), NaN while in a down trend
 
+        Returns:
+            True if SAR long signal is detected, False otherwise
+        """
+        # check_longと同じく最新100件を逆順（最新 -> 古い順）で確認
+        recent_values = sar_up[-100:][::-1]
+        # 配列の文字列化はDEBUGが有効な場合のみ行う
+        logger.opt(lazy=True).debug(
+            "Latest 10 sar_up values (newest -> oldest): {}",
+            lambda: recent_values[:10])
         return self._check_consecutive_values(recent_values, "sar_up", "long")
 
     def check_short(self, df: pd.DataFrame, **kwargs: Any) -> bool:
@@ -128,12 +144,14 @@ class SARChecker(SignalChecker):
 
         # より多くのデータを確認（最大100件）
         check_count = min(100, len(df))
-        recent_values = df["sar_down"].tail(check_count).values[::-1]
+        # NumPy配列のスライス・逆順はビューなのでSeriesのコピーを作らない
+        recent_values = df["sar_down"].to_numpy()[-check_count:][::-1]
 
         # デバッグ用: 最新10件の値を表示
-        logger.debug(
-            f"Latest 10 sar_down values (newest -> oldest): {recent_values[:10]}")
-        logger.debug(f"Total data points checked: {check_count}")
+        logger.opt(lazy=True).debug(
+            "Latest 10 sar_down values (newest -> oldest): {}",
+            lambda: recent_values[:10])
+        logger.debug("Total data points checked: {}", check_count)
 
         return self._check_consecutive_values(recent_values, "sar_down", "short")
 
@@ -1,11 +1,11 @@
 """Database configuration and connection management."""
 
 import os
-from typing import Optional
+from typing import Any, Optional
 
 import pymysql  # MySQL driver  # type: ignore
 from dotenv import load_dotenv
-from sqlalchemy import Engine, create_engine, text
+from sqlalchemy import Engine, create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -17,6 +17,27 @@ load_dotenv()
 
 Base = declarative_base()
 
+# SQLite使用時に接続ごとに設定するPRAGMA
+# （WALで読み取りと書き込みを互いにブロックさせず、同期・一時領域のコストを下げる）
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply SQLITE_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class DatabaseConfig:
     """Database configuration class."""
@@ -49,12 +70,20 @@ class DatabaseManager:
     def engine(self) -> Engine:
         """Get database engine."""
         if self._engine is None:
-            self._engine = create_engine(
-                self.config.get_database_url(),
-                echo=False,  # Set to True for SQL logging
-                pool_pre_ping=True,
-                pool_recycle=3600,
-            )
+            database_url = self.config.get_database_url()
+            if database_url.startswith("sqlite"):
+                self._engine = create_engine(
+                    database_url,
+                    echo=False,  # Set to True for SQL logging
+                )
+                event.listen(self._engine, "connect", _set_sqlite_pragmas)
+            else:
+                self._engine = create_engine(
+                    database_url,
+                    echo=False,  # Set to True for SQL logging
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                )
         return self._engine
 
     @property
@@ -7,6 +7,9 @@ from loguru import logger
 from crypto_spot_collector.exchange import IExchange
 from crypto_spot_collector.repository.trade_data_repository import TradeDataRepository
 
+# 日本時間（更新時刻の表示に使用）
+JST = timezone(timedelta(hours=9))
+
 
 class ActivityUpdaterCog(commands.Cog):
     def __init__(self, bot: commands.Bot, exchange: IExchange) -> None:
@@ -65,8 +68,7 @@ class ActivityUpdaterCog(commands.Cog):
             # Format activity string
             pnl_str = f"{total_pnl:+.2f} USDT"
             pnl_pct_str = f"{total_pnl_percent:+.2f}"
-            jst_time_str = datetime.now(timezone.utc).astimezone(
-                timezone(timedelta(hours=9))).strftime('%H:%M')
+            jst_time_str = datetime.now(JST).strftime('%H:%M')
 
             activity_text = (
                 f"PnL : {pnl_str} ({pnl_pct_str}%) | "
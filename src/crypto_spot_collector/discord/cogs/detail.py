@@ -1,18 +1,22 @@
+import threading
 from datetime import datetime, timedelta
 from io import BytesIO
 from typing import List
 
 import discord
 import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
 from discord import app_commands
 from discord.ext import commands
 from loguru import logger
-from matplotlib import pyplot as plt
-from ta.trend import PSARIndicator
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
 from crypto_spot_collector.apps.buy_spot import spot_symbol
 from crypto_spot_collector.exchange import IExchange
+from crypto_spot_collector.indicators.psar import compute_psar
+from crypto_spot_collector.indicators.sma import compute_sma
 from crypto_spot_collector.repository.ohlcv_repository import OHLCVRepository
 from crypto_spot_collector.repository.trade_data_repository import TradeDataRepository
 from crypto_spot_collector.utils.dataframe import append_dates_with_nearest
@@ -60,6 +64,22 @@ async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(DetailBybitCog(bot, bybit_exchange))
 
 
+# 詳細チャート用のFigure（初回のみ作成し、以降は軸をクリアして使い回す）
+_detail_fig: tuple[Figure, Axes] | None = None
+# 同じFigureを同時に描画しないようにするためのロック
+_detail_fig_lock = threading.Lock()
+
+
+def _get_detail_figure() -> tuple[Figure, Axes]:
+    """詳細チャート用のFigureを取得する（初回のみ作成）。"""
+    global _detail_fig
+    if _detail_fig is None:
+        # pyplotの管理下に置かないFigure（plt.closeせずに保持できる）
+        fig = Figure(figsize=(16, 9))
+        _detail_fig = (fig, fig.subplots(1, 1))
+    return _detail_fig
+
+
 def create_detail(symbol: str) -> BytesIO:
     endDate = datetime.now()
     startDate = endDate - timedelta(days=35)
@@ -84,10 +104,11 @@ def create_detail(symbol: str) -> BytesIO:
             }
             for d in data
         ])
+        close = df['close'].to_numpy()
         # SMA50の計算
-        df["sma_50"] = df['close'].rolling(window=50).mean()
+        df["sma_50"] = compute_sma(close, 50)
         # SMA100の計算
-        df["sma_100"] = df['close'].rolling(window=100).mean()
+        df["sma_100"] = compute_sma(close, 100)
 
     with TradeDataRepository() as repo:
         buy_trades = repo.get_closed_long_positions_date(
@@ -115,25 +136,39 @@ def create_detail(symbol: str) -> BytesIO:
     df = df[df['timestamp'] >= start_display_date]
 
     # SAR計算（初期AF=0.02, 最大AF=0.2）
-    sar_indicator = PSARIndicator(
-        high=df['high'],
-        low=df['low'],
-        close=df['close'],
+    # ta互換のSARをNumPy配列上で計算（numbaがあればJITコンパイルされる）
+    sar, sar_up, sar_down = compute_psar(
+        df['high'].to_numpy(dtype=float),
+        df['low'].to_numpy(dtype=float),
+        df['close'].to_numpy(dtype=float),
         step=0.02,
         max_step=0.2
     )
 
-    df['sar'] = sar_indicator.psar()
-    df['sar_up'] = sar_indicator.psar_up()
-    df['sar_down'] = sar_indicator.psar_down()
+    df['sar'] = sar
+    df['sar_up'] = sar_up
+    df['sar_down'] = sar_down
 
-    # データからグラフ作成
-    fig, ax1 = plt.subplots(1, 1, figsize=(16, 9))
+    with _detail_fig_lock:
+        return _plot_detail(df, symbol, average_price)
+
+
+def _plot_detail(df: pd.DataFrame, symbol: str, average_price: float) -> BytesIO:
+    # データからグラフ作成（キャッシュしたFigureの軸をクリアして再描画）
+    fig, ax1 = _get_detail_figure()
+    ax1.cla()
+
+    # 描画に使う列はNumPy配列として一度だけ取り出す（df.locによるSeries生成を避ける）
+    # 日時はmatplotlibの数値に一度だけ変換し、描画のたびの変換を省く
+    ts = mdates.date2num(df['timestamp'].to_numpy())
+    close = df['close'].to_numpy()
+    sar_up = df['sar_up'].to_numpy(dtype=float)
+    sar_down = df['sar_down'].to_numpy(dtype=float)
 
     # 価格チャート（ライトテーマ用配色）
     ax1.plot(
-        df['timestamp'],
-        df['close'],
+        ts,
+        close,
         label="Close Price",
         color='#1E88E5',  # 落ち着いたブルー
         linewidth=2.5,
@@ -141,10 +176,10 @@ def create_detail(symbol: str) -> BytesIO:
     )
 
     # ロングした日時をグラフに反映
-    buy_signal_data = df.loc[df['buy_date'].notna()]
+    buy_mask = df['buy_date'].notna().to_numpy()
     ax1.scatter(
-        buy_signal_data['timestamp'],
-        buy_signal_data['close'],
+        ts[buy_mask],
+        close[buy_mask],
         color="#7CFF82",  # 落ち着いたグリーン
         s=100,
         label='Buy',
@@ -155,10 +190,10 @@ def create_detail(symbol: str) -> BytesIO:
         zorder=5
     )
 
-    sell_signal_data = df.loc[df['sell_date'].notna()]
+    sell_mask = df['sell_date'].notna().to_numpy()
     ax1.scatter(
-        sell_signal_data['timestamp'],
-        sell_signal_data['close'],
+        ts[sell_mask],
+        close[sell_mask],
         color="#FF6E6E",  # ソフトなレッド
         s=100,
         label='Sell',
@@ -170,13 +205,13 @@ def create_detail(symbol: str) -> BytesIO:
     )
 
     # SARをドットで表示（トレンド転換で色を変更）
-    sar_up_mask = ~pd.isna(df['sar_up'])
-    sar_down_mask = ~pd.isna(df['sar_down'])
+    sar_up_mask = ~np.isnan(sar_up)
+    sar_down_mask = ~np.isnan(sar_down)
 
     # 上昇トレンド時のSAR（エメラルドグリーン）
     ax1.scatter(
-        df.loc[sar_up_mask, 'timestamp'],
-        df.loc[sar_up_mask, 'sar_up'],
+        ts[sar_up_mask],
+        sar_up[sar_up_mask],
         color='#26A69A',
         s=60,
         label='SAR (Bullish)',
@@ -188,8 +223,8 @@ def create_detail(symbol: str) -> BytesIO:
 
     # 下降トレンド時のSAR（コーラルレッド）
     ax1.scatter(
-        df.loc[sar_down_mask, 'timestamp'],
-        df.loc[sar_down_mask, 'sar_down'],
+        ts[sar_down_mask],
+        sar_down[sar_down_mask],
         color='#EF5350',
         s=60,
         label='SAR (Bearish)',
@@ -201,8 +236,8 @@ def create_detail(symbol: str) -> BytesIO:
 
     # SMA50（オレンジゴールド）
     ax1.plot(
-        df['timestamp'],
-        df['sma_50'],
+        ts,
+        df['sma_50'].to_numpy(),
         label="SMA 50",
         color='#FFA726',
         linewidth=2.2,
@@ -213,8 +248,8 @@ def create_detail(symbol: str) -> BytesIO:
 
     # SMA100（ディープパープル）
     ax1.plot(
-        df['timestamp'],
-        df['sma_100'],
+        ts,
+        df['sma_100'].to_numpy(),
         label="SMA 100",
         color='#7E57C2',
         linewidth=2.2,
@@ -226,7 +261,7 @@ def create_detail(symbol: str) -> BytesIO:
     # 平均価格
     ax1.axhline(average_price, color='green', ls='--', lw=1,
                 alpha=0.7, label='Average Buy Price')
-    ax1.text(df['timestamp'].iloc[0], average_price,
+    ax1.text(ts[0], average_price,
              f" Average Buy : {average_price:.2f}",
              va="bottom", ha="left", fontsize=9)
 
@@ -251,14 +286,23 @@ def create_detail(symbol: str) -> BytesIO:
     # 日付ラベルの重なりを防ぐ
     ax1.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d %H:%M'))
     ax1.xaxis.set_major_locator(mdates.HourLocator(interval=12))
+    # 表示範囲は明示的に指定し、オートスケールでのデータ走査を省く（既定と同じ5%の余白）
+    x_margin = (ts[-1] - ts[0]) * 0.05
+    ax1.set_xlim(ts[0] - x_margin, ts[-1] + x_margin)
 
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    ax1.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
 
     # グラフをいったん保存
     img_buffer1 = BytesIO()
-    plt.savefig(img_buffer1, format='png', dpi=150, bbox_inches='tight')
+    # Discord側で縮小表示されるためdpiを抑え、PNGは低圧縮で高速にエンコードする
+    # （余白はtight_layoutで調整済みなので、再描画が走るbbox_inches='tight'は使わない）
+    fig.savefig(
+        img_buffer1,
+        format='png',
+        dpi=96,
+        pil_kwargs={"optimize": False, "compress_level": 1},
+    )
     img_buffer1.seek(0)
-    plt.close()
 
     return img_buffer1
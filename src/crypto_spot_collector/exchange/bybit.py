@@ -1,3 +1,4 @@
+from collections.abc import Awaitable, Callable, Iterator
 from datetime import datetime
 from types import TracebackType
 from typing import Any, Optional
@@ -16,6 +17,23 @@ from crypto_spot_collector.repository.trade_data_repository import TradeDataRepo
 
 # bybit.enable_demo_trading(enable=True)
 
+# 注文履歴を取得する開始日時
+ORDER_HISTORY_START = datetime(2025, 11, 1)
+# 注文履歴APIの1回あたりの取得期間（Bybitは最大7日間）
+ORDER_HISTORY_WINDOW_MS = 7 * 24 * 60 * 60 * 1000
+
+
+def _order_history_windows() -> Iterator[tuple[int, int]]:
+    """ORDER_HISTORY_STARTから現在までを7日ごとの(since_ms, until_ms)に区切る。"""
+    since_ms = int(ORDER_HISTORY_START.timestamp() * 1000)
+    now_ms = int(datetime.now().timestamp() * 1000)
+    while since_ms < now_ms:
+        # 今日の日付を超えないようにする
+        until_ms = min(since_ms + ORDER_HISTORY_WINDOW_MS, now_ms)
+        yield since_ms, until_ms
+        # 次の7日間の開始点を設定
+        since_ms = until_ms + 1
+
 
 class BybitExchange(IExchange):
     def __init__(self, apiKey: str, secret: str) -> None:
@@ -25,9 +43,11 @@ class BybitExchange(IExchange):
             "secret": secret
         })
 
+        # 並列リクエスト時もccxt側のレートリミッタで間隔を調整する
         self.exchange_async = ccxt_async.bybit({
             'apiKey': apiKey,
-            "secret": secret
+            "secret": secret,
+            "enableRateLimit": True,
         })
 
         self.repo_trade_data = TradeDataRepository()
@@ -436,8 +456,8 @@ class BybitExchange(IExchange):
     def fetch_average_buy_price_spot(self, symbol: str) -> float:
         logger.debug(f"Fetching average buy price for {symbol} spot")
         try:
-            # 2025/01/01 以降の注文を取得(msで指定)
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
+            # ORDER_HISTORY_START 以降の注文を取得(msで指定)
+            since_ms = int(ORDER_HISTORY_START.timestamp() * 1000)
             orders = self.exchange.fetch_closed_orders(
                 symbol=f"{symbol}/USDT",
                 since=since_ms,
@@ -473,8 +493,8 @@ class BybitExchange(IExchange):
         logger.debug(
             f"Fetching average buy price for {symbol} spot asynchronously")
         try:
-            # 2025/01/01 以降の注文を取得(msで指定)
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
+            # ORDER_HISTORY_START 以降の注文を取得(msで指定)
+            since_ms = int(ORDER_HISTORY_START.timestamp() * 1000)
             orders = await self.exchange_async.fetch_closed_orders(
                 symbol=f"{symbol}/USDT",
                 since=since_ms,
@@ -506,22 +526,22 @@ class BybitExchange(IExchange):
                 f"Failed to fetch average buy price for {symbol} spot: {e}")
             raise
 
-    def fetch_close_orders_all(self, symbol: str) -> list[dict[str, Any]]:
-        logger.debug(f"Fetching all closed orders for {symbol} spot")
+    def _fetch_orders_paged(
+        self,
+        fetcher: Callable[..., list[dict[str, Any]]],
+        symbol: str,
+        label: str,
+    ) -> list[dict[str, Any]]:
+        """ORDER_HISTORY_STARTから現在まで7日ごとに区切ってfetcherで注文を取得する。"""
         all_orders: list[dict[str, Any]] = []
         try:
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
-            now_ms = int(datetime.now().timestamp() * 1000)
-            seven_days_ms = 7 * 24 * 60 * 60 * 1000  # 7日間をミリ秒に変換
-
-            while since_ms < now_ms:
-                # 7日間の終了時刻を計算（今日の日付を超えないように）
-                until_ms = min(since_ms + seven_days_ms, now_ms)
-
+            for since_ms, until_ms in _order_history_windows():
                 logger.debug(
-                    f"Fetching orders from {datetime.fromtimestamp(since_ms/1000)} to {datetime.fromtimestamp(until_ms/1000)}")
+                    f"Fetching {label} orders from "
+                    f"{datetime.fromtimestamp(since_ms / 1000)} to "
+                    f"{datetime.fromtimestamp(until_ms / 1000)}")
 
-                orders = self.exchange.fetch_closed_orders(
+                orders = fetcher(
                     symbol=f"{symbol}/USDT",
                     since=since_ms,
                     limit=100,
@@ -532,39 +552,36 @@ class BybitExchange(IExchange):
                 )
 
                 if orders:
-                    logger.debug(
-                        f"Fetched {len(orders)} orders, total so far: {len(all_orders)}")
                     all_orders.extend(orders)
-
-                # 次の7日間の開始点を設定
-                since_ms = until_ms + 1
+                    logger.debug(
+                        f"Fetched {len(orders)} {label} orders, "
+                        f"total so far: {len(all_orders)}")
 
             logger.info(
-                f"Total closed orders fetched for {symbol} spot: {len(all_orders)}")
+                f"Total {label} orders fetched for {symbol} spot: {len(all_orders)}")
             return all_orders
 
         except Exception as e:
             logger.error(
-                f"Failed to fetch closed orders for {symbol} spot: {e}")
+                f"Failed to fetch {label} orders for {symbol} spot: {e}")
             raise
 
-    async def fetch_close_orders_all_async(self, symbol: str) -> list[dict[str, Any]]:
-        logger.debug(
-            f"Fetching all closed orders for {symbol} spot asynchronously")
+    async def _fetch_orders_paged_async(
+        self,
+        fetcher: Callable[..., Awaitable[list[dict[str, Any]]]],
+        symbol: str,
+        label: str,
+    ) -> list[dict[str, Any]]:
+        """_fetch_orders_pagedの非同期版。"""
         all_orders: list[dict[str, Any]] = []
         try:
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
-            now_ms = int(datetime.now().timestamp() * 1000)
-            seven_days_ms = 7 * 24 * 60 * 60 * 1000  # 7日間をミリ秒に変換
-
-            while since_ms < now_ms:
-                # 7日間の終了時刻を計算（今日の日付を超えないように）
-                until_ms = min(since_ms + seven_days_ms, now_ms)
-
+            for since_ms, until_ms in _order_history_windows():
                 logger.debug(
-                    f"Fetching orders from {datetime.fromtimestamp(since_ms/1000)} to {datetime.fromtimestamp(until_ms/1000)}")
+                    f"Fetching {label} orders from "
+                    f"{datetime.fromtimestamp(since_ms / 1000)} to "
+                    f"{datetime.fromtimestamp(until_ms / 1000)}")
 
-                orders = await self.exchange_async.fetch_closed_orders(
+                orders = await fetcher(
                     symbol=f"{symbol}/USDT",
                     since=since_ms,
                     limit=100,
@@ -575,191 +592,81 @@ class BybitExchange(IExchange):
                 )
 
                 if orders:
-                    logger.debug(
-                        f"Fetched {len(orders)} orders, total so far: {len(all_orders)}")
                     all_orders.extend(orders)
-
-                # 次の7日間の開始点を設定
-                since_ms = until_ms + 1
+                    logger.debug(
+                        f"Fetched {len(orders)} {label} orders, "
+                        f"total so far: {len(all_orders)}")
 
             logger.info(
-                f"Total closed orders fetched for {symbol} spot: {len(all_orders)} (async)")
+                f"Total {label} orders fetched for {symbol} spot: "
+                f"{len(all_orders)} (async)")
             return all_orders
 
         except Exception as e:
             logger.error(
-                f"Failed to fetch closed orders for {symbol} spot: {e}")
+                f"Failed to fetch {label} orders for {symbol} spot: {e}")
             raise
 
-    def fetch_open_orders_all(self, symbol: str) -> list[dict[str, Any]]:
-        logger.debug(f"Fetching all open orders for {symbol} spot")
-        all_orders: list[dict[str, Any]] = []
-        try:
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
-            now_ms = int(datetime.now().timestamp() * 1000)
-            seven_days_ms = 7 * 24 * 60 * 60 * 1000  # 7日間をミリ秒に変換
-
-            while since_ms < now_ms:
-                # 7日間の終了時刻を計算（今日の日付を超えないように）
-                until_ms = min(since_ms + seven_days_ms, now_ms)
-
-                logger.debug(
-                    f"Fetching open orders from {datetime.fromtimestamp(since_ms/1000)} to {datetime.fromtimestamp(until_ms/1000)}")
+    def fetch_close_orders_all(self, symbol: str) -> list[dict[str, Any]]:
+        logger.debug(f"Fetching all closed orders for {symbol} spot")
+        return self._fetch_orders_paged(
+            self.exchange.fetch_closed_orders, symbol, "closed")
 
-                orders = self.exchange.fetch_open_orders(
-                    symbol=f"{symbol}/USDT",
-                    since=since_ms,
-                    limit=100,
-                    params={
-                        "until": until_ms,
-                        "paginate": True
-                    }
-                )
+    async def fetch_close_orders_all_async(self, symbol: str) -> list[dict[str, Any]]:
+        logger.debug(
+            f"Fetching all closed orders for {symbol} spot asynchronously")
+        return await self._fetch_orders_paged_async(
+            self.exchange_async.fetch_closed_orders, symbol, "closed")
 
-                if orders:
-                    logger.debug(
-                        f"Fetched {len(orders)} open orders, total so far: {len(all_orders)}")
-                    all_orders.extend(orders)
+    async def fetch_closed_and_canceled_orders_all_async(
+        self, symbol: str
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """約定済み・キャンセル済み注文を注文履歴APIからまとめて取得する。
 
-                # 次の7日間の開始点を設定
-                since_ms = until_ms + 1
+        orderStatusを指定せずに1回の呼び出しで取得し、fetch_close_orders_all_async
+        （Filled）とfetch_canceled_orders_all_async（Cancelled）と同じ条件で振り分ける。
 
-            logger.info(
-                f"Total open orders fetched for {symbol} spot: {len(all_orders)}")
-            return all_orders
+        Returns:
+            (closed_orders, canceled_orders)
+        """
+        logger.debug(
+            f"Fetching all closed and canceled orders for {symbol} spot "
+            "asynchronously")
+        orders = await self._fetch_orders_paged_async(
+            self.exchange_async.fetch_canceled_and_closed_orders,
+            symbol, "closed and canceled")
+
+        closed_orders: list[dict[str, Any]] = []
+        canceled_orders: list[dict[str, Any]] = []
+        for order in orders:
+            order_status = order["info"].get("orderStatus")
+            if order_status == "Filled":
+                closed_orders.append(order)
+            elif order_status == "Cancelled":
+                canceled_orders.append(order)
+        return closed_orders, canceled_orders
 
-        except Exception as e:
-            logger.error(
-                f"Failed to fetch open orders for {symbol} spot: {e}")
-            raise
+    def fetch_open_orders_all(self, symbol: str) -> list[dict[str, Any]]:
+        logger.debug(f"Fetching all open orders for {symbol} spot")
+        return self._fetch_orders_paged(
+            self.exchange.fetch_open_orders, symbol, "open")
 
     async def fetch_open_orders_all_async(self, symbol: str) -> list[dict[str, Any]]:
         logger.debug(
             f"Fetching all open orders for {symbol} spot asynchronously")
-        all_orders: list[dict[str, Any]] = []
-        try:
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
-            now_ms = int(datetime.now().timestamp() * 1000)
-            seven_days_ms = 7 * 24 * 60 * 60 * 1000  # 7日間をミリ秒に変換
-
-            while since_ms < now_ms:
-                # 7日間の終了時刻を計算（今日の日付を超えないように）
-                until_ms = min(since_ms + seven_days_ms, now_ms)
-
-                logger.debug(
-                    f"Fetching open orders from {datetime.fromtimestamp(since_ms/1000)} to {datetime.fromtimestamp(until_ms/1000)}")
-
-                orders = await self.exchange_async.fetch_open_orders(
-                    symbol=f"{symbol}/USDT",
-                    since=since_ms,
-                    limit=100,
-                    params={
-                        "until": until_ms,
-                        "paginate": True
-                    }
-                )
-
-                if orders:
-                    logger.debug(
-                        f"Fetched {len(orders)} open orders, total so far: {len(all_orders)}")
-                    all_orders.extend(orders)
-
-                # 次の7日間の開始点を設定
-                since_ms = until_ms + 1
-
-            logger.info(
-                f"Total open orders fetched for {symbol} spot: {len(all_orders)} (async)")
-            return all_orders
-
-        except Exception as e:
-            logger.error(
-                f"Failed to fetch open orders for {symbol} spot: {e}")
-            raise
+        return await self._fetch_orders_paged_async(
+            self.exchange_async.fetch_open_orders, symbol, "open")
 
     def fetch_canceled_orders_all(self, symbol: str) -> list[dict[str, Any]]:
         logger.debug(f"Fetching all canceled orders for {symbol} spot")
-        all_orders: list[dict[str, Any]] = []
-        try:
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
-            now_ms = int(datetime.now().timestamp() * 1000)
-            seven_days_ms = 7 * 24 * 60 * 60 * 1000  # 7日間をミリ秒に変換
-
-            while since_ms < now_ms:
-                # 7日間の終了時刻を計算（今日の日付を超えないように）
-                until_ms = min(since_ms + seven_days_ms, now_ms)
-
-                logger.debug(
-                    f"Fetching canceled orders from {datetime.fromtimestamp(since_ms/1000)} to {datetime.fromtimestamp(until_ms/1000)}")
-
-                orders = self.exchange.fetch_canceled_orders(
-                    symbol=f"{symbol}/USDT",
-                    since=since_ms,
-                    limit=100,
-                    params={
-                        "until": until_ms,
-                        "paginate": True
-                    }
-                )
-
-                if orders:
-                    logger.debug(
-                        f"Fetched {len(orders)} canceled orders, total so far: {len(all_orders)}")
-                    all_orders.extend(orders)
-
-                # 次の7日間の開始点を設定
-                since_ms = until_ms + 1
-
-            logger.info(
-                f"Total canceled orders fetched for {symbol} spot: {len(all_orders)}")
-            return all_orders
-
-        except Exception as e:
-            logger.error(
-                f"Failed to fetch canceled orders for {symbol} spot: {e}")
-            raise
+        return self._fetch_orders_paged(
+            self.exchange.fetch_canceled_orders, symbol, "canceled")
 
     async def fetch_canceled_orders_all_async(self, symbol: str) -> list[dict[str, Any]]:
         logger.debug(
             f"Fetching all canceled orders for {symbol} spot asynchronously")
-        all_orders: list[dict[str, Any]] = []
-        try:
-            since_ms = int(datetime(2025, 11, 1).timestamp() * 1000)
-            now_ms = int(datetime.now().timestamp() * 1000)
-            seven_days_ms = 7 * 24 * 60 * 60 * 1000  # 7日間をミリ秒に変換
-
-            while since_ms < now_ms:
-                # 7日間の終了時刻を計算（今日の日付を超えないように）
-                until_ms = min(since_ms + seven_days_ms, now_ms)
-
-                logger.debug(
-                    f"Fetching canceled orders from {datetime.fromtimestamp(since_ms/1000)} to {datetime.fromtimestamp(until_ms/1000)}")
-
-                orders = await self.exchange_async.fetch_canceled_orders(
-                    symbol=f"{symbol}/USDT",
-                    since=since_ms,
-                    limit=100,
-                    params={
-                        "until": until_ms,
-                        "paginate": True
-                    }
-                )
-
-                if orders:
-                    logger.debug(
-                        f"Fetched {len(orders)} canceled orders, total so far: {len(all_orders)}")
-                    all_orders.extend(orders)
-
-                # 次の7日間の開始点を設定
-                since_ms = until_ms + 1
-
-            logger.info(
-                f"Total canceled orders fetched for {symbol} spot: {len(all_orders)} (async)")
-            return all_orders
-
-        except Exception as e:
-            logger.error(
-                f"Failed to fetch canceled orders for {symbol} spot: {e}")
-            raise
+        return await self._fetch_orders_paged_async(
+            self.exchange_async.fetch_canceled_orders, symbol, "canceled")
 
     def get_current_spot_pnl(self, symbol: str) -> float:
         try:
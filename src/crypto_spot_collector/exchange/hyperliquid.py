@@ -1,5 +1,8 @@
+import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from types import TracebackType
 from typing import Any, Callable, Optional
 
@@ -18,6 +21,12 @@ from crypto_spot_collector.exchange.types import (
 )
 
 
+@lru_cache(maxsize=256)
+def _coin_of(symbol: str) -> str:
+    """CCXT形式のシンボルをHyperLiquidのコイン名に変換する（XRP/USDC:USDC -> XRP）"""
+    return symbol.partition('/')[0]
+
+
 @dataclass
 class HyperliquidTakeProfitStopLossPositionInfo:
     symbol: str
@@ -45,25 +54,49 @@ class HyperLiquidExchange(IExchange):
             "walletAddress": apiWalletAddress,
             "privateKey": privateKey,
         })
+        # 公開・秘密APIは同じエンドポイントなので、秘密API側は独自のセッションを作らず
+        # 公開API側のaiohttpセッション（コネクションプール・TLS接続）を共用する。
+        # セッションの生成と破棄は公開API側が行う（_private_exchange参照）
+        self.exchange_private.own_session = False
 
         if testnet:
             self.exchange_public.set_sandbox_mode(True)
             self.exchange_private.set_sandbox_mode(True)
             logger.info("HyperLiquid exchange set to testnet mode")
 
+        # ティッカーの短期キャッシュ（決済時のスリッページ計算用の価格なので
+        # 数百ミリ秒程度の鮮度で十分）。同時に要求された場合は取得を1回にまとめる
+        self._ticker_ttl = 0.5
+        self._ticker_cache: dict[str, tuple[float, dict[Any, Any]]] = {}
+        self._ticker_inflight: dict[str, asyncio.Future[dict[Any, Any]]] = {}
+
+        # WebSocket(allMids)で受信した最新の中値と受信時刻。
+        # 受信が途絶えた場合に古い価格を使わないよう、一定時間を過ぎたらREST取得に戻す
+        self._all_mids: dict[str, str] = {}
+        self._all_mids_received_at = 0.0
+        self._all_mids_max_age = 5.0
+
         self.take_profit_rate = take_profit_rate
         self.stop_loss_rate = stop_loss_rate
         self.leverage = leverage
 
+        # 市場価格に掛けるTP/SLトリガーの倍率（ROEベース）。発注のたびに計算しないよう事前に求める
+        self._tp_long_mult = 1 + take_profit_rate / leverage
+        self._sl_long_mult = 1 - stop_loss_rate / leverage
+        self._tp_short_mult = 1 - take_profit_rate / leverage
+        self._sl_short_mult = 1 + stop_loss_rate / leverage
+
         # WebSocketクライアントの初期化
         self.ws_client = HyperLiquidWebSocket(testnet=testnet)
 
         logger.info(
-            f"HyperLiquid exchange client initialized successfully. "
-            f"Take Profit Rate: {self.take_profit_rate * 100:.2f}%, "
-            f"Stop Loss Rate: {self.stop_loss_rate * 100:.2f}%, "
-            f"Leverage: x{self.leverage}, "
-            f"Network: {'testnet' if testnet else 'mainnet'}"
+            "HyperLiquid exchange client initialized successfully. "
+            "Take Profit Rate: {:.2f}%, Stop Loss Rate: {:.2f}%, "
+            "Leverage: x{}, Network: {}",
+            self.take_profit_rate * 100,
+            self.stop_loss_rate * 100,
+            self.leverage,
+            "testnet" if testnet else "mainnet",
         )
 
     async def __aenter__(self) -> "IExchange":
@@ -96,6 +129,13 @@ class HyperLiquidExchange(IExchange):
             logger.debug("WebSocket connection closed")
         logger.info("All HyperLiquid exchange connections closed successfully")
 
+    def _private_exchange(self) -> ccxt_async.hyperliquid:
+        """秘密APIのクライアントを、公開API側のセッションを設定した状態で返す"""
+        # open()はセッション未作成時のみ作成する（作成済みなら何もしない）
+        self.exchange_public.open()
+        self.exchange_private.session = self.exchange_public.session
+        return self.exchange_private
+
     async def fetch_balance_async(self) -> Any:
         logger.debug("Fetching account balance asynchronously")
         balance = await self.exchange_public.fetch_balance()
@@ -106,16 +146,34 @@ class HyperLiquidExchange(IExchange):
         logger.debug("Fetching free USDT balance asynchronously")
         balance = await self.fetch_balance_async()
 
-        logger.debug(f"Balance data: {balance}")
+        # 残高の辞書は大きいため、文字列化はDEBUGが有効な場合のみ行う
+        logger.debug("Balance data: {}", balance)
 
         free_usdt = balance["free"]["USDC"]
         return float(free_usdt)
 
     async def fetch_price_async(self, symbol: str) -> dict[Any, Any]:
-        logger.debug(f"Fetching price for {symbol} asynchronously")
+        cached = self._ticker_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < self._ticker_ttl:
+            logger.debug("Price for {}: {} (cached)", symbol, cached[1]['last'])
+            return cached[1]
+
+        # 取得中のリクエストがあればそれを待つ
+        inflight = self._ticker_inflight.get(symbol)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_ticker_async(symbol))
+            self._ticker_inflight[symbol] = inflight
+            inflight.add_done_callback(
+                lambda _: self._ticker_inflight.pop(symbol, None))
+        # 呼び出し元のキャンセルが他の待機者の取得を止めないようにshieldする
+        return await asyncio.shield(inflight)
+
+    async def _fetch_ticker_async(self, symbol: str) -> dict[Any, Any]:
+        logger.debug("Fetching price for {} asynchronously", symbol)
         ticker: dict[Any, Any] = await self.exchange_public.fetch_ticker(symbol)
         if 'last' in ticker:
-            logger.debug(f"Price for {symbol}: {ticker['last']} (async)")
+            logger.debug("Price for {}: {} (async)", symbol, ticker['last'])
+            self._ticker_cache[symbol] = (time.monotonic(), ticker)
             return ticker
         else:
             logger.error(f"Price not found for symbol {symbol}")
@@ -130,7 +188,8 @@ class HyperLiquidExchange(IExchange):
         toDate: datetime
     ) -> dict[Any, Any]:
         logger.debug(
-            f"Fetching OHLCV data for {symbol} asynchronously from {fromDate} to {toDate} with timeframe {timeframe}")
+            "Fetching OHLCV data for {} asynchronously from {} to {} with timeframe {}",
+            symbol, fromDate, toDate, timeframe)
         ohlcv: dict[Any, Any] = await self.exchange_public.fetch_ohlcv(
             symbol,
             timeframe=timeframe,
@@ -139,7 +198,7 @@ class HyperLiquidExchange(IExchange):
         )
         if ohlcv:
             logger.debug(
-                f"OHLCV data fetched for {symbol}: {len(ohlcv)} records (async)")
+                "OHLCV data fetched for {}: {} records (async)", symbol, len(ohlcv))
             return ohlcv
         else:
             logger.error(f"OHLCV data not found for symbol {symbol}")
@@ -150,7 +209,7 @@ class HyperLiquidExchange(IExchange):
         currency: dict[Any, Any] = await self.exchange_public.fetch_currencies()
         if currency:
             logger.debug(
-                f"Currency data fetched: {len(currency)} currencies (async)")
+                "Currency data fetched: {} currencies (async)", len(currency))
             return currency
         else:
             logger.error("Currency data not found")
@@ -166,6 +225,24 @@ class HyperLiquidExchange(IExchange):
         raise NotImplementedError(
             "create_order_spot_async is not yet implemented for HyperLiquid")
 
+    @staticmethod
+    def _tp_sl_params(tp_trigger: float, sl_trigger: float) -> dict[str, Any]:
+        """メイン注文と同時に作成するTP/SL注文のパラメータを返す。
+
+        ccxtはload_markets等のawait後にparamsを参照するため、並行して発注しても
+        値が混ざらないよう共有テンプレートは使わず毎回新しい辞書を作る。
+        """
+        return {
+            "stopLoss": {
+                "type": "market",  # SLはmarketで即座に決済
+                "triggerPrice": sl_trigger,
+            },
+            "takeProfit": {
+                "type": "market",  # TPもmarketで即座に決済
+                "triggerPrice": tp_trigger,
+            }
+        }
+
     async def create_order_perp_long_async(
         self,
         symbol: str,
@@ -182,33 +259,25 @@ class HyperLiquidExchange(IExchange):
         # 現在の市場価格を取得
         ticker = await self.fetch_price_async(symbol)
         market_price = float(ticker['last'])
-        logger.debug(f"Market price for {symbol}: {market_price}")
+        logger.debug("Market price for {}: {}", symbol, market_price)
 
         # 市場価格ベースでROEのTP/SL計算
-        tp_trigger = market_price * (1 + self.take_profit_rate / self.leverage)
-        sl_trigger = market_price * (1 - self.stop_loss_rate / self.leverage)
+        tp_trigger = market_price * self._tp_long_mult
+        sl_trigger = market_price * self._sl_long_mult
 
-        result = await self.exchange_private.create_order(
+        result = await self._private_exchange().create_order(
             symbol=symbol,
             type="market",
             side="buy",
             amount=amount,
             price=market_price,
-            params={
-                "stopLoss": {
-                    "type": "market",  # SLはmarketで即座に決済
-                    "triggerPrice": sl_trigger,
-                },
-                "takeProfit": {
-                    "type": "market",  # TPもmarketで即座に決済
-                    "triggerPrice": tp_trigger,
-                }
-            }
+            params=self._tp_sl_params(tp_trigger, sl_trigger),
         )
 
         logger.info(
-            f"Perpetual long order created for {symbol} at market price {market_price} with amount {amount}. "
-            f"TP trigger: {tp_trigger:.4f}, SL trigger: {sl_trigger:.4f}"
+            "Perpetual long order created for {} at market price {} with amount {}. "
+            "TP trigger: {:.4f}, SL trigger: {:.4f}",
+            symbol, market_price, amount, tp_trigger, sl_trigger,
         )
 
         return result
@@ -225,33 +294,25 @@ class HyperLiquidExchange(IExchange):
         # 現在の市場価格を取得
         ticker = await self.fetch_price_async(symbol)
         market_price = float(ticker['last'])
-        logger.debug(f"Market price for {symbol}: {market_price}")
+        logger.debug("Market price for {}: {}", symbol, market_price)
 
         # 市場価格ベースでROEのTP/SL計算
-        tp_trigger = market_price * (1 - self.take_profit_rate / self.leverage)
-        sl_trigger = market_price * (1 + self.stop_loss_rate / self.leverage)
+        tp_trigger = market_price * self._tp_short_mult
+        sl_trigger = market_price * self._sl_short_mult
 
-        result = await self.exchange_private.create_order(
+        result = await self._private_exchange().create_order(
             symbol=symbol,
             type="market",
             side="sell",
             amount=amount,
             price=market_price,
-            params={
-                "stopLoss": {
-                    "type": "market",  # SLはmarketで即座に決済
-                    "triggerPrice": sl_trigger,
-                },
-                "takeProfit": {
-                    "type": "market",  # TPもmarketで即座に決済
-                    "triggerPrice": tp_trigger,
-                }
-            }
+            params=self._tp_sl_params(tp_trigger, sl_trigger),
         )
 
         logger.info(
-            f"Perpetual short order created for {symbol} at market price {market_price} with amount {amount}. "
-            f"TP trigger: {tp_trigger:.4f}, SL trigger: {sl_trigger:.4f}"
+            "Perpetual short order created for {} at market price {} with amount {}. "
+            "TP trigger: {:.4f}, SL trigger: {:.4f}",
+            symbol, market_price, amount, tp_trigger, sl_trigger,
         )
 
         return result
@@ -267,7 +328,8 @@ class HyperLiquidExchange(IExchange):
         positions = await self.exchange_public.fetch_positions()
         logger.debug(f"Fetched {len(positions)} positions")
 
-        results: list[Any] = []
+        # 1パス目: 決済対象のポジションを絞り込む
+        to_close: list[tuple[str, float, str]] = []
 
         for position in positions:
             # Skip positions with zero or missing contracts
@@ -313,34 +375,73 @@ class HyperLiquidExchange(IExchange):
                 f"Closing position: {symbol}, side: {position_side}, "
                 f"contracts: {contracts}, close_side: {close_side}"
             )
+            to_close.append((symbol, contracts, close_side))
 
-            try:
-                # Get current price for calculate slippage in Hyperliquid
-                price = await self.fetch_price_async(symbol)
-                current_price = price['last']
-
-                # Create a market order to close the position
-                result = await self.exchange_private.create_order(
-                    symbol=symbol,
-                    type='market',
-                    side=close_side,
-                    amount=contracts,
-                    price=current_price,
-                    params={
-                        'reduceOnly': True,
-                    }
-                )
-                results.append(result)
-                logger.info(
-                    f"Successfully closed position for {symbol}: {result.get('id', 'N/A')}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to close position for {symbol}: {e}")
-                raise
+        # 2パス目: 価格取得・決済注文はポジション間で独立しているため並行実行する
+        # Get current price for calculate slippage in Hyperliquid
+        prices = await asyncio.gather(
+            *(self._fetch_close_price_async(symbol) for symbol, _, _ in to_close),
+            return_exceptions=True,
+        )
+
+        orders: list[tuple[str, Any]] = []
+        for (symbol, contracts, close_side), price in zip(to_close, prices):
+            if isinstance(price, BaseException):
+                logger.error(f"Failed to close position for {symbol}: {price}")
+                continue
+            # Create a market order to close the position
+            orders.append((symbol, self._private_exchange().create_order(
+                symbol=symbol,
+                type='market',
+                side=close_side,
+                amount=contracts,
+                price=price,
+                params={
+                    'reduceOnly': True,
+                }
+            )))
+
+        # 1件の失敗で他の決済を止めないよう、例外は結果として受け取りログに残す
+        order_results = await asyncio.gather(
+            *(order for _, order in orders), return_exceptions=True
+        )
+
+        results: list[Any] = []
+        for (symbol, _), result in zip(orders, order_results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to close position for {symbol}: {result}")
+                continue
+            results.append(result)
+            logger.info(
+                f"Successfully closed position for {symbol}: {result.get('id', 'N/A')}"
+            )
 
         logger.info(f"Closed {len(results)} positions")
         return results
 
+    async def _fetch_close_price_async(self, symbol: str) -> float:
+        """決済注文のスリッページ計算に使う価格を取得する。
+
+        WebSocketで受信した中値が新しければそれを使い、なければRESTで取得する。
+        """
+        mid = self._ws_mid_price(_coin_of(symbol))
+        if mid is not None:
+            logger.debug("Price for {}: {} (WebSocket allMids)", symbol, mid)
+            return mid
+        ticker = await self.fetch_price_async(symbol)
+        return float(ticker['last'])
+
+    def _ws_mid_price(self, coin: str) -> Optional[float]:
+        if time.monotonic() - self._all_mids_received_at > self._all_mids_max_age:
+            return None
+        mid = self._all_mids.get(coin)
+        return float(mid) if mid is not None else None
+
+    def _handle_all_mids(self, mids: dict[str, str]) -> None:
+        # 受信のたびに全銘柄を変換しないよう、文字列のまま保持して参照時に変換する
+        self._all_mids = mids
+        self._all_mids_received_at = time.monotonic()
+
     async def fetch_average_buy_price_spot_async(self, symbol: str) -> float:
         logger.warning(
             "fetch_average_buy_price_spot_async not yet implemented for HyperLiquid")
@@ -423,7 +524,7 @@ class HyperLiquidExchange(IExchange):
         side = "sell" if side == PositionSide.LONG else "buy"
 
         # 新しいTP/SL注文を作成
-        await self.exchange_private.create_orders(
+        await self._private_exchange().create_orders(
             [
                 {
                     "symbol": symbol,
@@ -474,7 +575,7 @@ class HyperLiquidExchange(IExchange):
         """
         logger.info(f"Canceling order {order_ids} for {symbol}")
         try:
-            result = await self.exchange_private.cancel_orders(
+            result = await self._private_exchange().cancel_orders(
                 ids=order_ids,
                 symbol=symbol,
             )
@@ -519,7 +620,7 @@ class HyperLiquidExchange(IExchange):
         """
         # Convert CCXT symbol format to HyperLiquid format
         # XRP/USDC:USDC -> XRP
-        coin = symbol.split('/')[0]
+        coin = _coin_of(symbol)
 
         # Connect WebSocket if not already connected
         if self.ws_client.ws is None:
@@ -543,7 +644,7 @@ class HyperLiquidExchange(IExchange):
             symbol: Trading pair symbol (e.g., "XRP/USDC:USDC")
             callback: Callback function to handle incoming trade data
         """
-        coin = symbol.split('/')[0]
+        coin = _coin_of(symbol)
 
         if self.ws_client.ws is None:
             await self.ws_client.connect()
@@ -568,6 +669,18 @@ class HyperLiquidExchange(IExchange):
             f"Subscribed to user fills data via WebSocket (wallet: {self.exchange_public.walletAddress})"
         )
 
+    async def subscribe_all_mids_ws(self) -> None:
+        """
+        Subscribe to mid prices of all coins via WebSocket.
+
+        受信した中値はポジション決済時の価格として使われ、REST取得を省く。
+        """
+        if self.ws_client.ws is None:
+            await self.ws_client.connect()
+
+        await self.ws_client.subscribe_all_mids(callback=self._handle_all_mids)
+        logger.info("Subscribed to allMids data via WebSocket")
+
     async def start_ws_listener(self) -> None:
         """
         Start listening for WebSocket messages.
@@ -597,7 +710,7 @@ class HyperLiquidExchange(IExchange):
             interval: Candle interval (e.g., "1m", "5m", "1h", "1d")
         """
         # Convert CCXT symbol format to HyperLiquid format
-        coin = symbol.split('/')[0]
+        coin = _coin_of(symbol)
 
         await self.ws_client.unsubscribe_candle(coin, interval)
         logger.info(
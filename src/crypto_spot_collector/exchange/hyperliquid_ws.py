@@ -10,6 +10,8 @@ import websockets
 from loguru import logger
 from websockets.client import WebSocketClientProtocol
 
+from crypto_spot_collector.utils.json_codec import loads
+
 
 class HyperLiquidWebSocket:
     """HyperLiquid WebSocket client for subscribing to candle (OHLCV) data."""
@@ -47,6 +49,14 @@ class HyperLiquidWebSocket:
             f"({'testnet' if testnet else 'mainnet'})"
         )
 
+    async def _open_connection(self) -> WebSocketClientProtocol:
+        """Open a WebSocket connection with the options used for the feed."""
+        # メッセージは小さなJSONのため、permessage-deflateは帯域の削減より
+        # 圧縮・展開のCPUコストの方が大きい。圧縮は無効にする
+        # 受信が処理に追いつかない場合に備え、受信キューは既定より多めに確保する
+        return await websockets.connect(
+            self.ws_url, compression=None, max_queue=256)
+
     async def connect(self) -> None:
         """Establish WebSocket connection."""
         if self.ws is not None:
@@ -54,7 +64,7 @@ class HyperLiquidWebSocket:
             return
 
         try:
-            self.ws = await websockets.connect(self.ws_url)
+            self.ws = await self._open_connection()
             self._running = True
             logger.info(f"WebSocket connected to {self.ws_url}")
         except Exception as e:
@@ -101,7 +111,7 @@ class HyperLiquidWebSocket:
                         self.ws = None
 
                     # Attempt to reconnect
-                    self.ws = await websockets.connect(self.ws_url)
+                    self.ws = await self._open_connection()
                     logger.info(f"WebSocket reconnected to {self.ws_url}")
 
                     # Restore all subscriptions
@@ -141,9 +151,8 @@ class HyperLiquidWebSocket:
             try:
                 if self.ws is not None:
                     await self.ws.send(json.dumps(subscription))
-                    coin = subscription["subscription"]["coin"]
-                    interval = subscription["subscription"]["interval"]
-                    logger.info(f"Restored subscription for {coin} {interval}")
+                    logger.info(
+                        f"Restored subscription {subscription['subscription']}")
             except Exception as e:
                 logger.error(
                     f"Failed to restore subscription {subscription}: {e}")
@@ -244,6 +253,34 @@ class HyperLiquidWebSocket:
         self._callbacks[sub_key] = callback
         self._subscriptions.append(subscription)
 
+    async def subscribe_all_mids(self,
+                                 callback: Callable[[dict[str, str]], None]) -> None:
+        """
+        Subscribe to mid prices of all coins.
+
+        Args:
+            callback: Callback function called with the {coin: mid price} mapping
+                      (prices are strings as sent by the server)
+        """
+        if self.ws is None:
+            raise RuntimeError(
+                "WebSocket is not connected. Call connect() first.")
+
+        subscription = {
+            "method": "subscribe",
+            "subscription": {
+                "type": "allMids"
+            }
+        }
+
+        # Send subscription message
+        await self.ws.send(json.dumps(subscription))
+        logger.info("Subscribed to allMids")
+
+        # Store subscription and callback
+        self._callbacks["allMids"] = callback
+        self._subscriptions.append(subscription)
+
     async def unsubscribe_candle(self, coin: str, interval: str) -> None:
         """
         Unsubscribe from candle updates.
@@ -290,9 +327,19 @@ class HyperLiquidWebSocket:
             while self._running:
                 try:
                     message = await asyncio.wait_for(self.ws.recv(), timeout=30.0)
-                    logger.debug(f"Received WebSocket message: {message}")
-                    data = json.loads(message)
-                    logger.debug(f"Parsed message data: {data}")
+                    data = loads(message)
+
+                    # allMidsは全銘柄の中値を含む大きなメッセージがほぼ毎秒届くため、
+                    # ログには出さずにそのまま渡す
+                    if data.get("channel") == "allMids":
+                        mids = data.get("data", {}).get("mids")
+                        if mids and "allMids" in self._callbacks:
+                            self._callbacks["allMids"](mids)
+                        continue
+
+                    # 受信のたびに文字列化しないよう、値は引数で渡す
+                    logger.debug("Received WebSocket message: {}", message)
+                    logger.debug("Parsed message data: {}", data)
 
                     # Handle subscription response
                     if data.get("channel") == "subscriptionResponse":
@@ -0,0 +1 @@
+"""Technical indicator calculations on raw NumPy arrays."""
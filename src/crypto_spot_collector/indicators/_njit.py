@@ -0,0 +1,26 @@
+"""Optional numba JIT decorator.
+
+numbaがインストールされていればnumba.njitを使い、なければ何もしない
+デコレータにフォールバックする（計算結果は同じで、速度のみ異なる）。
+numbaはfast extra（`uv sync --extra fast`）でインストールされる。
+"""
+
+from typing import Any, Callable
+
+try:
+    from numba import njit
+except ImportError:  # numbaは任意。未インストール時は通常のPython関数として実行
+
+    def njit(*args: Any, **kwargs: Any) -> Any:  # type: ignore[no-redef]
+        """Fallback for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            # @njit として引数なしで使われた場合
+            return args[0]
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            return func
+
+        return decorator
+
+
+__all__ = ["njit"]
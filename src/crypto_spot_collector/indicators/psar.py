@@ -0,0 +1,111 @@
+"""Parabolic SAR calculation on NumPy arrays."""
+
+import numpy as np
+
+from crypto_spot_collector.indicators._njit import njit
+
+
+def compute_psar(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    step: float = 0.02,
+    max_step: float = 0.2,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate Parabolic SAR with the same state machine as ta's PSARIndicator.
+
+    pandasのSeriesを1行ずつ操作せず、NumPy配列上で計算する。
+    numbaがインストールされていれば、ループ部分はJITコンパイルされる。
+
+    Args:
+        high: High prices
+        low: Low prices
+        close: Close prices
+        step: Acceleration factor step
+        max_step: Maximum acceleration factor
+
+    Returns:
+        (sar, sar_up, sar_down) as float64 arrays. sar_up/sar_down are NaN
+        where the trend is in the other direction (and for the first 2 bars).
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    sar = np.array(close, dtype=np.float64)
+    sar_up = np.full(len(sar), np.nan)
+    sar_down = np.full(len(sar), np.nan)
+    if len(sar) == 0:
+        return sar, sar_up, sar_down
+
+    _psar_core(high, low, sar, sar_up, sar_down, float(step), float(max_step))
+    return sar, sar_up, sar_down
+
+
+@njit(cache=True)
+def _psar_core(
+    high: np.ndarray,
+    low: np.ndarray,
+    sar: np.ndarray,
+    sar_up: np.ndarray,
+    sar_down: np.ndarray,
+    step: float,
+    max_step: float,
+) -> None:
+    """SARの状態遷移ループ（sar/sar_up/sar_downをその場で書き換える）。
+
+    numbaがあればJITコンパイルされる。fastmathはNaNの扱いや演算順序が
+    変わりta互換の結果にならないため使わない。
+    """
+    up_trend = True
+    acceleration_factor = step
+    up_trend_high = high[0]
+    down_trend_low = low[0]
+
+    for i in range(2, len(sar)):
+        reversal = False
+
+        max_high = high[i]
+        min_low = low[i]
+
+        if up_trend:
+            sar[i] = sar[i - 1] + acceleration_factor * (up_trend_high - sar[i - 1])
+
+            if min_low < sar[i]:
+                reversal = True
+                sar[i] = up_trend_high
+                down_trend_low = min_low
+                acceleration_factor = step
+            else:
+                if max_high > up_trend_high:
+                    up_trend_high = max_high
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+
+                if low[i - 2] < sar[i]:
+                    sar[i] = low[i - 2]
+                elif low[i - 1] < sar[i]:
+                    sar[i] = low[i - 1]
+        else:
+            sar[i] = sar[i - 1] - acceleration_factor * (sar[i - 1] - down_trend_low)
+
+            if max_high > sar[i]:
+                reversal = True
+                sar[i] = down_trend_low
+                up_trend_high = max_high
+                acceleration_factor = step
+            else:
+                if min_low < down_trend_low:
+                    down_trend_low = min_low
+                    acceleration_factor = min(acceleration_factor + step, max_step)
+
+                if high[i - 2] > sar[i]:
+                    sar[i] = high[i - 2]
+                elif high[i - 1] > sar[i]:
+                    sar[i] = high[i - 1]
+
+        up_trend = up_trend != reversal  # XOR
+
+        if up_trend:
+            sar_up[i] = sar[i]
+        else:
+            sar_down[i] = sar[i]
@@ -0,0 +1,36 @@
+"""Simple moving average calculation on NumPy arrays."""
+
+import numpy as np
+
+
+def compute_sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Calculate the simple moving average with a cumulative sum.
+
+    pandasのrolling().mean()と同じく、先頭window-1件とNaNを含む区間はNaNになる。
+    累積和の差で各区間の合計を求めるため、1回の走査で計算できる。
+
+    Args:
+        values: Input values (oldest -> newest)
+        window: Window size
+
+    Returns:
+        float64 array of the same length as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+
+    # NaNは0として累積し、区間内のNaNの個数を別に数える
+    # （NaNを含む区間だけがNaNになり、その後の区間には影響しない）
+    is_nan = np.isnan(values)
+    cumsum = np.zeros(len(values) + 1)
+    np.cumsum(np.where(is_nan, 0.0, values), out=cumsum[1:])
+    nan_count = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(is_nan, out=nan_count[1:])
+
+    sums = cumsum[window:] - cumsum[:-window]
+    has_nan = (nan_count[window:] - nan_count[:-window]) > 0
+    result[window - 1:] = np.where(has_nan, np.nan, sums / window)
+    return result
@@ -1,19 +1,126 @@
-import json
+import asyncio
+import time
+from collections import deque
 from io import BytesIO, TextIOWrapper
+from typing import Any
 
+import aiohttp
 import requests
 from loguru import logger
 
 from crypto_spot_collector.notification.NotificationBase import NotificationBase
+from crypto_spot_collector.utils.json_codec import dumps
+
+
+# webhookの送信レート上限（Discordは1分あたり約30件を超えると429を返す）
+WEBHOOK_RATE_LIMIT = 30
+WEBHOOK_RATE_PERIOD = 60.0
+# 429が返された場合に再送する最大回数
+WEBHOOK_MAX_RETRIES = 3
+
+
+# 添付画像の内容（メモリ上のバッファ、またはPNGのbytes）
+ImageData = BytesIO | bytes
+
+
+def _image_files(
+        image_buffers: list[tuple[ImageData, str]]) -> dict[str, tuple[str, Any, str]]:
+    """画像バッファを添付ファイルに変換する。
+
+    getvalue()で内容をコピーせず、バッファを先頭に戻してそのまま渡す
+    （送信時にバッファから直接読み出される）。bytesはそのまま添付する。
+    """
+    files: dict[str, tuple[str, Any, str]] = {}
+    for i, (buffer, filename) in enumerate(image_buffers):
+        if isinstance(buffer, BytesIO):
+            buffer.seek(0)
+        files[f"file_{i}"] = (filename, buffer, "image/png")
+    return files
 
 
 class discordNotification(NotificationBase):
     pass
 
-    def __init__(self, webhook_url: str) -> None:
+    def __init__(self,
+                 webhook_url: str,
+                 session: aiohttp.ClientSession | None = None) -> None:
         super().__init__()
 
         self.webhook_url: str = webhook_url
+        # 設定されている場合はこのセッションで送信し、接続（TLS）を使い回す
+        self.session: aiohttp.ClientSession | None = session
+        # 直近の送信時刻（レート制限用）
+        self._sent_times: deque[float] = deque()
+        self._rate_lock = asyncio.Lock()
+
+    async def _acquire_rate_limit(self) -> None:
+        """直近WEBHOOK_RATE_PERIOD秒の送信数が上限に達していれば空くまで待つ。"""
+        async with self._rate_lock:
+            now = time.monotonic()
+            # 期間外になった送信履歴を捨てる
+            while (self._sent_times
+                   and now - self._sent_times[0] >= WEBHOOK_RATE_PERIOD):
+                self._sent_times.popleft()
+            if len(self._sent_times) >= WEBHOOK_RATE_LIMIT:
+                wait = WEBHOOK_RATE_PERIOD - (now - self._sent_times[0])
+                logger.warning(
+                    f"Discord webhook rate limit reached, waiting {wait:.1f}s")
+                await asyncio.sleep(wait)
+                self._sent_times.popleft()
+            self._sent_times.append(time.monotonic())
+
+    async def _post(self,
+                    payload: dict,
+                    files: dict[str, tuple[str, Any, str]]) -> tuple[int, str]:
+        """webhookへpayload_jsonと添付ファイルを送信し、(ステータス, 本文)を返す。
+
+        送信レートを制限し、429が返された場合はRetry-Afterだけ待って再送する。
+        """
+        for attempt in range(WEBHOOK_MAX_RETRIES + 1):
+            await self._acquire_rate_limit()
+            status, text, retry_after = await self._post_once(payload, files)
+            if status != 429 or attempt == WEBHOOK_MAX_RETRIES:
+                return status, text
+
+            logger.warning(
+                f"Discord webhook rate limited (429), retrying in {retry_after}s")
+            await asyncio.sleep(retry_after)
+            # ファイルオブジェクトは再送前に先頭へ戻す
+            for _, data, _ in files.values():
+                if hasattr(data, "seek"):
+                    data.seek(0)
+        return status, text
+
+    def _post_blocking(
+            self,
+            payload: dict,
+            files: dict[str, tuple[str, Any, str]]) -> tuple[int, str, float]:
+        """セッション未設定時にrequestsで1回送信する（ブロッキング）。"""
+        response = requests.post(self.webhook_url,
+                                 data={"payload_json": dumps(payload)},
+                                 files=files)
+        return (response.status_code, response.text,
+                float(response.headers.get("Retry-After", 1)))
+
+    async def _post_once(
+            self,
+            payload: dict,
+            files: dict[str, tuple[str, Any, str]]) -> tuple[int, str, float]:
+        """webhookへ1回送信し、(ステータス, 本文, Retry-After秒)を返す。"""
+        if self.session is None:
+            # イベントループを止めないよう別スレッドで送信する
+            return await asyncio.to_thread(self._post_blocking, payload, files)
+
+        form = aiohttp.FormData()
+        form.add_field("payload_json", dumps(payload))
+        for name, (filename, data, content_type) in files.items():
+            form.add_field(name, data,
+                           filename=filename,
+                           content_type=content_type)
+        async with self.session.post(self.webhook_url, data=form) as resp:
+            body = await resp.text()
+            return (resp.status, body,
+                    float(resp.headers.get("Retry-After", 1)))
 
     async def send_notification_async(self,
                                       message: str,
@@ -24,54 +131,44 @@ class discordNotification(NotificationBase):
             "content": message
         }
 
-        payloadFiles = [(f"file_{i}", (file.name, file, "image/png"))
-                        for i, file in enumerate(files)]
-        response = requests.post(self.webhook_url,
-                                 data={
-                                     "payload_json": json.dumps(payload),
-                                 },
-                                 files=payloadFiles)
-        logger.debug(f"send_notification_async : {response.status_code}")
-        if response.status_code != 200:
-            logger.error(f"Error: {response.text}")
+        payloadFiles = {f"file_{i}": (file.name, file, "image/png")
+                        for i, file in enumerate(files)}
+        status, text = await self._post(payload, payloadFiles)
+        logger.debug(f"send_notification_async : {status}")
+        if status != 200:
+            logger.error(f"Error: {text}")
 
     async def send_notification_with_image_async(
             self,
             message: str,
-            image_buffers: list[tuple[BytesIO, str]]) -> bool:
+            image_buffers: list[tuple[ImageData, str]]) -> bool:
         """Send a notification with images from memory buffers.
 
         Args:
             message: The message to send
-            image_buffers: List of tuples containing (BytesIO buffer, filename)
+            image_buffers: List of tuples containing
+                (BytesIO buffer or PNG bytes, filename)
         """
 
         payload = {
             "content": message
         }
 
-        # 複数の画像バッファからファイルデータを構築
-        files = {}
-        for i, (buffer, filename) in enumerate(image_buffers):
-            image_data = buffer.getvalue()
-            files[f"file_{i}"] = (filename, image_data, "image/png")
+        files = _image_files(image_buffers)
 
-        response = requests.post(
-            self.webhook_url,
-            data={"payload_json": json.dumps(payload)},
-            files=files
-        )
+        status, text = await self._post(payload, files)
 
-        logger.debug(f"Discord notification sent: {response.status_code}")
-        if response.status_code != 200:
-            logger.error(f"Error: {response.text}")
+        logger.debug(f"Discord notification sent: {status}")
+        if status != 200:
+            logger.error(f"Error: {text}")
 
-        return bool(response.status_code == 200)
+        return bool(status == 200)
 
-    async def send_notification_embed_with_file(self,
-                                                message: str,
-                                                embeds: dict,
-                                                image_buffers: list[tuple[BytesIO, str]]) -> bool:
+    async def send_notification_embed_with_file(
+            self,
+            message: str,
+            embeds: dict,
+            image_buffers: list[tuple[ImageData, str]]) -> bool:
         """Send a notification with embeds and images from memory buffers."""
 
         payload = {
@@ -79,23 +176,15 @@ class discordNotification(NotificationBase):
             "embeds": embeds
         }
 
-        # 複数の画像バッファからファイルデータを構築
-        files = {}
-        for i, (buffer, filename) in enumerate(image_buffers):
-            image_data = buffer.getvalue()
-            files[f"file_{i}"] = (filename, image_data, "image/png")
+        files = _image_files(image_buffers)
 
-        response = requests.post(
-            self.webhook_url,
-            data={"payload_json": json.dumps(payload)},
-            files=files
-        )
+        status, text = await self._post(payload, files)
 
         logger.debug(
-            f"Discord notification with embed sent: {response.status_code}")
-        if response.status_code != 200:
-            logger.error(f"Error: {response.text}")
-        return bool(response.status_code == 200)
+            f"Discord notification with embed sent: {status}")
+        if status != 200:
+            logger.error(f"Error: {text}")
+        return bool(status == 200)
 
     def embed_object_create_helper(symbol: str,
                                    price: float,
@@ -1,20 +1,92 @@
 """Market data provider with technical indicators."""
 
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from ta.trend import PSARIndicator
 
+from crypto_spot_collector.indicators.psar import compute_psar
+from crypto_spot_collector.indicators.sma import compute_sma
 from crypto_spot_collector.repository.ohlcv_repository import OHLCVRepository
 
+# 1h足から間引いて作れる時間足（間隔の時間数）
+_HOUR_INTERVALS = {"1h": 1, "2h": 2, "4h": 4, "6h": 6}
+
+
+@dataclass(frozen=True)
+class IndicatorFrame:
+    """NumPy arrays of an indicator DataFrame for the signal check/plot path.
+
+    pandasの列参照を繰り返さないよう、よく使う列を一度だけ配列として取り出して保持する。
+    元のDataFrameもdfとして参照できる。
+    """
+
+    timestamp: np.ndarray
+    close: np.ndarray
+    sar_up: np.ndarray
+    sar_down: np.ndarray
+    sma: Dict[int, np.ndarray]
+    df: pd.DataFrame
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "IndicatorFrame":
+        """Create from a non-empty DataFrame built by MarketDataProvider."""
+        return cls(
+            timestamp=df["timestamp"].to_numpy(),
+            close=df["close"].to_numpy(dtype=np.float64),
+            sar_up=df["sar_up"].to_numpy(dtype=np.float64),
+            sar_down=df["sar_down"].to_numpy(dtype=np.float64),
+            sma={
+                int(column[len("sma_"):]): df[column].to_numpy(dtype=np.float64)
+                for column in df.columns
+                if column.startswith("sma_")
+            },
+            df=df,
+        )
+
 
 class MarketDataProvider:
     """Provides market data with technical indicators (SMA, SAR, etc.)."""
 
-    def __init__(self) -> None:
-        """Initialize the market data provider."""
-        pass
+    def __init__(
+        self,
+        cache_rows: bool = False,
+        repository: Optional[OHLCVRepository] = None,
+    ) -> None:
+        """Initialize the market data provider.
+
+        Args:
+            cache_rows: Keep the 1h OHLCV rows of the last requested window in
+                memory and derive the other hour intervals from them, so that
+                checking several timeframes for the same window reads the
+                database only once.
+            repository: Long-lived repository to read from. If None, a new
+                repository (and session) is created for every read.
+        """
+        self._cache_rows = cache_rows
+        self._repository = repository
+        self._rows_cache_key: Optional[
+            Tuple[Tuple[str, ...], datetime, datetime]
+        ] = None
+        self._rows_cache: Dict[str, List[Any]] = {}
+
+    @contextmanager
+    def _open_repository(self) -> Iterator[OHLCVRepository]:
+        """Yield the injected repository, or a new one if none was given."""
+        if self._repository is None:
+            with OHLCVRepository() as repo:
+                yield repo
+            return
+
+        try:
+            yield self._repository
+        finally:
+            # 読み取りごとにトランザクションを終えて接続をプールへ返す
+            # （セッション自体は次の読み取りでそのまま再利用できる）
+            self._repository.session.close()
 
     def get_dataframe_with_indicators(
         self,
@@ -53,7 +125,7 @@ class MarketDataProvider:
             f"from={from_datetime}, to={to_datetime}"
         )
 
-        with OHLCVRepository() as repo:
+        with self._open_repository() as repo:
             data = repo.get_ohlcv_data(
                 symbol=symbol,
                 interval=interval,
@@ -68,39 +140,193 @@ class MarketDataProvider:
                 logger.debug(
                     f"Last record timestamp: {data[-1].timestamp_utc}")
 
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                [
-                    {
-                        "timestamp": d.timestamp_utc,
-                        "open": float(d.open_price),
-                        "high": float(d.high_price),
-                        "low": float(d.low_price),
-                        "close": float(d.close_price),
-                        "volume": float(d.volume),
-                    }
-                    for d in data
-                ]
+            return self._build_dataframe(data, sma_windows, sar_config)
+
+    def get_dataframes_with_indicators(
+        self,
+        symbols: List[str],
+        interval: Literal["1m", "5m", "10m", "30m", "1h", "2h", "4h", "6h"],
+        from_datetime: datetime,
+        to_datetime: datetime,
+        sma_windows: Optional[List[int]] = None,
+        sar_config: Optional[Dict[str, float]] = None,
+        prefilter: Optional[Callable[[np.ndarray], bool]] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Get OHLCV DataFrames with technical indicators for multiple symbols.
+
+        The OHLCV rows for all symbols are read with a single database query.
+        If prefilter is given, it is called with the sar_up array of each
+        symbol first, and symbols for which it returns False are left out of
+        the result without building their other indicators. The PSAR arrays
+        are reused for the DataFrame of the symbols that pass.
+
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            interval: Time interval for data aggregation
+            from_datetime: Start datetime (inclusive)
+            to_datetime: End datetime (inclusive)
+            sma_windows: List of SMA window sizes to calculate (e.g., [50, 100])
+            sar_config: SAR indicator configuration with 'step' and 'max_step'
+            prefilter: Cheap check on the sar_up array (oldest -> newest)
+
+        Returns:
+            Dict of upper-cased symbol to DataFrame (empty if no data)
+        """
+        # Set default values
+        if sma_windows is None:
+            sma_windows = [50, 100]
+        if sar_config is None:
+            sar_config = {"step": 0.02, "max_step": 0.2}
+
+        from loguru import logger
+
+        logger.debug(
+            f"Fetching OHLCV data: symbols={symbols}, interval={interval}, "
+            f"from={from_datetime}, to={to_datetime}"
+        )
+
+        data_by_symbol = self._get_rows_for_symbols(
+            symbols, interval, from_datetime, to_datetime
+        )
+
+        result: Dict[str, pd.DataFrame] = {}
+        for symbol, data in data_by_symbol.items():
+            columns = self._rows_to_arrays(data)
+            psar = None
+            if prefilter is not None and data:
+                # ここで計算したSARはDataFrame作成時にそのまま使う
+                psar = compute_psar(
+                    columns["high"],
+                    columns["low"],
+                    columns["close"],
+                    step=sar_config["step"],
+                    max_step=sar_config["max_step"],
+                )
+                if not prefilter(psar[1]):
+                    logger.debug(f"{symbol}: skipped by prefilter")
+                    continue
+
+            result[symbol] = self._build_dataframe_from_arrays(
+                columns, sma_windows, sar_config, psar
             )
 
-            if df.empty:
-                return df
+        return result
+
+    def _get_rows_for_symbols(
+        self,
+        symbols: List[str],
+        interval: str,
+        from_datetime: datetime,
+        to_datetime: datetime,
+    ) -> Dict[str, List[Any]]:
+        """Read OHLCV rows for the symbols, using the 1h row cache if enabled."""
+        if not self._cache_rows or interval not in _HOUR_INTERVALS:
+            with self._open_repository() as repo:
+                rows: Dict[str, List[Any]] = repo.get_ohlcv_rows_for_symbols(
+                    symbols=symbols,
+                    interval=interval,  # type: ignore[arg-type]
+                    from_datetime=from_datetime,
+                    to_datetime=to_datetime,
+                )
+            return rows
+
+        key = (tuple(symbol.upper() for symbol in symbols), from_datetime, to_datetime)
+        if self._rows_cache_key != key:
+            # 期間が変わったら（次のティック）1h足を読み直し、古い行は破棄する
+            with self._open_repository() as repo:
+                self._rows_cache = repo.get_ohlcv_rows_for_symbols(
+                    symbols=symbols,
+                    interval="1h",
+                    from_datetime=from_datetime,
+                    to_datetime=to_datetime,
+                )
+            self._rows_cache_key = key
+
+        # SQLの時間足フィルタ（HOUR % n = 0）と同じ条件で1h足を間引く
+        hours = _HOUR_INTERVALS[interval]
+        return {
+            symbol: [d for d in rows if d.timestamp_utc.hour % hours == 0]
+            for symbol, rows in self._rows_cache.items()
+        }
+
+    @staticmethod
+    def _rows_to_arrays(data: List[Any]) -> Dict[str, np.ndarray]:
+        """Collect OHLCV records into one NumPy array per column.
+
+        行ごとにdictを作らず、1回のループで列ごとの配列に書き込む。
+        """
+        n = len(data)
+        timestamp = np.empty(n, dtype="datetime64[ns]")
+        open_price = np.empty(n, dtype=np.float64)
+        high_price = np.empty(n, dtype=np.float64)
+        low_price = np.empty(n, dtype=np.float64)
+        close_price = np.empty(n, dtype=np.float64)
+        volume = np.empty(n, dtype=np.float64)
+
+        for i, d in enumerate(data):
+            timestamp[i] = d.timestamp_utc
+            open_price[i] = d.open_price
+            high_price[i] = d.high_price
+            low_price[i] = d.low_price
+            close_price[i] = d.close_price
+            volume[i] = d.volume
+
+        return {
+            "timestamp": timestamp,
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "volume": volume,
+        }
+
+    @classmethod
+    def _build_dataframe(
+        cls,
+        data: List[Any],
+        sma_windows: List[int],
+        sar_config: Dict[str, float],
+    ) -> pd.DataFrame:
+        """Convert OHLCV records to a DataFrame and add SMA/SAR indicators."""
+        return cls._build_dataframe_from_arrays(
+            cls._rows_to_arrays(data), sma_windows, sar_config
+        )
+
+    @staticmethod
+    def _build_dataframe_from_arrays(
+        columns: Dict[str, np.ndarray],
+        sma_windows: List[int],
+        sar_config: Dict[str, float],
+        psar: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> pd.DataFrame:
+        """Build a DataFrame from OHLCV column arrays and add SMA/SAR indicators.
+
+        psarに計算済みの(sar, sar_up, sar_down)が渡された場合は再計算しない。
+        """
+        if len(columns["timestamp"]) == 0:
+            return pd.DataFrame()
+
+        # Convert to DataFrame
+        df = pd.DataFrame(columns)
 
-            # Add SMA indicators
-            for window in sma_windows:
-                df[f"sma_{window}"] = df["close"].rolling(window=window).mean()
+        # Add SMA indicators
+        for window in sma_windows:
+            df[f"sma_{window}"] = compute_sma(columns["close"], window)
 
-            # Add SAR indicators
-            sar_indicator = PSARIndicator(
-                high=df["high"],
-                low=df["low"],
-                close=df["close"],
+        # Add SAR indicators (same values as ta's PSARIndicator, computed on arrays)
+        if psar is None:
+            psar = compute_psar(
+                columns["high"],
+                columns["low"],
+                columns["close"],
                 step=sar_config["step"],
                 max_step=sar_config["max_step"],
             )
+        sar, sar_up, sar_down = psar
 
-            df["sar"] = sar_indicator.psar()
-            df["sar_up"] = sar_indicator.psar_up()
-            df["sar_down"] = sar_indicator.psar_down()
+        df["sar"] = sar
+        df["sar_up"] = sar_up
+        df["sar_down"] = sar_down
 
-            return df
+        return df
@@ -1,10 +1,10 @@
 """OHLCV data repository for retrieving crypto market data."""
 
 from datetime import datetime
-from typing import List, Literal, Optional, Type
+from typing import Any, Dict, List, Literal, Optional, Type
 
-from sqlalchemy import and_, func, text
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Float, and_, func, text, type_coerce
+from sqlalchemy.orm import Query, Session, joinedload
 
 from ..database import get_db_session
 from ..models import Cryptocurrency, OHLCVData
@@ -167,6 +167,68 @@ class OHLCVRepository:
 
         return result
 
+    def get_ohlcv_rows_for_symbols(
+        self,
+        symbols: List[str],
+        interval: Literal["1m", "5m", "10m", "30m", "1h", "2h", "4h", "6h"],
+        from_datetime: datetime,
+        to_datetime: datetime,
+    ) -> Dict[str, List[Any]]:
+        """Get OHLCV columns for multiple symbols with a single query.
+
+        Same filtering as get_ohlcv_data, but all symbols are fetched in one
+        round-trip and only the OHLCV columns are selected, so rows are
+        returned as plain tuples instead of OHLCVData objects. Prices and
+        volume are returned as float instead of Decimal.
+
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+            interval: Time interval for data aggregation
+            from_datetime: Start datetime (inclusive)
+            to_datetime: End datetime (inclusive)
+
+        Returns:
+            Dict of upper-cased symbol to rows ordered by timestamp. Each row
+            has timestamp_utc, open_price, high_price, low_price, close_price
+            and volume attributes. Symbols that are not registered map to an
+            empty list.
+
+        Raises:
+            ValueError: If interval not supported
+        """
+        # Validate interval
+        self._get_interval_minutes(interval)
+
+        upper_symbols = [symbol.upper() for symbol in symbols]
+        interval_condition = self._create_interval_filter(interval)
+
+        query: Query[Any] = (
+            self.session.query(
+                Cryptocurrency.symbol,
+                OHLCVData.timestamp_utc,
+                type_coerce(OHLCVData.open_price, Float).label("open_price"),
+                type_coerce(OHLCVData.high_price, Float).label("high_price"),
+                type_coerce(OHLCVData.low_price, Float).label("low_price"),
+                type_coerce(OHLCVData.close_price, Float).label("close_price"),
+                type_coerce(OHLCVData.volume, Float).label("volume"),
+            )
+            .join(OHLCVData, OHLCVData.cryptocurrency_id == Cryptocurrency.id)
+            .filter(
+                and_(
+                    Cryptocurrency.symbol.in_(upper_symbols),
+                    OHLCVData.timestamp_utc.between(from_datetime, to_datetime),
+                )
+            )
+            .filter(text(interval_condition))
+            .order_by(OHLCVData.cryptocurrency_id, OHLCVData.timestamp_utc)
+        )
+
+        result: Dict[str, List[Any]] = {symbol: [] for symbol in upper_symbols}
+        for row in query.all():
+            result[row.symbol].append(row)
+
+        return result
+
     def get_latest_ohlcv_data(
         self,
         symbol: str,
@@ -206,6 +268,31 @@ class OHLCVRepository:
 
         return query.all()
 
+    def get_latest_timestamps(self, symbols: List[str]) -> Dict[str, datetime]:
+        """Get the latest stored timestamp for each symbol in one query.
+
+        Args:
+            symbols: Cryptocurrency symbols (e.g., ['BTC', 'ETH'])
+
+        Returns:
+            Dict of upper-cased symbol to latest timestamp (UTC, naive).
+            Symbols without any data are not included.
+        """
+        upper_symbols = [symbol.upper() for symbol in symbols]
+
+        rows: List[Any] = (
+            self.session.query(
+                Cryptocurrency.symbol,
+                func.max(OHLCVData.timestamp_utc),
+            )
+            .join(OHLCVData, OHLCVData.cryptocurrency_id == Cryptocurrency.id)
+            .filter(Cryptocurrency.symbol.in_(upper_symbols))
+            .group_by(Cryptocurrency.symbol)
+            .all()
+        )
+
+        return {symbol: latest for symbol, latest in rows if latest is not None}
+
     def get_ohlcv_data_count(
         self,
         symbol: str,
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Literal, Optional, Type
+from typing import Any, Literal, Optional, Type
 
 from loguru import logger
 from sqlalchemy import and_
@@ -132,6 +132,104 @@ class TradeDataRepository:
 
         self.session.commit()
 
+    def bulk_create_or_update_trade_data(
+        self,
+        cryptocurrency_name: str,
+        exchange_name: str,
+        trades: list[dict[str, Any]],
+    ) -> int:
+        """Create or update multiple trade data records in one transaction.
+
+        Existing records are looked up with a single query and all changes are
+        committed once at the end, instead of a commit per trade.
+
+        Args:
+            cryptocurrency_name: Name of the cryptocurrency (e.g., 'BTC').
+            exchange_name: Name of the exchange (e.g., 'Binance').
+            trades: Trade dicts with the keys trade_id, status, position_type,
+                is_spot, leverage_ratio, price, quantity, fee and timestamp_utc
+                (same meaning as create_or_update_trade_data arguments).
+                If the same trade_id appears more than once, the last one wins.
+
+        Returns:
+            Number of trades processed
+        """
+        if not trades:
+            return 0
+
+        # Fetch or create Cryptocurrency
+        crypto = (
+            self.session.query(Cryptocurrency)
+            .filter(Cryptocurrency.symbol == cryptocurrency_name)
+            .one_or_none()
+        )
+        if not crypto:
+            crypto = Cryptocurrency(
+                name=cryptocurrency_name, symbol=cryptocurrency_name)
+            self.session.add(crypto)
+            self.session.flush()
+
+        # Load all existing records for these trade IDs at once
+        trade_ids = [trade["trade_id"] for trade in trades]
+        existing = {
+            trade_data.trade_id: trade_data
+            for trade_data in self.session.query(TradeData).filter(
+                and_(
+                    TradeData.cryptocurrency_id == crypto.id,
+                    TradeData.exchange_name == exchange_name,
+                    TradeData.trade_id.in_(trade_ids),
+                )
+            )
+        }
+
+        try:
+            for trade in trades:
+                # create_or_update_trade_dataと同じく、Enum列の値（Literal）にそろえる
+                position_type: Literal["LONG", "SHORT"] = trade["position_type"]
+                if position_type.upper() == "BUY":
+                    position_type = "LONG"
+                elif position_type.upper() == "SELL":
+                    position_type = "SHORT"
+
+                status: Literal["OPEN", "CANCELED", "CLOSED"] = (
+                    "OPEN" if trade["status"] is None else trade["status"].upper()
+                )
+
+                values: dict[str, Any] = {
+                    "status": status,
+                    "position_type": position_type,
+                    "is_spot": trade["is_spot"],
+                    "leverage_ratio": trade["leverage_ratio"],
+                    "price": trade["price"],
+                    "quantity": trade["quantity"],
+                    "fee": trade["fee"],
+                    "timestamp_utc": trade["timestamp_utc"],
+                }
+
+                trade_data = existing.get(trade["trade_id"])
+                if trade_data:
+                    # Update existing record
+                    for column, value in values.items():
+                        setattr(trade_data, column, value)
+                else:
+                    # Create new record
+                    trade_data = TradeData(
+                        cryptocurrency_id=crypto.id,
+                        exchange_name=exchange_name,
+                        trade_id=trade["trade_id"],
+                        **values,
+                    )
+                    self.session.add(trade_data)
+                    existing[trade["trade_id"]] = trade_data
+
+            self.session.commit()
+        except Exception as e:
+            logger.error(f"Error during bulk trade data update: {e}")
+            self.session.rollback()
+            raise
+
+        return len(trades)
+
     def update_trade_status_by_trade_id(
         self,
         trade_id: str,
@@ -12,9 +12,9 @@ import seaborn as sns
 from matplotlib import font_manager
 from matplotlib import pyplot as plt
 from PIL import Image
-from ta.trend import PSARIndicator
 
 from crypto_spot_collector.checkers.sar_checker import SARChecker
+from crypto_spot_collector.indicators.psar import compute_psar
 from crypto_spot_collector.notification.discord import discordNotification
 from crypto_spot_collector.repository.ohlcv_repository import OHLCVRepository
 
@@ -98,17 +98,17 @@ async def main() -> None:
         df = df[df['timestamp'] >= start_display_date]
 
         # SAR計算（初期AF=0.02, 最大AF=0.2）
-        sar_indicator = PSARIndicator(
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
+        sar, sar_up, sar_down = compute_psar(
+            df['high'].to_numpy(),
+            df['low'].to_numpy(),
+            df['close'].to_numpy(),
             step=0.02,
             max_step=0.2
         )
 
-        df['sar'] = sar_indicator.psar()
-        df['sar_up'] = sar_indicator.psar_up()
-        df['sar_down'] = sar_indicator.psar_down()
+        df['sar'] = sar
+        df['sar_up'] = sar_up
+        df['sar_down'] = sar_down
 
         # データからグラフ作成
         fig, ax1 = plt.subplots(1, 1, figsize=(12, 8))
@@ -12,8 +12,8 @@ from matplotlib import font_manager
 from matplotlib import pyplot as plt
 from matplotlib.offsetbox import AnnotationBbox, OffsetImage
 from PIL import Image
-from ta.trend import PSARIndicator
 
+from crypto_spot_collector.indicators.psar import compute_psar
 from crypto_spot_collector.notification.discord import discordNotification
 from crypto_spot_collector.repository.ohlcv_repository import OHLCVRepository
 from crypto_spot_collector.repository.trade_data_repository import TradeDataRepository
@@ -94,17 +94,17 @@ async def main() -> None:
         df["sma_100"] = df['close'].rolling(window=100).mean()
 
         # SAR計算（初期AF=0.02, 最大AF=0.2）
-        sar_indicator = PSARIndicator(
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
+        sar, sar_up, sar_down = compute_psar(
+            df['high'].to_numpy(),
+            df['low'].to_numpy(),
+            df['close'].to_numpy(),
             step=0.02,
             max_step=0.2
         )
 
-        df['sar'] = sar_indicator.psar()
-        df['sar_up'] = sar_indicator.psar_up()
-        df['sar_down'] = sar_indicator.psar_down()
+        df['sar'] = sar
+        df['sar_up'] = sar_up
+        df['sar_down'] = sar_down
 
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df = df.sort_values(by='timestamp')
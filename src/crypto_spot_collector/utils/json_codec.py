@@ -0,0 +1,29 @@
+"""JSON encode/decode helpers.
+
+orjsonがインストールされていればorjsonを使い、なければ標準のjsonを使用する。
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjsonは任意。未インストール時は標準のjsonを使用
+
+    def loads(data: str | bytes) -> Any:
+        """JSON文字列（またはbytes）を解析する。"""
+        return json.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """オブジェクトをJSON文字列に変換する。"""
+        return json.dumps(obj)
+
+else:
+
+    def loads(data: str | bytes) -> Any:
+        """JSON文字列（またはbytes）を解析する。"""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """オブジェクトをJSON文字列に変換する。"""
+        # numpyの数値型が混ざっても変換できるようにする
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
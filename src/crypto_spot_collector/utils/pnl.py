@@ -4,9 +4,11 @@ from io import BytesIO
 
 import matplotlib.dates as mdates
 import matplotlib.transforms as transforms
+import numpy as np
 import pandas as pd
 from loguru import logger
 from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 
 from crypto_spot_collector.exchange import IExchange
 from crypto_spot_collector.providers.market_data_provider import MarketDataProvider
@@ -23,11 +25,50 @@ class CreatePnlResult:
     df: pd.DataFrame = None
 
 
+# ポートフォリオ用のFigure（初回のみ作成し、以降はclearして使い回す）
+_portfolio_fig: Figure | None = None
+
+
+def _get_portfolio_figure() -> Figure:
+    global _portfolio_fig
+    if _portfolio_fig is None:
+        # pyplotの管理下に置かないFigure（plt.closeせずに保持できる）
+        _portfolio_fig = Figure()
+    _portfolio_fig.clear()
+    return _portfolio_fig
+
+
+# USDT以外の保有資産がない場合のPNG（初回のみ描画し、以降は同じバイト列を返す）
+_empty_portfolio_png: bytes | None = None
+
+
+def _get_empty_portfolio_png() -> bytes:
+    global _empty_portfolio_png
+    if _empty_portfolio_png is None:
+        fig = Figure(figsize=(12, 8))
+        ax = fig.subplots()
+        ax.text(0.5, 0.5, 'No Portfolio Data Available',
+                ha='center', va='center', fontsize=20)
+        ax.axis('off')
+        buffer = BytesIO()
+        fig.savefig(buffer, format='PNG')
+        _empty_portfolio_png = buffer.getvalue()
+    return _empty_portfolio_png
+
+
 async def create_pnl_plot(exchange: IExchange,
                           tradeRepo: TradeDataRepository) -> CreatePnlResult:
     result = CreatePnlResult()
 
     portfolio = await exchange.get_spot_portfolio_async()
+
+    # USDT以外の資産はDataFrameの列ごとに値を集める（列指向で一度に構築する）
+    symbols: list[str] = []
+    total_amounts: list[float] = []
+    current_values: list[float] = []
+    profit_losses: list[float] = []
+    roi_percents: list[float] = []
+    investments: list[float] = []
     for asset in portfolio:
         holdings, avg_price = tradeRepo.get_current_position_and_avg_price(
             symbol=asset.symbol
@@ -47,33 +88,48 @@ async def create_pnl_plot(exchange: IExchange,
         asset.roi_percent = (asset.profit_loss / cost *
                              100) if cost != 0 else 0
 
+        if asset.symbol != "USDT":
+            symbols.append(asset.symbol)
+            total_amounts.append(asset.total_amount)
+            current_values.append(asset.current_value)
+            profit_losses.append(asset.profit_loss)
+            roi_percents.append(asset.roi_percent)
+            investments.append(cost)
+
     if len(portfolio) == 0:
         raise ValueError("No assets in the portfolio.")
 
+    non_usdt_count = len(symbols)
+    if non_usdt_count == 0:
+        # 描画するものがないため、作成済みの画像を返す
+        logger.debug("No assets other than USDT, skipping PnL chart rendering")
+        result.img_buffer = BytesIO(_get_empty_portfolio_png())
+        result.df = pd.DataFrame(
+            columns=["Symbol", "Total_Amount", "Current_Value",
+                     "PnL", "ROI%", "Investment"])
+        return result
+
     logger.debug("Generating PnL statement chart")
 
     # サブプロットの作成
     column_count = 3
-    non_usdt_count = len([e for e in portfolio if e.symbol != "USDT"])
     # +1 for the first row
     rows = non_usdt_count // column_count + \
         (non_usdt_count % column_count > 0) + 1
-    fig, axes = plt.subplots(rows, column_count,
-                             figsize=(12 * column_count, 8 * rows + 10))
+    fig = _get_portfolio_figure()
+    fig.set_size_inches(12 * column_count, 8 * rows + 10)
+    axes = fig.subplots(rows, column_count, squeeze=False)
     fig.suptitle('Cryptocurrency Portfolio Analysis', fontsize=16, y=0.995)
 
     df = pd.DataFrame(
-        [
-            {
-                "Symbol": asset.symbol,
-                "Total_Amount": asset.total_amount,
-                "Current_Value": asset.current_value,
-                "PnL": asset.profit_loss,
-                "ROI%": asset.roi_percent,
-                "Investment": asset.total_amount * tradeRepo.get_current_position_and_avg_price(asset.symbol)[1],
-            }
-            for asset in portfolio if asset.symbol != "USDT"
-        ]
+        {
+            "Symbol": pd.Categorical(symbols),
+            "Total_Amount": np.array(total_amounts, dtype="float64"),
+            "Current_Value": np.array(current_values, dtype="float64"),
+            "PnL": np.array(profit_losses, dtype="float64"),
+            "ROI%": np.array(roi_percents, dtype="float64"),
+            "Investment": np.array(investments, dtype="float64"),
+        }
     )
     total_current_value = df['Current_Value'].sum()
     total_pnl = df['PnL'].sum()
@@ -106,7 +162,6 @@ async def create_pnl_plot(exchange: IExchange,
     axes[0, 1].axhline(y=0, color='black', linestyle='-', alpha=0.3)
 
     # 3. 投資額 vs 現在価値の比較（グループ化棒グラフ）
-    import numpy as np
     x = np.arange(len(df['Symbol']))
     width = 0.35
 
@@ -167,14 +222,15 @@ async def create_pnl_plot(exchange: IExchange,
             axes[last_row, col].axis('off')
 
     # グラフ間の余白を調整
-    plt.tight_layout(rect=(0, 0, 1, 0.99), h_pad=4.0, w_pad=3.0)
+    fig.tight_layout(rect=(0, 0, 1, 0.99), h_pad=4.0, w_pad=3.0)
 
-    # 画像をBytesIOに保存
+    # 画像をBytesIOに保存（tight_layout済みなのでbbox_inches='tight'の再計測は不要。
+    # 圧縮率より速度を優先する）
     img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='PNG')
+    fig.savefig(img_buffer, format='PNG',
+                pil_kwargs={"optimize": False, "compress_level": 1})
     img_buffer.seek(0)
     result.img_buffer = img_buffer
-    plt.close()
 
     return result
 
@@ -1,29 +1,42 @@
+import copy
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
+from crypto_spot_collector.utils.json_codec import loads
 
-def load_secrets(secrets_path: str) -> Any:
-    import json
 
+@lru_cache(maxsize=4)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    """JSONファイルを読み込む。mtimeをキーに含め、更新されたら読み直す。"""
+    return loads(Path(path).read_bytes())
+
+
+def _load_json(path: str | Path) -> Any:
+    path = Path(path)
+    # 呼び出し側がネストした値を書き換えてもキャッシュが汚れないようコピーを返す
+    return copy.deepcopy(_load_json_cached(str(path), path.stat().st_mtime_ns))
+
+
+def load_secrets(secrets_path: str | Path) -> Any:
     logger.info(f"Loading secrets from {secrets_path}")
-    with open(secrets_path, "r") as f:
-        secrets = json.load(f)
+    secrets = _load_json(secrets_path)
     logger.info("Secrets loaded successfully")
     return secrets
 
 
-def load_settings(settings_path: str) -> Any:
-    import json
-
+def load_settings(settings_path: str | Path) -> Any:
     logger.info(f"Loading settings from {settings_path}")
-    with open(settings_path, "r") as f:
-        settings = json.load(f)
+    settings = _load_json(settings_path)
     logger.info("Settings loaded successfully")
     return settings
 
 
-def load_config(secrets_path: str, settings_path: str) -> dict[str, Any]:
+def load_config(
+    secrets_path: str | Path, settings_path: str | Path
+) -> dict[str, Any]:
     """Load both secrets and settings, merging them into a single config dict.
 
     This function maintains backward compatibility by returning a structure
@@ -40,7 +53,7 @@ def load_config(secrets_path: str, settings_path: str) -> dict[str, Any]:
     settings = load_settings(settings_path)
 
     # Merge settings into the config
-    config = secrets.copy()
+    config: dict[str, Any] = secrets
     config.update(settings)
 
     return config
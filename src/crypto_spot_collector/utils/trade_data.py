@@ -23,86 +23,45 @@ def create_update_trade_data(
         f"Total {len(canceled_trades)} canceled trade records fetched for {symbol.upper()}.")
 
     # ここでデータベースへの挿入・更新処理を行う
+    # 同じtrade_idが複数回出てくる場合は後のもの（closed → open → canceled の順）が優先される
+    records = [
+        _to_trade_record(trade)
+        for trade in (*closed_trades, *open_trades, *canceled_trades)
+    ]
+
     with TradeDataRepository() as repo:
-        for trade in closed_trades:
-            # Unixタイムスタンプ（ミリ秒）をdatetimeオブジェクトに変換
-            timestamp_ms = trade['timestamp']
-            timestamp_datetime = datetime.fromtimestamp(
-                timestamp_ms / 1000)
-
-            if trade['fee'] is None:
-                fee = 0
-            elif trade['fee']['currency'].upper() == 'USDT':
-                fee = trade['fee']['cost']
-            else:
-                fee = trade['fee']['cost'] * trade['price']  # feeをUSDT換算
-
-            repo.create_or_update_trade_data(
-                cryptocurrency_name=symbol.upper(),
-                exchange_name="bybit",
-                trade_id=trade['id'],
-                status=trade['status'],
-                position_type=trade['side'],
-                is_spot=True,
-                leverage_ratio=1.00,
-                price=trade['price'],
-                quantity=trade['amount'],
-                fee=fee,  # feeをUSDT換算
-                timestamp_utc=timestamp_datetime,
-            )
-        for trade in open_trades:
-            # Unixタイムスタンプ（ミリ秒）をdatetimeオブジェクトに変換
-            timestamp_ms = trade['timestamp']
-            timestamp_datetime = datetime.fromtimestamp(
-                timestamp_ms / 1000)
-
-            if trade['fee'] is None:
-                fee = 0
-            elif trade['fee']['currency'].upper() == 'USDT':
-                fee = trade['fee']['cost']
-            else:
-                fee = trade['fee']['cost'] * trade['price']  # feeをUSDT換算
-
-            repo.create_or_update_trade_data(
-                cryptocurrency_name=symbol.upper(),
-                exchange_name="bybit",
-                trade_id=trade['id'],
-                status=trade['status'],
-                position_type=trade['side'],
-                is_spot=True,
-                leverage_ratio=1.00,
-                price=trade['price'],
-                quantity=trade['amount'],
-                fee=fee,
-                timestamp_utc=timestamp_datetime,
-            )
-
-        for trade in canceled_trades:
-            # Unixタイムスタンプ（ミリ秒）をdatetimeオブジェクトに変換
-            timestamp_ms = trade['timestamp']
-            timestamp_datetime = datetime.fromtimestamp(
-                timestamp_ms / 1000)
-
-            if trade['fee'] is None:
-                fee = 0
-            elif trade['fee']['currency'].upper() == 'USDT':
-                fee = trade['fee']['cost']
-            else:
-                fee = trade['fee']['cost'] * trade['price']  # feeをUSDT換算
-
-            repo.create_or_update_trade_data(
-                cryptocurrency_name=symbol.upper(),
-                exchange_name="bybit",
-                trade_id=trade['id'],
-                status=trade['status'],
-                position_type=trade['side'],
-                is_spot=True,
-                leverage_ratio=1.00,
-                price=trade['price'],
-                quantity=trade['amount'],
-                fee=fee,
-                timestamp_utc=timestamp_datetime,
-            )
+        repo.bulk_create_or_update_trade_data(
+            cryptocurrency_name=symbol.upper(),
+            exchange_name="bybit",
+            trades=records,
+        )
+
+
+def _to_trade_record(trade: dict[str, Any]) -> dict[str, Any]:
+    """ccxtの注文データをTradeDataRepository用のdictに変換する。"""
+    # Unixタイムスタンプ（ミリ秒）をdatetimeオブジェクトに変換
+    timestamp_ms = trade['timestamp']
+    timestamp_datetime = datetime.fromtimestamp(
+        timestamp_ms / 1000)
+
+    if trade['fee'] is None:
+        fee = 0
+    elif trade['fee']['currency'].upper() == 'USDT':
+        fee = trade['fee']['cost']
+    else:
+        fee = trade['fee']['cost'] * trade['price']  # feeをUSDT換算
+
+    return {
+        "trade_id": trade['id'],
+        "status": trade['status'],
+        "position_type": trade['side'],
+        "is_spot": True,
+        "leverage_ratio": 1.00,
+        "price": trade['price'],
+        "quantity": trade['amount'],
+        "fee": fee,
+        "timestamp_utc": timestamp_datetime,
+    }
 
 
 def get_current_pnl_from_db(exchange: BybitExchange, symbol: str) -> float:
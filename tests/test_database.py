@@ -0,0 +1,29 @@
+"""Tests for DatabaseManager connection settings."""
+from pathlib import Path
+
+from sqlalchemy import text
+
+from crypto_spot_collector.database import DatabaseConfig, DatabaseManager
+
+
+class TestDatabaseManager:
+    """Test suite for DatabaseManager."""
+
+    def test_sqlite_connections_apply_pragmas(self, tmp_path: Path) -> None:
+        """Test that every new SQLite connection gets the tuned PRAGMAs."""
+        config = DatabaseConfig()
+        config.database_url = f"sqlite:///{tmp_path / 'test.db'}"
+        manager = DatabaseManager(config)
+
+        with manager.engine.connect() as connection:
+            journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+            synchronous = connection.execute(text("PRAGMA synchronous")).scalar()
+            busy_timeout = connection.execute(text("PRAGMA busy_timeout")).scalar()
+            temp_store = connection.execute(text("PRAGMA temp_store")).scalar()
+
+        manager.engine.dispose()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == 5000
+        assert temp_store == 2  # MEMORY
@@ -0,0 +1,209 @@
+"""Tests for HyperLiquidExchange position closing."""
+
+import asyncio
+from typing import Any
+
+from crypto_spot_collector.exchange.hyperliquid import HyperLiquidExchange
+from crypto_spot_collector.exchange.types import PositionSide
+
+
+class FakePublicExchange:
+    """fetch_positions / fetch_ticker だけを返す公開API用の偽クライアント"""
+
+    def __init__(self, positions: list[dict[str, Any]]) -> None:
+        self.positions = positions
+        self.ticker_calls = 0
+        self.session = object()
+
+    def open(self) -> None:
+        pass
+
+    async def fetch_positions(self) -> list[dict[str, Any]]:
+        return self.positions
+
+    async def fetch_ticker(self, symbol: str) -> dict[str, Any]:
+        self.ticker_calls += 1
+        await asyncio.sleep(0)
+        return {"symbol": symbol, "last": 100.0}
+
+
+class FakePrivateExchange:
+    """create_orderの呼び出しを記録し、指定シンボルでは失敗する偽クライアント"""
+
+    def __init__(self, failing_symbols: set[str]) -> None:
+        self.failing_symbols = failing_symbols
+        self.orders: list[dict[str, Any]] = []
+
+    async def create_order(self, **kwargs: Any) -> dict[str, Any]:
+        if kwargs["symbol"] in self.failing_symbols:
+            raise RuntimeError("order rejected")
+        self.orders.append(kwargs)
+        return {"id": f"order-{kwargs['symbol']}"}
+
+
+def _make_exchange(
+    positions: list[dict[str, Any]], failing_symbols: set[str] | None = None
+) -> HyperLiquidExchange:
+    """ccxtクライアントだけ偽物に差し替えたインスタンスを作る（接続は行わない）"""
+    exchange = HyperLiquidExchange(
+        mainWalletAddress="0xmain",
+        apiWalletAddress="0xapi",
+        privateKey="0x" + "1" * 64,
+        take_profit_rate=0.1,
+        stop_loss_rate=0.05,
+        leverage=2,
+    )
+    exchange.exchange_public = FakePublicExchange(positions)
+    exchange.exchange_private = FakePrivateExchange(failing_symbols or set())
+    return exchange
+
+
+class TestClosePositions:
+    """Test cases for close_all_positions_perp_async."""
+
+    def test_closes_matching_positions_with_opposite_side(self) -> None:
+        """各ポジションを反対売買のreduceOnly注文で決済すること"""
+        exchange = _make_exchange([
+            {"symbol": "BTC/USDC:USDC", "side": "long", "contracts": 0.1},
+            {"symbol": "ETH/USDC:USDC", "side": "short", "contracts": 2},
+            {"symbol": "XRP/USDC:USDC", "side": "long", "contracts": 0},
+        ])
+
+        results = asyncio.run(exchange.close_all_positions_perp_async())
+
+        assert [r["id"] for r in results] == [
+            "order-BTC/USDC:USDC", "order-ETH/USDC:USDC"]
+        orders = exchange.exchange_private.orders
+        assert [(o["symbol"], o["side"], o["amount"]) for o in orders] == [
+            ("BTC/USDC:USDC", "sell", 0.1),
+            ("ETH/USDC:USDC", "buy", 2.0),
+        ]
+        assert all(o["price"] == 100.0 for o in orders)
+        assert all(o["params"] == {"reduceOnly": True} for o in orders)
+
+    def test_failed_order_does_not_stop_other_closes(self) -> None:
+        """1件の決済失敗で他のポジションの決済が止まらないこと"""
+        exchange = _make_exchange(
+            [
+                {"symbol": "BTC/USDC:USDC", "side": "long", "contracts": 1},
+                {"symbol": "ETH/USDC:USDC", "side": "long", "contracts": 1},
+            ],
+            failing_symbols={"BTC/USDC:USDC"},
+        )
+
+        results = asyncio.run(
+            exchange.close_all_positions_perp_async(side=PositionSide.LONG))
+
+        assert [r["id"] for r in results] == ["order-ETH/USDC:USDC"]
+
+    def test_uses_websocket_mid_price_when_fresh(self) -> None:
+        """WebSocketの中値が新しければREST取得せずに決済価格として使うこと"""
+        exchange = _make_exchange([
+            {"symbol": "BTC/USDC:USDC", "side": "long", "contracts": 1},
+        ])
+        exchange._handle_all_mids({"BTC": "123.5", "ETH": "10"})
+
+        asyncio.run(exchange.close_all_positions_perp_async())
+
+        assert exchange.exchange_private.orders[0]["price"] == 123.5
+        assert exchange.exchange_public.ticker_calls == 0
+
+    def test_stale_websocket_mid_price_falls_back_to_rest(self) -> None:
+        """WebSocketの中値が古い場合はRESTのティッカーを使うこと"""
+        exchange = _make_exchange([
+            {"symbol": "BTC/USDC:USDC", "side": "long", "contracts": 1},
+        ])
+        exchange._handle_all_mids({"BTC": "123.5"})
+        exchange._all_mids_max_age = -1
+
+        asyncio.run(exchange.close_all_positions_perp_async())
+
+        assert exchange.exchange_private.orders[0]["price"] == 100.0
+        assert exchange.exchange_public.ticker_calls == 1
+
+
+class TestPerpOrders:
+    """Test cases for TP/SL triggers of perpetual orders."""
+
+    def test_long_order_triggers(self) -> None:
+        """ロングのTP/SLトリガーがレバレッジを考慮したROEで計算されること"""
+        exchange = _make_exchange([])
+
+        asyncio.run(exchange.create_order_perp_long_async(
+            symbol="BTC/USDC:USDC", amount=1, price=100.0))
+
+        params = exchange.exchange_private.orders[0]["params"]
+        assert params["takeProfit"]["triggerPrice"] == 100.0 * (1 + 0.1 / 2)
+        assert params["stopLoss"]["triggerPrice"] == 100.0 * (1 - 0.05 / 2)
+
+    def test_short_order_triggers(self) -> None:
+        """ショートのTP/SLトリガーがロングと逆方向に計算されること"""
+        exchange = _make_exchange([])
+
+        asyncio.run(exchange.create_order_perp_short_async(
+            symbol="BTC/USDC:USDC", amount=1, price=100.0))
+
+        order = exchange.exchange_private.orders[0]
+        assert order["side"] == "sell"
+        assert order["params"]["takeProfit"]["triggerPrice"] == 100.0 * (1 - 0.1 / 2)
+        assert order["params"]["stopLoss"]["triggerPrice"] == 100.0 * (1 + 0.05 / 2)
+
+
+class TestFetchPrice:
+    """Test cases for the ticker cache in fetch_price_async."""
+
+    def test_concurrent_requests_share_one_fetch(self) -> None:
+        """同時に要求された同一シンボルのティッカー取得が1回にまとまること"""
+        exchange = _make_exchange([])
+
+        async def fetch_many() -> list[dict[str, Any]]:
+            return await asyncio.gather(
+                *(exchange.fetch_price_async("BTC/USDC:USDC") for _ in range(5)))
+
+        tickers = asyncio.run(fetch_many())
+
+        assert [t["last"] for t in tickers] == [100.0] * 5
+        assert exchange.exchange_public.ticker_calls == 1
+
+    def test_cached_ticker_expires_after_ttl(self) -> None:
+        """TTL内はキャッシュを返し、期限切れ後は再取得すること"""
+        exchange = _make_exchange([])
+
+        async def fetch_twice() -> None:
+            await exchange.fetch_price_async("BTC/USDC:USDC")
+            await exchange.fetch_price_async("BTC/USDC:USDC")
+
+        asyncio.run(fetch_twice())
+        assert exchange.exchange_public.ticker_calls == 1
+
+        exchange._ticker_ttl = 0
+        asyncio.run(fetch_twice())
+        assert exchange.exchange_public.ticker_calls == 3
+
+
+class TestSharedSession:
+    """Test cases for the aiohttp session shared by the ccxt clients."""
+
+    def test_private_client_reuses_public_session(self) -> None:
+        """秘密API側が公開API側のセッションを使い、close後に両方解放されること"""
+        exchange = HyperLiquidExchange(
+            mainWalletAddress="0xmain",
+            apiWalletAddress="0xapi",
+            privateKey="0x" + "1" * 64,
+            take_profit_rate=0.1,
+            stop_loss_rate=0.05,
+            leverage=2,
+        )
+
+        async def open_and_close() -> tuple[Any, Any]:
+            private = exchange._private_exchange()
+            shared = (exchange.exchange_public.session, private.session)
+            await exchange.close()
+            return shared
+
+        public_session, private_session = asyncio.run(open_and_close())
+
+        assert public_session is not None
+        assert private_session is public_session
+        assert public_session.closed
+        assert exchange.exchange_private.session is None
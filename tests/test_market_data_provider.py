@@ -1,7 +1,30 @@
 """Tests for MarketDataProvider."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pandas as pd
 import pytest
 
-from crypto_spot_collector.providers.market_data_provider import MarketDataProvider
+from crypto_spot_collector.providers.market_data_provider import (
+    IndicatorFrame,
+    MarketDataProvider,
+)
+
+
+def _ohlcv_records(start: datetime, count: int) -> list[SimpleNamespace]:
+    """Create hourly OHLCV records with a steadily rising price."""
+    return [
+        SimpleNamespace(
+            timestamp_utc=start + timedelta(hours=i),
+            open_price=Decimal(100 + i),
+            high_price=Decimal(101 + i),
+            low_price=Decimal(99 + i),
+            close_price=Decimal(100 + i),
+            volume=Decimal(10),
+        )
+        for i in range(count)
+    ]
 
 
 class TestMarketDataProvider:
@@ -16,7 +39,7 @@ class TestMarketDataProvider:
         """Test that default parameters are set correctly."""
         # This test verifies the structure without requiring a database
         provider = MarketDataProvider()
-        
+
         # Verify the method exists and has the right signature
         assert hasattr(provider, 'get_dataframe_with_indicators')
         assert callable(provider.get_dataframe_with_indicators)
@@ -34,3 +57,153 @@ class TestMarketDataProvider:
         # The default values are tested implicitly when the method is called
         # This is more of a documentation test
         assert provider is not None
+
+    def test_get_dataframes_with_indicators_reads_all_symbols_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that all symbols are read with one query and built separately."""
+        start = datetime(2025, 1, 1)
+        rows = {"BTC": _ohlcv_records(start, 10), "ETH": []}
+        queries: list[list[str]] = []
+
+        class FakeRepository:
+            def __enter__(self) -> "FakeRepository":
+                return self
+
+            def __exit__(self, *args: object) -> None:
+                pass
+
+            def get_ohlcv_rows_for_symbols(
+                self, symbols: list[str], **kwargs: object
+            ) -> dict:
+                queries.append(symbols)
+                return rows
+
+        monkeypatch.setattr(
+            "crypto_spot_collector.providers.market_data_provider.OHLCVRepository",
+            FakeRepository,
+        )
+        provider = MarketDataProvider()
+
+        result = provider.get_dataframes_with_indicators(
+            ["BTC", "ETH"], "1h", start, start + timedelta(hours=9), sma_windows=[3]
+        )
+
+        assert queries == [["BTC", "ETH"]]
+        assert sorted(result) == ["BTC", "ETH"]
+        assert result["ETH"].empty
+        expected = MarketDataProvider._build_dataframe(
+            rows["BTC"], sma_windows=[3], sar_config={"step": 0.02, "max_step": 0.2}
+        )
+        pd.testing.assert_frame_equal(result["BTC"], expected)
+
+    def test_build_dataframe_adds_indicators(self) -> None:
+        """Test that OHLCV records are converted and indicators are added."""
+        start = datetime(2025, 1, 1)
+        records = _ohlcv_records(start, 10)
+
+        df = MarketDataProvider._build_dataframe(
+            records, sma_windows=[3], sar_config={"step": 0.02, "max_step": 0.2}
+        )
+
+        assert len(df) == 10
+        for column in ["timestamp", "close", "sma_3", "sar", "sar_up", "sar_down"]:
+            assert column in df.columns
+        assert df["sma_3"].iloc[-1] == pytest.approx(108.0)
+
+    def test_build_dataframe_empty(self) -> None:
+        """Test that no records produce an empty DataFrame."""
+        df = MarketDataProvider._build_dataframe(
+            [], sma_windows=[3], sar_config={"step": 0.02, "max_step": 0.2}
+        )
+        assert df.empty
+
+    def test_cached_rows_derive_hour_intervals(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cached 1h rows are reused and thinned for coarser intervals."""
+        start = datetime(2025, 1, 1)
+        records = _ohlcv_records(start, 24)
+        queried_intervals: list[str] = []
+
+        class FakeRepository:
+            def __enter__(self) -> "FakeRepository":
+                return self
+
+            def __exit__(self, *args: object) -> None:
+                pass
+
+            def get_ohlcv_rows_for_symbols(
+                self, symbols: list[str], interval: str, **kwargs: object
+            ) -> dict:
+                queried_intervals.append(interval)
+                return {"BTC": records}
+
+        monkeypatch.setattr(
+            "crypto_spot_collector.providers.market_data_provider.OHLCVRepository",
+            FakeRepository,
+        )
+        provider = MarketDataProvider(cache_rows=True)
+        end = start + timedelta(hours=23)
+
+        df_4h = provider.get_dataframes_with_indicators(
+            ["BTC"], "4h", start, end, sma_windows=[3]
+        )["BTC"]
+        df_1h = provider.get_dataframes_with_indicators(
+            ["BTC"], "1h", start, end, sma_windows=[3]
+        )["BTC"]
+
+        assert queried_intervals == ["1h"]
+        assert len(df_1h) == 24
+        assert list(df_4h["timestamp"].dt.hour) == [0, 4, 8, 12, 16, 20]
+
+    def test_injected_repository_is_reused(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an injected repository is used instead of creating one."""
+        start = datetime(2025, 1, 1)
+        records = _ohlcv_records(start, 5)
+        closed_sessions: list[bool] = []
+
+        class FakeRepository:
+            session = SimpleNamespace(close=lambda: closed_sessions.append(True))
+
+            def get_ohlcv_rows_for_symbols(self, **kwargs: object) -> dict:
+                return {"BTC": records}
+
+        def fail_to_create() -> None:
+            raise AssertionError("a new repository must not be created")
+
+        monkeypatch.setattr(
+            "crypto_spot_collector.providers.market_data_provider.OHLCVRepository",
+            fail_to_create,
+        )
+        repository = FakeRepository()
+        provider = MarketDataProvider(
+            repository=repository  # type: ignore[arg-type]
+        )
+
+        for _ in range(2):
+            result = provider.get_dataframes_with_indicators(
+                ["BTC"], "1h", start, start + timedelta(hours=4), sma_windows=[3]
+            )
+            assert len(result["BTC"]) == 5
+
+        # 読み取りごとに接続を返却している
+        assert closed_sessions == [True, True]
+
+    def test_indicator_frame_from_dataframe(self) -> None:
+        """Test that IndicatorFrame exposes the indicator columns as arrays."""
+        start = datetime(2025, 1, 1)
+        records = _ohlcv_records(start, 10)
+        df = MarketDataProvider._build_dataframe(
+            records, sma_windows=[3, 5], sar_config={"step": 0.02, "max_step": 0.2}
+        )
+
+        iframe = IndicatorFrame.from_dataframe(df)
+
+        assert iframe.df is df
+        assert sorted(iframe.sma) == [3, 5]
+        assert iframe.sma[3][-1] == pytest.approx(108.0)
+        assert len(iframe.timestamp) == len(iframe.sar_up) == 10
+        assert iframe.close.dtype == "float64"
@@ -0,0 +1,84 @@
+"""Tests for the NumPy Parabolic SAR calculation."""
+import numpy as np
+import pandas as pd
+from ta.trend import PSARIndicator
+
+from crypto_spot_collector.checkers.sar_checker import SARChecker
+from crypto_spot_collector.indicators.psar import compute_psar
+
+
+def _random_ohlc(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    close = np.cumsum(rng.standard_normal(n)) + 100.0
+    high = close + rng.random(n)
+    low = close - rng.random(n)
+    return high, low, close
+
+
+class TestComputePsar:
+    """Test suite for compute_psar."""
+
+    def test_matches_ta_psar_indicator(self) -> None:
+        """Test that sar/sar_up/sar_down match ta's PSARIndicator exactly."""
+        high, low, close = _random_ohlc(500)
+
+        sar, sar_up, sar_down = compute_psar(high, low, close, 0.02, 0.2)
+        indicator = PSARIndicator(
+            high=pd.Series(high),
+            low=pd.Series(low),
+            close=pd.Series(close),
+            step=0.02,
+            max_step=0.2,
+        )
+
+        np.testing.assert_array_equal(sar, indicator.psar().to_numpy())
+        np.testing.assert_array_equal(sar_up, indicator.psar_up().to_numpy())
+        np.testing.assert_array_equal(sar_down, indicator.psar_down().to_numpy())
+
+    def test_empty_input(self) -> None:
+        """Test that empty arrays return empty results."""
+        empty = np.array([], dtype=np.float64)
+
+        sar, sar_up, sar_down = compute_psar(empty, empty, empty)
+
+        assert len(sar) == len(sar_up) == len(sar_down) == 0
+
+
+class TestSARCheckerCheckLongValues:
+    """Test suite for SARChecker.check_long_values."""
+
+    def test_agrees_with_check_on_indicator_dataframe(self) -> None:
+        """Test that check_long_values agrees with check on ta's sar_up."""
+        checker = SARChecker(consecutive_count=3)
+
+        for seed in range(50):
+            high, low, close = _random_ohlc(120, seed=seed)
+            indicator = PSARIndicator(
+                high=pd.Series(high),
+                low=pd.Series(low),
+                close=pd.Series(close),
+                step=0.02,
+                max_step=0.2,
+            )
+            df = pd.DataFrame({"sar_up": indicator.psar_up()})
+
+            _, sar_up, _ = compute_psar(high, low, close, 0.02, 0.2)
+
+            assert checker.check_long_values(sar_up) == checker.check(df)
+
+    def test_empty_input(self) -> None:
+        """Test that check_long_values returns False for an empty array."""
+        empty = np.array([], dtype=np.float64)
+
+        assert SARChecker().check_long_values(empty) is False
+
+    def test_check_long_values_requires_exact_run_after_nan(self) -> None:
+        """Test the consecutive-count rule on a raw sar_up array."""
+        checker = SARChecker(consecutive_count=3)
+        nan = np.nan
+
+        assert checker.check_long_values(np.array([nan, 1.0, 1.0, 1.0])) is True
+        assert checker.check_long_values(np.array([nan, 1.0, 1.0])) is False
+        assert checker.check_long_values(np.array([nan, 1.0, 1.0, 1.0, 1.0])) is False
+        # NaNが前にない（データ先頭から続いている）場合はシグナルにしない
+        assert checker.check_long_values(np.array([1.0, 1.0, 1.0])) is False
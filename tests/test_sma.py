@@ -0,0 +1,39 @@
+"""Tests for the NumPy simple moving average calculation."""
+import numpy as np
+import pandas as pd
+
+from crypto_spot_collector.indicators.sma import compute_sma
+
+
+class TestComputeSma:
+    """Test suite for compute_sma."""
+
+    def test_matches_pandas_rolling_mean(self) -> None:
+        """Test that the result matches pandas rolling().mean()."""
+        rng = np.random.default_rng(0)
+        close = np.cumsum(rng.standard_normal(500)) + 50000.0
+
+        for window in (1, 50, 100):
+            expected = pd.Series(close).rolling(window=window).mean().to_numpy()
+            np.testing.assert_allclose(
+                compute_sma(close, window), expected, rtol=1e-12, equal_nan=True
+            )
+
+    def test_window_longer_than_data(self) -> None:
+        """Test that all values are NaN when there is not enough data."""
+        result = compute_sma(np.arange(5, dtype=np.float64), 10)
+
+        assert len(result) == 5
+        assert np.isnan(result).all()
+
+    def test_nan_only_affects_windows_containing_it(self) -> None:
+        """Test that a NaN input matches rolling().mean() and does not spread."""
+        close = np.arange(20, dtype=np.float64) + 100.0
+        close[5] = np.nan
+
+        result = compute_sma(close, 3)
+        expected = pd.Series(close).rolling(window=3).mean().to_numpy()
+
+        np.testing.assert_allclose(result, expected, rtol=1e-12, equal_nan=True)
+        assert np.isnan(result[5:8]).all()
+        assert not np.isnan(result[8:]).any()